@@ -0,0 +1,323 @@
+import os
+import sys
+import time
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import tufteplotlib as tpl
+
+# Usage: python scripts/benchmarks.py [section ...]
+# Runs every section when none are given.
+
+####################################################################################################
+#                                            Helpers                                               #
+####################################################################################################
+def _time(func, *args, repeat=3, **kwargs):
+    """Best wall-clock time of several calls, in seconds."""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _report(label, n_points, seconds):
+    print(f"{label:<40s} {n_points:>12,d} points {seconds:>10.4f} s {n_points / seconds:>16,.0f} points/s")
+
+####################################################################################################
+#                                          GALAXY PLOT                                             #
+####################################################################################################
+def galaxy():
+    rng = np.random.default_rng(0)
+
+    for n_points in [10**4, 10**6, 10**8]:
+        x = rng.uniform(-1, 1, n_points)
+        y = rng.uniform(-1, 1, n_points)
+        z = rng.uniform(0, 1, n_points)
+
+        seconds = _time(tpl.galaxy_plot, x, y, z, nx_bins=100, ny_bins=100,
+                        repeat=1 if n_points > 10**6 else 3)
+        _report("galaxy_plot (100 x 100 bins)", n_points, seconds)
+
+        plt.close("all")
+        del x, y, z
+
+####################################################################################################
+#                                    GALAXY PLOT (multi-core)                                      #
+####################################################################################################
+def galaxy_workers():
+    rng = np.random.default_rng(0)
+
+    n_points = 2 * 10**7
+    x, y, z = rng.uniform(-1, 1, (3, n_points)).astype(np.float32)
+
+    n_cores = os.cpu_count() or 1
+    baseline = None
+
+    for workers in range(1, max(n_cores, 2) + 1):
+        accumulator = tpl.GalaxyAccumulator((-1, 1), (-1, 1), nx_bins=100, ny_bins=100)
+        seconds = _time(accumulator.update, x, y, z, workers=workers, repeat=1)
+        baseline = baseline or seconds
+        efficiency = baseline / (workers * seconds)
+        _report(f"GalaxyAccumulator.update (workers={workers})", n_points, seconds)
+        print(f"{'':<40s} speed-up {baseline / seconds:5.2f}x, scaling efficiency {efficiency:6.1%}")
+
+    if n_cores == 1:
+        print("Only one core available: worker counts above 1 measure overhead only.")
+
+####################################################################################################
+#                                    GALAXY IMAGE (map tiles)                                      #
+####################################################################################################
+def galaxy_image():
+    rng = np.random.default_rng(0)
+
+    grid = rng.uniform(0, 1, (256, 256))
+    grid[rng.uniform(0, 1, grid.shape) < 0.1] = np.nan
+
+    for format in ["rgba", "png"]:
+        seconds = _time(tpl.galaxy_image, grid, format=format, repeat=200)
+        print(f"{'galaxy_image (256 x 256, ' + format + ')':<40s} {seconds * 1e3:>10.3f} ms per tile")
+
+####################################################################################################
+#                                  DENSITY SMALL MULTIPLES                                         #
+####################################################################################################
+def density_small_multiples():
+    rng = np.random.default_rng(0)
+
+    n_panels = 200
+    samples = [rng.normal(rng.uniform(0, 10), rng.uniform(0.5, 3), 20_000) for _ in range(n_panels)]
+
+    def loop():
+        fig, axes = plt.subplots(20, 10, figsize=(22, 32))
+        for sample, ax in zip(samples, axes.flat):
+            tpl.density_plot(sample, ax=ax, method="exact")
+        fig.canvas.draw()
+        plt.close(fig)
+
+    def batched():
+        fig, axes = tpl.density_small_multiples(samples, ncols=10)
+        fig.canvas.draw()
+        plt.close(fig)
+
+    n_points = n_panels * len(samples[0])
+    _report(f"density_plot loop ({n_panels} panels)", n_points, _time(loop, repeat=1))
+    _report(f"density_small_multiples ({n_panels} panels)", n_points, _time(batched, repeat=1))
+
+####################################################################################################
+#                                   HISTOGRAM (uniform-bin counting)                               #
+####################################################################################################
+def histogram():
+    from tufteplotlib.plots.histogram import _uniform_histogram
+
+    rng = np.random.default_rng(0)
+    n_cores = os.cpu_count() or 1
+
+    for n_points in [10**6, 10**7, 10**8]:
+        repeat = 1 if n_points > 10**7 else 3
+        data = rng.lognormal(0, 1, n_points)
+
+        _report("np.histogram (50 bins, float64)", n_points,
+                _time(np.histogram, data, bins=50, repeat=repeat))
+        _report("fast path (50 bins, float64)", n_points,
+                _time(_uniform_histogram, data, 50, repeat=repeat))
+
+        data = data.astype(np.float32)
+        _report("np.histogram (50 bins, float32)", n_points,
+                _time(np.histogram, data, bins=50, repeat=repeat))
+        _report("fast path (50 bins, float32)", n_points,
+                _time(_uniform_histogram, data, 50, repeat=repeat))
+        if n_cores > 1:
+            _report(f"fast path (float32, workers={n_cores})", n_points,
+                    _time(_uniform_histogram, data, 50, workers=n_cores, repeat=repeat))
+
+        del data
+
+####################################################################################################
+#                                           BARCODE PLOT                                           #
+####################################################################################################
+def barcode():
+    rng = np.random.default_rng(0)
+
+    n_points = 200_000
+    categories = rng.choice(["Lowenstein", "Zweig", "Monroe"], n_points)
+    values = rng.normal(5, 2, n_points).round(1)
+
+    def draw(collapse):
+        fig, ax = tpl.barcode_plot(categories, values, collapse=collapse)
+        fig.canvas.draw()
+        plt.close(fig)
+
+    _report("barcode_plot (draw)", n_points, _time(draw, False, repeat=1))
+    _report("barcode_plot (draw, collapse=True)", n_points, _time(draw, True, repeat=1))
+
+####################################################################################################
+#                                          QUARTILE PLOT                                           #
+####################################################################################################
+def quartile():
+    rng = np.random.default_rng(0)
+
+    n_points = 10**6
+    values = rng.normal(0, 1, n_points)
+
+    for n_categories in [10, 1_000, 10_000]:
+        categories = rng.integers(0, n_categories, n_points)
+
+        def draw():
+            fig, ax = tpl.quartile_plot(categories, values)
+            fig.canvas.draw()
+            plt.close(fig)
+
+        _report(f"quartile_plot ({n_categories:,d} categories)", n_points, _time(draw, repeat=1))
+
+    n_points = 10**5
+    values = rng.lognormal(0, 1, n_points)
+    categories = rng.integers(0, 20, n_points)
+    n_cores = os.cpu_count() or 1
+
+    for workers in sorted({1, n_cores}):
+        def draw():
+            fig, ax = tpl.quartile_plot(categories, values, median_ci=0.95, workers=workers)
+            plt.close(fig)
+
+        _report(f"quartile_plot (median_ci, workers={workers})", n_points, _time(draw, repeat=1))
+
+####################################################################################################
+#                                             RUG PLOT                                             #
+####################################################################################################
+def rug():
+    rng = np.random.default_rng(0)
+
+    for n_points in [10**4, 10**5]:
+        x = rng.normal(0, 1, n_points)
+        y = rng.normal(0, 1, n_points)
+
+        def draw():
+            fig, ax = tpl.rug_plot(x, y)
+            fig.canvas.draw()
+            plt.close(fig)
+
+        _report("rug_plot (draw)", n_points, _time(draw, repeat=1))
+
+####################################################################################################
+#                                      SCATTER PLOT (raster)                                       #
+####################################################################################################
+def scatter():
+    rng = np.random.default_rng(0)
+
+    for n_points in [10**5, 10**6, 10**7, 10**8]:
+        x = rng.normal(0, 1, n_points).astype(np.float32)
+        y = x + rng.normal(0, 1, n_points).astype(np.float32)
+
+        for raster in [False, True] if n_points <= 10**6 else [True]:
+            def draw(x, y, raster):
+                fig, ax = tpl.scatter_plot(x, y, alpha=0.05, dot_size=2, raster=raster)
+                fig.canvas.draw()
+                plt.close(fig)
+
+            _report(f"scatter_plot (draw, raster={raster})", n_points,
+                    _time(draw, x, y, raster, repeat=1))
+
+        def sampled(x, y):
+            fig, ax = tpl.scatter_plot(x, y, alpha=0.3, dot_size=4, max_points=10_000)
+            fig.canvas.draw()
+            plt.close(fig)
+
+        _report("scatter_plot (draw, max_points=10,000)", n_points, _time(sampled, x, y, repeat=1))
+
+        del x, y
+
+####################################################################################################
+#                               SCATTER SMOOTHER (binned vs exact LOWESS)                          #
+####################################################################################################
+def _exact_lowess(x, y, span=2/3, iterations=3):
+    """Reference LOWESS (Cleveland 1979) at every point, O(N^2)."""
+    k = int(span * len(x) + 1e-10)
+    robustness = np.ones(len(x))
+    for iteration in range(iterations + 1):
+        fit = np.empty(len(x))
+        for i in range(len(x)):
+            distance = np.abs(x - x[i])
+            bandwidth = np.partition(distance, k - 1)[k - 1]
+            scaled = distance / bandwidth if bandwidth > 0 else (distance > 0).astype(float)
+            w = np.clip(1 - scaled**3, 0, 1)**3 * robustness
+            dx = x - x[i]
+            s0, s1, s2 = w.sum(), w @ dx, w @ dx**2
+            t0, t1 = w @ y, w @ (dx * y)
+            determinant = s0 * s2 - s1**2
+            slope = 0.0 if determinant <= 1e-12 * s0 * s2 else (s0 * t1 - s1 * t0) / determinant
+            fit[i] = (t0 - slope * s1) / s0
+        if iteration == iterations:
+            break
+        residual = np.abs(y - fit)
+        scale = 6 * np.median(residual)
+        if scale == 0:
+            break
+        robustness = np.clip(1 - (residual / scale)**2, 0, 1)**2
+    return fit
+
+def smoother():
+    from tufteplotlib.plots.scatter import _binned_lowess
+
+    for name, data in tpl.anscombe.items():
+        x, y = data[:, 0], data[:, 1]
+        x_fit, y_fit = _binned_lowess(x, y)
+        error = np.abs(np.interp(x, x_fit, y_fit) - _exact_lowess(x, y)).max()
+        print(f"{'anscombe ' + name + ' (binned vs exact)':<40s} max |difference| {error:.2e}")
+
+    rng = np.random.default_rng(0)
+    for n_points in [10**3, 10**4]:
+        x = rng.uniform(0, 10, n_points)
+        y = np.sin(x) + rng.normal(0, 0.5, n_points)
+        x_fit, y_fit = _binned_lowess(x, y, 0.3)
+        error = np.abs(np.interp(x, x_fit, y_fit) - _exact_lowess(x, y, 0.3)).max()
+        _report("exact LOWESS", n_points, _time(_exact_lowess, x, y, 0.3, repeat=1))
+        print(f"{'':<40s} binned max |difference| {error:.3f} (noise sd 0.5)")
+
+    for n_points in [10**4, 10**6, 10**8]:
+        x = rng.uniform(0, 10, n_points)
+        y = np.sin(x) + rng.normal(0, 0.5, n_points)
+        _report("binned LOWESS (200 bins)", n_points, _time(_binned_lowess, x, y, 0.3, repeat=1))
+        del x, y
+
+####################################################################################################
+#                                  LINE PLOT (pixel-aware downsampling)                            #
+####################################################################################################
+def line():
+    rng = np.random.default_rng(0)
+
+    for n_points in [10**6, 5 * 10**7]:
+        x = np.arange(n_points, dtype=np.float64)
+        y = np.cumsum(rng.normal(0, 1, n_points))
+
+        for downsample in [False, "minmax", "lttb"] if n_points <= 10**6 else ["minmax", "lttb"]:
+            def draw(x, y, downsample):
+                fig, ax = tpl.line_plot(x, y, downsample=downsample)
+                fig.canvas.draw()
+                ax.set_xlim(len(x) * 0.4, len(x) * 0.41)                                            # zoom
+                fig.canvas.draw()
+                plt.close(fig)
+
+            _report(f"line_plot (draw + zoom, {downsample})", n_points,
+                    _time(draw, x, y, downsample, repeat=1))
+
+        del x, y
+
+####################################################################################################
+#                                              Main                                                #
+####################################################################################################
+SECTIONS = {"galaxy"                 : galaxy,
+            "galaxy_workers"         : galaxy_workers,
+            "galaxy_image"           : galaxy_image,
+            "density_small_multiples": density_small_multiples,
+            "histogram"              : histogram,
+            "barcode"                : barcode,
+            "quartile"               : quartile,
+            "rug"                    : rug,
+            "scatter"                : scatter,
+            "smoother"               : smoother,
+            "line"                   : line}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or SECTIONS:
+        SECTIONS[name]()
@@ -12,6 +12,9 @@ setup(
     author="Jon Woolfrey",
     author_email="jonathan.woolfrey@gmail.com",
     description="An extension to matplotlib for creating graphs in the style of Edward Tufte.",
+    extras_require={
+        "scipy": ["scipy>=1.7"],
+    },
     entry_points={
         "console_scripts": [
             "tufte-bar        = tufteplotlib.plots.bar:main",
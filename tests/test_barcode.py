@@ -0,0 +1,32 @@
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from tufteplotlib import barcode_plot
+
+CATEGORIES = ["b", "a", "b", "a", "b", "b"]
+VALUES = [1.0, 2.0, 1.0, 3.0, 1.0, 2.0]
+
+def _marks(collapse):
+    fig, ax = barcode_plot(CATEGORIES, VALUES, collapse=collapse)
+    (lines,) = ax.collections
+    assert isinstance(lines, LineCollection)
+    segments = [(segment[0, 0] + 0.2, segment[0, 1]) for segment in lines.get_segments()]
+    colors = lines.get_colors()
+    plt.close(fig)
+    return segments, colors
+
+def test_collapse_draws_each_distinct_mark_once_with_the_overlap_alpha():
+    segments, colors = _marks(collapse=True)
+
+    alpha = {segment: color[3] for segment, color in zip(segments, colors)}
+    assert len(segments) == len(alpha) == 4                                                         # "a" is position 0
+    assert alpha == {(0, 2.0): 0.5, (0, 3.0): 0.5, (1, 1.0): 1 - 0.5**3, (1, 2.0): 0.5}
+    np.testing.assert_array_equal(colors[:, :3], 0)
+
+def test_without_collapse_every_value_has_its_own_segment():
+    segments, colors = _marks(collapse=False)
+
+    assert sorted(segments) == sorted(zip([1, 0, 1, 0, 1, 1], VALUES))
+    np.testing.assert_array_equal(colors[:, 3], 0.5)
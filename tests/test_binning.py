@@ -0,0 +1,99 @@
+import numpy as np
+from tufteplotlib.binning import _grid_cells, _stratified_sample, _uniform_counts_2d
+
+def test_grid_cells_drop_points_outside_the_range():
+    x = np.array([0.0, 0.5, 1.0, 1.05, -0.05, np.nan, 0.5])
+    y = np.array([0.0, 0.5, 1.0, 0.5, 0.5, 0.5, 1.05])
+
+    cells = _grid_cells(x, y, (0, 1), (0, 1), 10, 10)
+
+    np.testing.assert_array_equal(cells, [0, 55, 99, -1, -1, -1, -1])
+
+def test_uniform_counts_2d_ignores_points_beyond_the_last_cell():
+    x = np.array([0.99, 1.0, 1.09])
+    y = np.array([0.5, 0.5, 0.5])
+
+    counts = _uniform_counts_2d(x, y, (0, 1), (0, 1), 10, 10)
+
+    assert counts.sum() == 2
+    assert counts[5, 9] == 2
+
+def test_stratified_sample_keeps_extremes():
+    rng = np.random.default_rng(0)
+    x = rng.standard_t(3, 100_000)
+    y = x + rng.normal(0, 1, 100_000)
+
+    index = _stratified_sample(x, y, 1000)
+
+    assert len(index) <= 1000
+    assert {x.argmin(), x.argmax(), y.argmin(), y.argmax()} <= set(index)
+
+def test_uniform_histogram_matches_np_histogram_on_integer_data():
+    from tufteplotlib.plots.histogram import _uniform_histogram
+
+    for dtype in (np.int64, np.float64, np.float32):
+        for lo in (-7, 0, 3):
+            for size in range(2, 60, 3):
+                data = np.arange(lo, lo + size).astype(dtype)
+                for bins in range(1, 70, 2):
+                    counts, edges = _uniform_histogram(data, bins)
+                    expected, expected_edges = np.histogram(data, bins)
+                    np.testing.assert_array_equal(edges, expected_edges)
+                    np.testing.assert_array_equal(counts, expected, err_msg=f"{dtype} {lo} {size} {bins}")
+
+def test_uniform_counts_weights_and_workers_match_np_histogram(monkeypatch):
+    from tufteplotlib import binning
+
+    monkeypatch.setattr(binning, "_BLOCK_SIZE", 100)
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 23, 1000).astype(float)
+    weights = rng.uniform(0, 1, 1000)
+
+    expected, _ = np.histogram(data, 30, weights=weights)
+    counts = binning._uniform_counts(data, 0, 22, 30, workers=3, weights=weights)
+
+    np.testing.assert_allclose(counts, expected)
+
+def _reference_bins(values, edges):
+    """Bin of each value by comparing it with every half-open bin, as the original loop did."""
+    index = np.full(len(values), -1)
+    for i in range(len(edges) - 1):
+        index[(values >= edges[i]) & (values < edges[i + 1])] = i
+    return index
+
+def test_bin_index_matches_half_open_comparisons_on_the_edges():
+    from tufteplotlib.binning import _bin_index
+
+    rng = np.random.default_rng(0)
+    for lo, hi, n_bins in ((0.1, 0.7, 7), (-3.3, 2.9, 31), (0, 1e-3, 13), (1e6, 1e6 + 1, 10)):
+        edges = np.linspace(lo, hi, n_bins + 1)
+        values = np.concatenate([edges, np.nextafter(edges, -np.inf), np.nextafter(edges, np.inf),
+                                 rng.uniform(lo, hi, 1000), [np.nan]])
+
+        np.testing.assert_array_equal(_bin_index(values, edges), _reference_bins(values, edges))
+
+        uneven = np.unique(np.concatenate([[lo, hi], rng.uniform(lo, hi, n_bins)]))
+        np.testing.assert_array_equal(_bin_index(values, uneven), _reference_bins(values, uneven))
+
+def test_galaxy_max_grid_matches_the_reference_loop():
+    from tufteplotlib import GalaxyAccumulator
+
+    rng = np.random.default_rng(1)
+    nx, ny = 9, 7
+    x_edges, y_edges = np.linspace(0.1, 0.7, nx + 1), np.linspace(-1.3, 2.2, ny + 1)
+    x = np.concatenate([rng.uniform(0.1, 0.7, 2000), rng.choice(x_edges, 500)])                 # includes hi
+    y = np.concatenate([rng.uniform(-1.3, 2.2, 2000), rng.choice(y_edges, 500)])
+    z = rng.normal(size=len(x))
+
+    acc = GalaxyAccumulator((0.1, 0.7), (-1.3, 2.2), nx_bins=nx, ny_bins=ny, reduce="max")
+    acc.update(x, y, z)
+
+    expected = np.full((ny, nx), np.nan)
+    for i in range(nx):
+        for j in range(ny):
+            mask = ((x >= x_edges[i]) & (x < x_edges[i + 1]) &
+                    (y >= y_edges[j]) & (y < y_edges[j + 1]))
+            if np.any(mask):
+                expected[j, i] = np.max(z[mask])
+
+    np.testing.assert_array_equal(acc.grids["max"], expected)
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from tufteplotlib import density_small_multiples
+
+def test_small_multiples_one_panel_per_sample():
+    rng = np.random.default_rng(0)
+    samples = [rng.normal(i, 1, 100) for i in range(3)]
+
+    fig, axes = density_small_multiples(samples, ncols=3)
+
+    assert sum(ax.get_visible() for ax in axes.flat) == 3
+    plt.close(fig)
+
+@pytest.mark.parametrize("empty_at", [0, 1, 2])
+def test_small_multiples_rejects_empty_sample(empty_at):
+    rng = np.random.default_rng(0)
+    samples = [rng.normal(i, 1, 100) for i in range(3)]
+    samples[empty_at] = []
+
+    with pytest.raises(ValueError, match="empty"):
+        density_small_multiples(samples)
+
+def test_small_multiples_rejects_empty_sample_by_name():
+    with pytest.raises(ValueError, match="'b'"):
+        density_small_multiples({"a": [1.0, 2.0, 3.0], "b": [], "c": [4.0, 5.0]})
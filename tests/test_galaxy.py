@@ -0,0 +1,108 @@
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+from tufteplotlib import GalaxyAccumulator
+
+def _accumulators(**kwargs):
+    """A dense and a sparse accumulator fed the same points."""
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(-1, 0, (2, 500))                                                             # one quadrant: empty bins
+    z = rng.uniform(0, 1, 500)
+
+    accumulators = []
+    for storage in ("dense", "sparse"):
+        acc = GalaxyAccumulator((-1, 1), (-1, 1), nx_bins=20, ny_bins=20, storage=storage, **kwargs)
+        acc.update(x, y, z)
+        accumulators.append(acc)
+
+    return accumulators
+
+def test_sparse_grid_matches_dense_for_default_count():
+    dense, sparse = _accumulators(reduce=["count", "mean"])
+
+    assert (dense.grid == 0).any()
+    np.testing.assert_array_equal(sparse.grid, dense.grid)
+    np.testing.assert_array_equal(sparse.get_grid(None), dense.get_grid(None))
+
+def test_sparse_grids_match_dense():
+    dense, sparse = _accumulators(reduce=["count", "mean"])
+
+    for name in dense.reductions:
+        np.testing.assert_array_equal(sparse.grids[name], dense.grids[name])
+
+def test_galaxy_image_uses_each_unnamed_colormap():
+    from matplotlib.colors import ListedColormap
+    from tufteplotlib import galaxy_image
+
+    grid = np.array([[0.0, 1.0]])
+    red_blue = galaxy_image(grid, cmap=ListedColormap(["red", "blue"]))
+    green_yellow = galaxy_image(grid, cmap=ListedColormap(["green", "yellow"]))
+
+    np.testing.assert_array_equal(red_blue[0, :, :3], [[255, 0, 0], [0, 0, 255]])
+    np.testing.assert_array_equal(green_yellow[0, :, :3], [[0, 128, 0], [255, 255, 0]])
+
+def test_galaxy_image_png():
+    from tufteplotlib import galaxy_image
+
+    assert galaxy_image(np.eye(4), format="png").startswith(b"\x89PNG")
+
+def test_parallel_update_matches_serial_for_memmap(tmp_path, monkeypatch):
+    import pickle
+    from tufteplotlib import binning
+
+    monkeypatch.setattr(binning, "_CHUNK_SIZE", 1000)                                              # several rounds
+
+    rng = np.random.default_rng(0)
+    path = tmp_path / "points.dat"
+    points = np.memmap(path, dtype=np.float32, mode="w+", shape=(3, 7_001))
+    points[:] = rng.uniform(-1, 1, (3, 7_001))
+    points.flush()
+    x, y, z = np.memmap(path, dtype=np.float32, mode="r", shape=(3, 7_001))
+
+    serial = GalaxyAccumulator((-1, 1), (-1, 1), nx_bins=10, ny_bins=10, reduce=["count", "sum"])
+    serial.update(x, y, z)
+
+    with GalaxyAccumulator((-1, 1), (-1, 1), nx_bins=10, ny_bins=10,
+                           reduce=["count", "sum"]) as parallel:
+        parallel.update(x[:3000], y[:3000], z[:3000], workers=2)
+        pool = parallel._pool
+        parallel.update(x[3000:], y[3000:], z[3000:], workers=2)
+        assert parallel._pool is pool                                                               # reused
+
+        copy = pickle.loads(pickle.dumps(parallel))
+
+    assert parallel._pool is None
+    np.testing.assert_array_equal(parallel.grids["count"], serial.grids["count"])
+    np.testing.assert_allclose(parallel.grids["sum"], serial.grids["sum"], rtol=1e-5)
+    np.testing.assert_array_equal(copy.grids["count"], serial.grids["count"])
+
+def test_sketch_quantiles_match_np_percentile_per_bin():
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(0, 1, (2, 20_000))
+    z = rng.beta(2, 5, 20_000)
+    sketch_bins = 32
+    width = 1 / sketch_bins
+
+    acc = GalaxyAccumulator((0, 1), (0, 1), nx_bins=10, ny_bins=10, z_range=(0, 1),
+                            sketch_bins=sketch_bins, reduce=["median", "p95", "p5"])
+    acc.update(x, y, z)
+
+    cell = np.minimum((y * 10).astype(int), 9) * 10 + np.minimum((x * 10).astype(int), 9)
+    for name, q in (("median", 50), ("p95", 95), ("p5", 5)):
+        grid = acc.grids[name].ravel()
+        expected = np.array([np.percentile(z[cell == i], q) for i in range(100)])
+        assert np.abs(grid - expected).max() <= width
+
+def test_sketch_median_of_two_values_is_their_midpoint():
+    acc = GalaxyAccumulator((0, 1), (0, 1), nx_bins=1, ny_bins=1, z_range=(0, 1), reduce="median")
+    acc.update(np.array([0.5, 0.5]), np.array([0.5, 0.5]), np.array([0.0, 1.0]))
+
+    assert acc.grid[0, 0] == 0.5
+
+def test_parallel_update_accepts_an_empty_chunk():
+    with GalaxyAccumulator((-1, 1), (-1, 1), nx_bins=4, ny_bins=4, reduce=["count", "mean"]) as acc:
+        acc.update(np.empty(0), np.empty(0), np.empty(0), workers=2)
+        acc.update(np.array([0.5]), np.array([0.5]), np.array([2.0]), workers=2)
+
+    assert acc.grids["count"].sum() == 1
+    assert np.nanmax(acc.grids["mean"]) == 2.0
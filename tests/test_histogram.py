@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from tufteplotlib import histogram_plot
+
+def _ticks(fig, ax):
+    ticks = sorted(ax.get_xticks())
+    plt.close(fig)
+    return ticks
+
+def test_unit_weights_give_the_same_median_tick():
+    values = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+
+    weighted = _ticks(*histogram_plot(values, weights=np.ones_like(values)))
+
+    assert weighted == _ticks(*histogram_plot(values))
+    assert 3.5 in weighted
+
+def test_accumulator_median_on_long_tailed_data():
+    from tufteplotlib import HistogramAccumulator
+
+    rng = np.random.default_rng(0)
+    data = rng.lognormal(-6, 2, 200_000)
+
+    acc = HistogramAccumulator((data.min(), data.max()), bins=20)
+    for start in range(0, len(data), 50_000):
+        acc.update(data[start:start + 50_000])
+
+    for q in (1, 25, 50, 75, 99):
+        assert acc.quantile(q) == pytest.approx(np.percentile(data, q), rel=acc.precision)
+
+def test_accumulator_merge_matches_single_pass():
+    from tufteplotlib import HistogramAccumulator
+
+    rng = np.random.default_rng(1)
+    data = rng.normal(0, 1, 10_000)
+
+    whole = HistogramAccumulator((-5, 5)).update(data)
+    halves = HistogramAccumulator((-5, 5)).update(data[:4000])
+    halves.merge(HistogramAccumulator((-5, 5)).update(data[4000:]))
+
+    assert halves.total == whole.total == len(data)
+    assert halves.median == whole.median
+
+QUANTILES = [0, 0.1, 1, 5, 10, 25, 50, 75, 90, 95, 99, 99.9, 100]
+
+def test_log_accumulator_quantiles_within_relative_precision():
+    from tufteplotlib import LogHistogramAccumulator
+
+    rng = np.random.default_rng(0)
+    data = rng.lognormal(-7, 3, 100_000)
+    data = data[data >= 1e-6]
+
+    acc = LogHistogramAccumulator(lowest=1e-6, precision=0.01)
+    for chunk in np.array_split(data, 7):
+        acc.update(chunk)
+
+    for q in QUANTILES:
+        expected = np.percentile(data, q)
+        assert abs(acc.quantile(q) - expected) <= acc.precision * expected, q
+
+def test_log_accumulator_zeros_and_values_below_lowest():
+    from tufteplotlib import LogHistogramAccumulator
+
+    rng = np.random.default_rng(1)
+    data = np.concatenate([np.zeros(1000), rng.uniform(0, 1e-6, 1000), rng.lognormal(0, 1, 8000),
+                           [np.nan]])
+    lowest = 1e-6
+
+    acc = LogHistogramAccumulator(lowest=lowest, precision=0.01).update(data)
+    values = data[~np.isnan(data)]
+
+    assert acc.total == len(values)
+    for q in QUANTILES:
+        expected = np.percentile(values, q)
+        tolerance = acc.precision * expected if expected >= lowest else lowest * (1 + acc.precision)
+        assert abs(acc.quantile(q) - expected) <= tolerance, q
@@ -0,0 +1,39 @@
+import numpy as np
+from tufteplotlib.kde import _binned_kde, _binned_kde_groups
+
+def _exact_kde(data, points, bandwidth):
+    """Gaussian KDE summed directly over every sample."""
+    u = (points[:, None] - data[None, :]) / bandwidth
+    return np.exp(-0.5 * u**2).sum(axis=1) / (len(data) * bandwidth * np.sqrt(2 * np.pi))
+
+def _peak(bandwidth):
+    return 1 / (np.sqrt(2 * np.pi) * bandwidth)
+
+def test_binned_kde_within_the_stated_bound():
+    rng = np.random.default_rng(0)
+    unimodal = rng.normal(0, 1, 3000)
+    bimodal = np.concatenate([rng.normal(-5, 0.01, 1500), rng.normal(5, 0.01, 1500)])
+
+    for data, bandwidth in ((unimodal, 0.2), (unimodal, 0.02), (bimodal, 0.004)):
+        points = np.linspace(data.min() - 1, data.max() + 1, 5001)
+        points = np.concatenate([points, data[::10]])                                               # on the peaks
+
+        error = np.abs(_binned_kde(data, points, bandwidth) - _exact_kde(data, points, bandwidth))
+
+        assert error.max() <= 0.004 * _peak(bandwidth)
+
+def test_grouped_kde_within_the_bound_for_widely_different_scales():
+    rng = np.random.default_rng(1)
+    scales = np.array([1.0] * 15 + [1e-3])
+    samples = [rng.normal(0, scale, 200) for scale in scales]
+    data = np.concatenate(samples)
+    codes = np.repeat(np.arange(len(samples)), 200)
+
+    grid, densities = _binned_kde_groups(data, codes, len(samples), data.min(), data.max(),
+                                         max_cells=1 << 16)                                         # capped grid
+    assert grid[1] - grid[0] > 1e-3
+
+    for sample, density in zip(samples, densities):
+        bandwidth = np.std(sample, ddof=1) * len(sample) ** (-1 / 5)
+        error = np.abs(density - _exact_kde(sample, grid, bandwidth))
+        assert error.max() <= 0.004 * _peak(bandwidth)
@@ -0,0 +1,54 @@
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from tufteplotlib import line_plot
+from tufteplotlib.plots.line import _lttb_indices, _min_max_indices
+
+def _walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.uniform(0, 100, n)), np.cumsum(rng.normal(size=n))
+
+def test_min_max_keeps_the_first_last_and_extremes_of_every_column():
+    x, y = _walk(50_000)
+    n_columns = 300
+
+    kept = _min_max_indices(x, y, 0, len(x), x[0], x[-1], n_columns)
+
+    assert np.all(np.diff(kept) > 0)
+    bounds = np.searchsorted(x, np.linspace(x[0], x[-1], n_columns + 1)[1:-1])
+    for first, last in zip(np.concatenate([[0], bounds]), np.concatenate([bounds, [len(x)]])):
+        if last == first:
+            continue
+        in_column = kept[(kept >= first) & (kept < last)]
+        assert first in in_column and last - 1 in in_column
+        assert y[in_column].min() == y[first:last].min()
+        assert y[in_column].max() == y[first:last].max()
+
+def test_lttb_keeps_the_end_points_and_extremes():
+    x, y = _walk(50_000, seed=1)
+
+    for start, stop in ((0, len(x)), (1234, 40_000)):
+        kept = _lttb_indices(x, y, start, stop, 500)
+
+        assert kept[0] == start and kept[-1] == stop - 1
+        assert np.all(np.diff(kept) > 0) and len(kept) <= 500 + 2
+        assert start + np.argmin(y[start:stop]) in kept
+        assert start + np.argmax(y[start:stop]) in kept
+
+def test_changing_xlim_redecimates_the_visible_range():
+    x, y = _walk(200_000, seed=2)
+
+    for method in ("minmax", "lttb"):
+        fig, ax = line_plot(x, y, downsample=method)
+        (line,) = ax.get_lines()
+        assert len(line.get_xdata()) < len(x) // 10
+
+        lo, hi = x[1000], x[1500]                                                                   # few enough to draw all
+        ax.set_xlim(lo, hi)
+        np.testing.assert_array_equal(line.get_xdata(), x[999:1502])
+        np.testing.assert_array_equal(line.get_ydata(), y[999:1502])
+
+        ax.set_xlim(x[0], x[-1])
+        assert len(line.get_xdata()) < len(x) // 10
+        plt.close(fig)
@@ -0,0 +1,23 @@
+import numpy as np
+from tufteplotlib.plots.quartile import _grouped_quartiles, _sort_by_group
+
+def _reference(values):
+    """Quartiles and whisker ends of one group, as the per-group np.percentile loop computed them."""
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    if len(inside) == 0:
+        inside = values
+    return inside.min(), q1, median, q3, inside.max()
+
+def test_grouped_quartiles_equal_per_group_np_percentile():
+    rng = np.random.default_rng(0)
+    groups = [np.round(rng.standard_t(2, size), 1) for size in rng.integers(1, 40, 300)]
+    groups.append(np.array([-10.3, -1.2, 0.0, 0.1, 0.3, 0.4, 0.5, 0.55, 1.0, 2.1, 3.2]))
+
+    codes = np.concatenate([np.full(len(g), i) for i, g in enumerate(groups)])
+    segments = _sort_by_group(codes, np.concatenate(groups), len(groups))
+    lower, q1, median, q3, upper, _, _ = _grouped_quartiles(*segments)
+
+    expected = np.array([_reference(g) for g in groups])
+    np.testing.assert_array_equal(np.column_stack([lower, q1, median, q3, upper]), expected)
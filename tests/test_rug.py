@@ -0,0 +1,22 @@
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from tufteplotlib import rug_plot
+
+def test_rugs_are_clipped_to_the_view_limits():
+    rng = np.random.default_rng(0)
+    fig, ax = rug_plot(rng.uniform(0, 10, 200), rng.uniform(0, 10, 200))
+    ax.set_xlim(4, 6)
+    ax.set_ylim(4, 6)
+    fig.canvas.draw()
+
+    rugs = ax.collections[1:]
+    assert len(rugs) == 2
+
+    x_clip, y_clip = (rug.get_clip_box() for rug in rugs)
+    assert (x_clip.x0, x_clip.x1) == (ax.bbox.x0, ax.bbox.x1)
+    assert x_clip.y1 == ax.bbox.y0
+    assert (y_clip.y0, y_clip.y1) == (ax.bbox.y0, ax.bbox.y1)
+    assert y_clip.x1 == ax.bbox.x0
+    plt.close(fig)
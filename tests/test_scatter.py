@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+import matplotlib
+matplotlib.use("Agg")
+from tufteplotlib.plots import scatter
+
+@pytest.mark.parametrize("radius", [0.4, 2.5, 7.3])
+def test_disc_sum_fft_matches_shifted_sum(radius, monkeypatch):
+    grid = np.random.default_rng(0).poisson(0.1, (60, 80))
+
+    monkeypatch.setattr(scatter, "_DISC_FFT_RADIUS", 100)
+    shifted = scatter._disc_sum(grid, radius)
+    monkeypatch.setattr(scatter, "_DISC_FFT_RADIUS", 0)
+    convolved = scatter._disc_sum(grid, radius)
+
+    np.testing.assert_allclose(convolved, shifted, atol=1e-9)
+    np.testing.assert_array_equal(convolved > 0, shifted > 0)
+
+def _exact_lowess(x, y, span=2/3, iterations=3):
+    """Reference LOWESS (Cleveland 1979) fitted at every point, O(N^2)."""
+    k = int(span * len(x) + 1e-10)
+    robustness = np.ones(len(x))
+    for iteration in range(iterations + 1):
+        fit = np.empty(len(x))
+        for i in range(len(x)):
+            distance = np.abs(x - x[i])
+            bandwidth = np.partition(distance, k - 1)[k - 1]
+            w = np.clip(1 - (distance / bandwidth)**3, 0, 1)**3 * robustness
+            dx = x - x[i]
+            s0, s1, s2, t0, t1 = w.sum(), w @ dx, w @ dx**2, w @ y, w @ (dx * y)
+            fit[i] = (t0 - (s0 * t1 - s1 * t0) / (s0 * s2 - s1**2) * s1) / s0
+        if iteration == iterations:
+            break
+        residual = np.abs(y - fit)
+        robustness = np.clip(1 - (residual / (6 * np.median(residual)))**2, 0, 1)**2
+    return fit
+
+def test_binned_lowess_is_exact_with_one_x_per_bin():
+    rng = np.random.default_rng(0)
+    x = np.concatenate([np.arange(150.0), [10.0, 10.0, 75.0]])                                      # some repeated x
+    y = np.sin(x / 20) + rng.normal(0, 0.3, len(x))
+    y[[5, 60, 120]] += 5                                                                            # outliers
+
+    for span in (0.3, 2 / 3):
+        x_fit, y_fit = scatter._binned_lowess(x, y, span)
+        np.testing.assert_allclose(np.interp(x, x_fit, y_fit), _exact_lowess(x, y, span), atol=1e-9)
+
+def test_binned_lowess_close_to_exact_with_many_points_per_bin():
+    rng = np.random.default_rng(1)
+    x = rng.uniform(0, 10, 2000)
+    y = np.sin(x) + rng.normal(0, 0.5, len(x))
+
+    x_fit, y_fit = scatter._binned_lowess(x, y, 0.3)
+
+    assert np.abs(np.interp(x, x_fit, y_fit) - _exact_lowess(x, y, 0.3)).max() < 0.05
+
+def test_invalid_smoother_span_raises_before_drawing():
+    import matplotlib.pyplot as plt
+
+    plt.close("all")
+    with pytest.raises(ValueError, match="smoother span"):
+        scatter.scatter_plot(np.arange(10.0), np.arange(10.0), smoother=1.5)
+
+    assert plt.get_fignums() == []
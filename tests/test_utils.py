@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+from tufteplotlib.utils import _weighted_quantile
+
+@pytest.mark.parametrize("q", [0, 10, 25, 50, 75, 90, 100])
+def test_weighted_quantile_matches_expanded_data(q):
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 1, 50)
+    weights = rng.integers(0, 5, 50)
+
+    expected = np.percentile(np.repeat(values, weights), q)
+    assert _weighted_quantile(values, weights, q) == pytest.approx(expected)
+
+def test_weighted_median_with_unit_weights_is_median():
+    values = np.array([4.0, 1.0, 3.0, 2.0])
+
+    assert _weighted_quantile(values, np.ones(4), 50) == np.median(values) == 2.5
@@ -4,11 +4,19 @@ from .plots    import barcode_plot
 from .plots    import bar_chart
 from .plots    import column_chart
 from .plots    import density_plot
+from .plots    import density_small_multiples
+from .plots    import galaxy_image
 from .plots    import galaxy_plot
+from .plots    import GalaxyAccumulator
+from .plots    import GalaxyPyramid
 from .plots    import histogram_plot
+from .plots    import HistogramAccumulator
+from .plots    import LogHistogramAccumulator
 from .plots    import line_plot
 from .plots    import pareto_chart
 from .plots    import quartile_plot
+from .plots    import QuartileAccumulator
+from .plots    import quartile_summary_plot
 from .plots    import rug_plot
 from .plots    import scatter_plot
 from .plots    import slopegraph
@@ -25,11 +33,19 @@ __all__ = ["add_min_max_colorbar",
            "bar_chart",
            "column_chart",
            "density_plot",
+           "density_small_multiples",
            "histogram_plot",
+           "HistogramAccumulator",
+           "LogHistogramAccumulator",
+           "galaxy_image",
            "galaxy_plot",
+           "GalaxyAccumulator",
+           "GalaxyPyramid",
            "line_plot",
            "pareto_chart",
            "quartile_plot",
+           "QuartileAccumulator",
+           "quartile_summary_plot",
            "rug_plot",
            "scatter_plot",
            "slopegraph",
@@ -0,0 +1,735 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+# Number of points processed per pass, so temporaries stay small regardless of input size
+_CHUNK_SIZE = 1 << 20
+
+# Values per block in the uniform histogram fast path, small enough for the temporaries to stay in
+# cache (as np.histogram does)
+_BLOCK_SIZE = 1 << 16
+
+####################################################################################################
+#                                 Map values to half-open bin indices                              #
+####################################################################################################
+def _bin_index(values, edges):
+    """
+    Map each value to the index of the half-open bin [edges[i], edges[i+1]) that contains it.
+
+    Uniform edges (as produced by np.linspace) use a single multiply-and-floor, followed by a
+    one-step correction against the edges themselves so that the result is identical to comparing
+    every value with the edge array. Other edges (e.g. from _quantile_edges) use a binary search.
+
+    Parameters:
+        values : 1D array of values
+        edges  : 1D array of monotonically increasing bin edges
+
+    Returns:
+        1D intp array of bin indices, with -1 for values outside [edges[0], edges[-1]) or NaN
+    """
+    n_bins = len(edges) - 1
+    lo, hi = edges[0], edges[-1]
+
+    if not _is_uniform(edges):
+        idx = np.searchsorted(edges, values, side='right') - 1                                      # NaN sorts last
+        idx[idx >= n_bins] = -1
+        return idx
+
+    idx = np.floor((values - lo) * (n_bins / (hi - lo)))
+    np.clip(idx, 0, n_bins - 1, out=idx)                                                            # NaN stays NaN
+    idx = np.nan_to_num(idx, nan=0).astype(np.intp)
+
+    # Correct for floating point round-off at the bin edges
+    idx -= values < edges[idx]
+    idx += values >= edges[np.minimum(idx + 1, n_bins)]
+
+    idx[~((values >= lo) & (values < hi))] = -1
+
+    return idx
+
+def _is_uniform(edges, rtol=1e-9):
+    """True if the bin edges are equispaced, up to floating point round-off."""
+    widths = np.diff(edges)
+    return bool(np.all(np.abs(widths - widths.mean()) <= rtol * abs(edges[-1] - edges[0])))
+
+####################################################################################################
+#                            Equal-count bin edges from a random sample                            #
+####################################################################################################
+def _quantile_edges(values, n_bins, lo, hi, sample_size=100_000, seed=0):
+    """
+    Bin edges at approximate quantiles of the values, so each bin holds a similar number of them.
+
+    Quantiles are estimated from a random sample (drawn with replacement, so memory-mapped values
+    are only read at the sampled positions) instead of sorting all the data. The standard error of
+    each quantile is about sqrt(q (1 - q) / sample_size) in rank, i.e. well under 1% of the data
+    for the default sample size.
+
+    Parameters:
+        values      : 1D array of values
+        n_bins      : number of bins
+        lo, hi      : outer edges, usually the exact min and max of the values
+        sample_size : number of values sampled
+        seed        : seed for the sample
+
+    Returns:
+        strictly increasing edges from lo to hi. Repeated quantiles (e.g. discrete data) are
+        merged, so there may be fewer than n_bins bins.
+    """
+    rng = np.random.default_rng(seed)
+
+    if len(values) <= sample_size:
+        sample = np.asarray(values)
+    else:
+        sample = np.asarray(values[np.sort(rng.integers(0, len(values), sample_size))])
+
+    inner = np.nanquantile(sample, np.linspace(0, 1, n_bins + 1)[1:-1])
+    inner = inner[(inner > lo) & (inner < hi)]
+
+    return np.unique(np.concatenate([[lo], inner, [hi]]))
+
+####################################################################################################
+#                            Counts over equal-width bins (1D histogram)                           #
+####################################################################################################
+def _uniform_counts(values, lo, hi, n_bins, workers=1, weights=None, edges=None):
+    """
+    Count values into n_bins equal-width bins spanning [lo, hi], in one pass.
+
+    Each block of values is mapped to bins with a single subtract, multiply and truncate, corrected
+    by one step against the edge array as np.histogram does (see _uniform_index), and counted with
+    np.bincount. float32 input is binned in float32 (other types in float64), so it is never
+    upcast in full. hi is counted in the last bin.
+
+    With workers > 1, contiguous slices of the values are counted in a thread pool and the counts
+    are added. NumPy releases the GIL in the arithmetic, so this scales with cores.
+
+    Parameters:
+        values  : 1D array of values, all within [lo, hi] (np.memmap is read one block at a time)
+        lo, hi  : outer edges, lo < hi, usually the min and max of the values
+        n_bins  : number of bins
+        workers : number of threads
+        weights : optional 1D array of weights, same length as values
+        edges   : n_bins + 1 edges from lo to hi that values are counted against, by default
+                  np.linspace(lo, hi, n_bins + 1)
+
+    Returns:
+        1D array of n_bins counts (int64, or float64 summed weights)
+    """
+    if edges is None:
+        edges = np.linspace(lo, hi, n_bins + 1)
+    dtype = np.float32 if values.dtype == np.float32 else np.float64
+    lo, scale = dtype(lo), dtype(n_bins / (float(hi) - float(lo)))
+
+    def count(start, stop):
+        counts = np.zeros(n_bins, dtype=np.int64 if weights is None else np.float64)
+        for block_start in range(start, stop, _BLOCK_SIZE):
+            block_stop = min(block_start + _BLOCK_SIZE, stop)
+            block = np.asarray(values[block_start:block_stop], dtype=dtype)
+            index = _uniform_index(block, lo, scale, edges)
+            weight = None if weights is None else weights[block_start:block_stop]
+            counts += np.bincount(index, weights=weight, minlength=n_bins)
+        return counts
+
+    if workers <= 1 or len(values) <= _BLOCK_SIZE:
+        return count(0, len(values))
+
+    bounds = np.linspace(0, len(values), workers + 1).astype(np.intp)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(count, bounds[:-1], bounds[1:]))
+
+def _uniform_index(values, lo, scale, edges):
+    """
+    Index of the equal-width bin of each value, all within [edges[0], edges[-1]], with the last bin
+    closed. The multiply-and-truncate estimate is corrected by one step against the edges, as in
+    np.histogram, so values on (or within round-off of) an edge land where np.histogram puts them.
+
+    Parameters:
+        values : 1D array of values
+        lo     : edges[0], in the type of values
+        scale  : number of bins / (edges[-1] - edges[0]), in the type of values
+        edges  : 1D array of equispaced bin edges
+
+    Returns:
+        1D intp array of bin indices
+    """
+    n_bins = len(edges) - 1
+    index = ((values - lo) * scale).astype(np.intp)                                                 # floor, as >= 0
+    np.minimum(index, n_bins - 1, out=index)                                                        # closed last bin
+
+    # Correct for floating point round-off at the bin edges
+    index -= values < edges[index]
+    index += (values >= edges[index + 1]) & (index < n_bins - 1)
+
+    return index
+
+####################################################################################################
+#                           Counts over an equal-width 2D grid (raster)                            #
+####################################################################################################
+def _uniform_counts_2d(x, y, x_range, y_range, nx, ny):
+    """
+    Count points into an (ny, nx) grid of equal-width cells spanning x_range by y_range, one block
+    of points at a time, so memory stays constant whatever the number of points.
+
+    Parameters:
+        x, y             : 1D arrays of coordinates (np.memmap is read one block at a time)
+        x_range, y_range : (lo, hi) extent of the grid; points outside it are dropped
+        nx, ny           : number of cells along x and y
+
+    Returns:
+        (ny, nx) int64 array of counts, row 0 at y_range[0]
+    """
+    counts = np.zeros(nx * ny, dtype=np.int64)
+    for start in range(0, len(x), _BLOCK_SIZE):
+        cells = _grid_cells(x[start:start + _BLOCK_SIZE], y[start:start + _BLOCK_SIZE],
+                            x_range, y_range, nx, ny)
+        counts += np.bincount(cells[cells >= 0], minlength=nx * ny)
+
+    return counts.reshape(ny, nx)
+
+def _grid_cells(x, y, x_range, y_range, nx, ny):
+    """
+    Linear index of the cell of each point in an (ny, nx) row-major grid of equal-width cells.
+    Cells are found by a multiply and truncate, without edge correction, and hi is in the last
+    cell.
+
+    Returns:
+        1D intp array of cell indices, with -1 for points outside the grid or NaN
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    inside = ((x >= x_range[0]) & (x <= x_range[1]) &                                               # also drops NaN
+              (y >= y_range[0]) & (y <= y_range[1]))
+
+    ix = np.floor((x - x_range[0]) * (nx / (x_range[1] - x_range[0])))
+    iy = np.floor((y - y_range[0]) * (ny / (y_range[1] - y_range[0])))
+    cells = np.minimum(iy, ny - 1) * nx + np.minimum(ix, nx - 1)                                    # hi in the last cell
+    cells[~inside] = -1
+
+    return cells.astype(np.intp)
+
+####################################################################################################
+#                    Stratified sample of 2D points that keeps the extreme points                  #
+####################################################################################################
+def _stratified_sample(x, y, max_points, seed=0, n_cells=64):
+    """
+    Indices of at most max_points points, sampled evenly over space rather than in proportion to
+    density, always including the points with the smallest and largest x and y.
+
+    The points are counted over an n_cells x n_cells grid spanning their bounds, and the sample is
+    shared between the cells by water-filling: every cell gets the same quota, except that cells
+    with fewer points keep all of them, so sparse regions and outliers survive. A second pass keeps
+    each point with probability quota / count of its cell, and any excess over max_points is
+    dropped at random. Both passes read one block at a time, so time is O(N) and only the sample
+    is stored.
+
+    Parameters:
+        x, y       : 1D arrays of coordinates, the same length
+        max_points : maximum number of points kept, at least 4
+        seed       : seed for the sample
+        n_cells    : number of grid cells along each axis
+
+    Returns:
+        sorted 1D intp array of point indices
+    """
+    rng = np.random.default_rng(seed)
+
+    extremes = np.unique([np.argmin(x), np.argmax(x), np.argmin(y), np.argmax(y)])
+    budget = max_points - len(extremes)
+
+    x_range = (x[extremes].min(), x[extremes].max())
+    y_range = (y[extremes].min(), y[extremes].max())
+    x_range = x_range if x_range[1] > x_range[0] else (x_range[0], x_range[0] + 1)                  # all equal
+    y_range = y_range if y_range[1] > y_range[0] else (y_range[0], y_range[0] + 1)
+
+    counts = _uniform_counts_2d(x, y, x_range, y_range, n_cells, n_cells).ravel()
+    probability = _water_fill(counts, budget) / np.maximum(counts, 1)
+
+    picked = []
+    for start in range(0, len(x), _BLOCK_SIZE):
+        cells = _grid_cells(x[start:start + _BLOCK_SIZE], y[start:start + _BLOCK_SIZE],
+                            x_range, y_range, n_cells, n_cells)
+        keep = (cells >= 0) & (rng.random(len(cells)) < probability[cells])
+        picked.append(start + np.flatnonzero(keep))
+
+    index = np.setdiff1d(np.concatenate(picked), extremes)
+    if len(index) > budget:
+        index = rng.choice(index, budget, replace=False)
+
+    return np.union1d(index, extremes)
+
+def _water_fill(counts, budget):
+    """
+    Share a budget between bins: each gets min(count, level), with the level set so that the
+    shares add up to the budget (or every bin gets its full count, if the budget allows).
+
+    Returns:
+        1D float array of shares
+    """
+    if counts.sum() <= budget:
+        return counts.astype(np.float64)
+
+    ordered = np.sort(counts)
+    below = np.concatenate([[0], np.cumsum(ordered)[:-1]])                                          # total of smaller bins
+    cost = below + ordered * (len(ordered) - np.arange(len(ordered)))                               # total if level = ordered[k]
+    k = np.searchsorted(cost, budget)
+    level = (budget - below[k]) / (len(ordered) - k)
+
+    return np.minimum(counts, level).astype(np.float64)
+
+####################################################################################################
+#                  Log-linear (high dynamic range) buckets with fixed relative precision           #
+####################################################################################################
+def _log_linear_index(values, lowest, sub_buckets):
+    """
+    Map positive values to log-linear buckets, as in HdrHistogram: each power-of-two range above
+    lowest, [lowest * 2^k, lowest * 2^(k+1)), is split into sub_buckets equal-width buckets. A
+    bucket's width is at most 1 / sub_buckets of its lower edge, so the relative precision is
+    fixed from microseconds to hours with a few thousand buckets.
+
+    O(1) per value: np.frexp gives the power of two and the mantissa directly, with no logarithm
+    or search. Bucket indices do not depend on the data, so counts from different processes or
+    time windows with the same lowest and sub_buckets add elementwise.
+
+    Parameters:
+        values      : 1D array of values; those below lowest are counted in the first bucket
+        lowest      : lower edge of the first bucket, > 0
+        sub_buckets : number of buckets per power of two
+
+    Returns:
+        1D intp array of bucket indices, >= 0
+    """
+    mantissa, exponent = np.frexp(np.maximum(values, lowest) / lowest)                             # value / lowest = 2m 2^(e-1)
+    sub = ((2 * mantissa - 1) * sub_buckets).astype(np.intp)
+
+    return (exponent.astype(np.intp) - 1) * sub_buckets + sub
+
+def _log_linear_edges(n_buckets, lowest, sub_buckets):
+    """Edges of the first n_buckets log-linear buckets (see _log_linear_index)."""
+    i = np.arange(n_buckets + 1)
+
+    return lowest * np.ldexp(1 + (i % sub_buckets) / sub_buckets, i // sub_buckets)
+
+def _signed_log_linear_index(values, lowest, sub_buckets):
+    """
+    Log-linear bucket keys for values of either sign, ordered like the values: key 0 holds
+    (-lowest, lowest), key i + 1 holds positive values in log-linear bucket i, and key -(i + 1)
+    the negative values whose magnitude is in bucket i.
+
+    Returns:
+        1D int64 array of keys
+    """
+    magnitude = np.abs(values)
+    keys = _log_linear_index(magnitude, lowest, sub_buckets).astype(np.int64) + 1
+    keys[magnitude < lowest] = 0
+
+    return np.where(values < 0, -keys, keys)
+
+def _signed_log_linear_bounds(keys, lowest, sub_buckets):
+    """Lower and upper bounds of the values in each signed log-linear bucket."""
+    i = np.abs(keys) - 1
+    lower_edge = lowest * np.ldexp(1 + (i % sub_buckets) / sub_buckets, i // sub_buckets)
+    upper_edge = lowest * np.ldexp(1 + (i % sub_buckets + 1) / sub_buckets, i // sub_buckets)
+
+    lower = np.where(keys > 0, lower_edge, np.where(keys < 0, -upper_edge, -lowest))
+    upper = np.where(keys > 0, upper_edge, np.where(keys < 0, -lower_edge, lowest))
+
+    return lower, upper
+
+####################################################################################################
+#                              Linear (row-major) index into a 2D grid                             #
+####################################################################################################
+def _grid_index(x, y, x_edges, y_edges):
+    """
+    Map (x, y) points to the linear index of their cell in a (ny, nx) row-major grid.
+
+    Returns:
+        1D intp array of linear indices, with -1 for points outside the grid
+    """
+    nx = len(x_edges) - 1
+    ix = _bin_index(x, x_edges)
+    iy = _bin_index(y, y_edges)
+
+    lin = iy * nx + ix
+    lin[(ix < 0) | (iy < 0)] = -1
+
+    return lin
+
+####################################################################################################
+#                                 Per-bin reductions and statistics                                #
+####################################################################################################
+# Statistic(s) that must be accumulated for each reduction. Quantiles ("median", "p95", ...) are
+# read from a per-bin histogram sketch over a fixed z range.
+_REDUCTIONS = {"count" : ("count",),
+               "sum"   : ("count", "sum"),
+               "mean"  : ("count", "sum"),
+               "min"   : ("count", "min"),
+               "max"   : ("count", "max"),
+               "median": ("count", "sketch")}
+
+def _parse_reduction(reduce):
+    """
+    Validate a reduction name.
+
+    Parameters:
+        reduce : "count", "sum", "mean", "min", "max", "median", or "p<q>" for the q-th percentile
+                 (e.g. "p95", "p99.9")
+
+    Returns:
+        (statistics required, percentile or None)
+    """
+    if reduce in _REDUCTIONS:
+        return _REDUCTIONS[reduce], (50.0 if reduce == "median" else None)
+
+    if isinstance(reduce, str) and reduce.startswith("p"):
+        try:
+            q = float(reduce[1:])
+        except ValueError:
+            q = None
+        if q is not None and 0 <= q <= 100:
+            return ("count", "sketch"), q
+
+    raise ValueError(f"reduce must be one of {sorted(_REDUCTIONS)} or 'p<0-100>', got {reduce!r}")
+
+def _new_stats(size, names, sketch_bins=None):
+    """
+    Allocate empty flat per-bin statistic arrays.
+
+    Parameters:
+        size        : number of bins
+        names       : statistics to allocate ("count", "sum", "min", "max", "sketch")
+        sketch_bins : number of z bins in each per-bin quantile sketch
+
+    Returns:
+        dict of name -> array
+    """
+    stats = {"count": np.zeros(size, dtype=np.int64)}
+
+    if "sum" in names:
+        stats["sum"] = np.zeros(size)
+    if "min" in names:
+        stats["min"] = np.full(size, np.inf)
+    if "max" in names:
+        stats["max"] = np.full(size, -np.inf)
+    if "sketch" in names:
+        stats["sketch"] = np.zeros(size * sketch_bins, dtype=np.int64)
+
+    return stats
+
+def _merge_stats(stats, other):
+    """Combine two sets of statistics over the same bins into the first, in place."""
+    if "index" in stats:
+        merged = _group_sparse(np.concatenate([stats["index"], other["index"]]),
+                               {name: np.concatenate([stats[name], other[name]])
+                                for name in stats if name != "index"})
+        stats.clear()
+        stats.update(merged)
+        return
+
+    for name, values in other.items():
+        if name == "min":
+            np.minimum(stats[name], values, out=stats[name])
+        elif name == "max":
+            np.maximum(stats[name], values, out=stats[name])
+        else:
+            stats[name] += values
+
+def _finalize(stats, reduce, z_edges=None):
+    """
+    Turn accumulated statistics into a flat grid for one reduction.
+
+    Quantiles follow np.percentile: linear interpolation between the order statistics either side
+    of the (0-based) rank q / 100 * (n - 1). Each order statistic is placed in the middle of its
+    share of the sketch bin holding it, so the error is at most one sketch bin width,
+    (z_max - z_min) / sketch_bins. Values of z outside the sketch range are clamped into its
+    first or last bin.
+
+    Returns:
+        flat float array, NaN for bins without points (0 for "count")
+    """
+    _, q = _parse_reduction(reduce)
+    count = stats["count"]
+    empty = count == 0
+
+    if reduce == "count":
+        return count.astype(float)
+
+    if reduce == "sum":
+        grid = stats["sum"].copy()
+    elif reduce == "mean":
+        grid = stats["sum"] / np.maximum(count, 1)
+    elif reduce in ("min", "max"):
+        grid = stats[reduce].astype(float)
+    else:
+        n_z = len(z_edges) - 1
+        sketch = stats["sketch"].reshape(-1, n_z)
+        cumulative = np.cumsum(sketch, axis=1)
+        rows = np.arange(len(sketch))
+
+        def order_statistic(j):
+            k = np.argmax(cumulative > j[:, None], axis=1)                                          # sketch bin holding it
+            count = np.maximum(sketch[rows, k], 1)
+            fraction = (j - (cumulative[rows, k] - sketch[rows, k]) + 0.5) / count
+            return z_edges[k] + fraction * (z_edges[k + 1] - z_edges[k])
+
+        rank = q / 100 * np.maximum(cumulative[:, -1] - 1, 0)
+        low, high = order_statistic(np.floor(rank)), order_statistic(np.ceil(rank))
+
+        grid = low + (rank - np.floor(rank)) * (high - low)
+        empty |= cumulative[:, -1] == 0
+
+    grid[empty] = np.nan
+
+    return grid
+
+####################################################################################################
+#                         Accumulate per-bin statistics of z over a 2D grid                        #
+####################################################################################################
+def _reduce_points(stats, index, z, z_edges=None):
+    """
+    Fold points already mapped to bin indices into per-bin statistics, in place.
+
+    Counts and sums are reduced with np.bincount, min and max with unbuffered np.minimum.at /
+    np.maximum.at, and quantile sketches by counting the (bin, z bin) pairs.
+
+    Parameters:
+        stats   : dict of statistic arrays, as made by _new_stats
+        index   : 1D intp array of bin indices in [0, size)
+        z       : 1D array of values, same length as index
+        z_edges : edges of the quantile sketch bins, required if "sketch" is in stats
+    """
+    size = stats["count"].size
+
+    stats["count"] += np.bincount(index, minlength=size)
+
+    if "sum" in stats:
+        stats["sum"] += np.bincount(index, weights=z, minlength=size)
+    if "min" in stats:
+        np.minimum.at(stats["min"], index, z)
+    if "max" in stats:
+        np.maximum.at(stats["max"], index, z)
+    if "sketch" in stats:
+        n_z = len(z_edges) - 1
+        iz = _bin_index(z, z_edges)
+        iz[z < z_edges[0]] = 0                                                                      # clamp into the sketch range
+        iz[z >= z_edges[-1]] = n_z - 1
+        valid = iz >= 0                                                                             # drops NaN
+        counts = np.bincount(index[valid] * n_z + iz[valid], minlength=size * n_z)
+        stats["sketch"] += counts.reshape(stats["sketch"].shape)
+
+def _accumulate_2d(stats, x, y, z, x_edges, y_edges, z_edges=None):
+    """
+    Fold a batch of points into running per-cell statistics, in place.
+
+    Each point is mapped to its cell exactly once, and all requested statistics come from the
+    same pass over the data. Work is done in chunks so memory overhead is bounded by the chunk
+    size, not the input size, which also means memory-mapped inputs are only paged in one chunk
+    at a time.
+
+    Sparse statistics (those with an "index" entry) are reduced per chunk over the cells the
+    chunk touches, then merged into the running set of occupied cells.
+
+    Parameters:
+        stats   : dict of statistic arrays, as made by _new_stats or _new_sparse_stats
+        x, y, z : 1D arrays of equal length
+        x_edges : bin edges along x (nx + 1 values)
+        y_edges : bin edges along y (ny + 1 values)
+        z_edges : edges of the quantile sketch bins, required if "sketch" is in stats
+    """
+    sketch_bins = None if z_edges is None else len(z_edges) - 1
+
+    for start in range(0, len(x), _CHUNK_SIZE):
+        stop = start + _CHUNK_SIZE
+        lin = _grid_index(np.asarray(x[start:stop]), np.asarray(y[start:stop]), x_edges, y_edges)
+        keep = lin >= 0
+        lin = lin[keep]
+        z_chunk = np.asarray(z[start:stop])[keep]
+
+        if "index" not in stats:
+            _reduce_points(stats, lin, z_chunk, z_edges)
+            continue
+
+        occupied, inverse = np.unique(lin, return_inverse=True)
+        chunk = _new_sparse_stats(stats.keys(), sketch_bins, size=len(occupied))
+        chunk["index"] = occupied
+        _reduce_points(chunk, inverse, z_chunk, z_edges)
+        _merge_stats(stats, chunk)
+
+####################################################################################################
+#                         Sparse per-bin statistics (occupied cells only)                          #
+####################################################################################################
+def _new_sparse_stats(names, sketch_bins=None, size=0):
+    """
+    Allocate sparse statistics: a sorted "index" of occupied linear bin indices, plus one row of
+    each statistic per occupied bin. Memory is proportional to the number of occupied bins.
+    """
+    stats = _new_stats(size, names, sketch_bins)
+    stats["index"] = np.zeros(size, dtype=np.int64)
+    if "sketch" in stats:
+        stats["sketch"] = stats["sketch"].reshape(size, sketch_bins)
+
+    return stats
+
+def _group_sparse(index, stats):
+    """
+    Combine rows of sparse statistics that share a bin index.
+
+    Parameters:
+        index : 1D int array of bin indices, possibly with duplicates
+        stats : dict of statistic arrays with one row per entry of index ("index" is ignored)
+
+    Returns:
+        new dict of sparse statistics, sorted by unique index
+    """
+    unique, inverse = np.unique(index, return_inverse=True)
+    n = len(unique)
+    grouped = {"index": unique.astype(np.int64)}
+
+    for name, values in stats.items():
+        if name == "index":
+            continue
+        elif name == "sum":
+            grouped[name] = np.bincount(inverse, weights=values, minlength=n)
+        elif name == "min":
+            grouped[name] = np.full(n, np.inf)
+            np.minimum.at(grouped[name], inverse, values)
+        elif name == "max":
+            grouped[name] = np.full(n, -np.inf)
+            np.maximum.at(grouped[name], inverse, values)
+        else:                                                                                       # count and sketch add
+            grouped[name] = np.zeros((n,) + values.shape[1:], dtype=values.dtype)
+            np.add.at(grouped[name], inverse, values)
+
+    return grouped
+
+def _coarsen_sparse(stats, nx, fx, fy):
+    """
+    Merge sparse statistics on a row-major grid with nx columns into blocks of fy x fx cells.
+
+    Returns:
+        sparse statistics on the coarser grid, which has ceil(nx / fx) columns
+    """
+    ix = stats["index"] % nx // fx
+    iy = stats["index"] // nx // fy
+
+    return _group_sparse(iy * -(-nx // fx) + ix, stats)
+
+def _densify(index, values, size, fill=np.nan):
+    """Scatter sparse values into a flat dense array of the given size."""
+    dense = np.full(size, fill, dtype=float)
+    dense[index] = values
+
+    return dense
+
+####################################################################################################
+#                      Multi-process per-bin statistics over shared memory                         #
+####################################################################################################
+def _shard_2d(names, dtypes, n_points, start, stop, stat_names, x_edges, y_edges, z_edges):
+    """
+    Worker: attach to the shared x, y, z blocks and bin the points in [start, stop).
+
+    Returns:
+        dict of statistic arrays for this shard (sparse if "index" is in stat_names)
+    """
+    size = (len(x_edges) - 1) * (len(y_edges) - 1)
+    sketch_bins = None if z_edges is None else len(z_edges) - 1
+    if "index" in stat_names:
+        stats = _new_sparse_stats(stat_names, sketch_bins)
+    else:
+        stats = _new_stats(size, stat_names, sketch_bins)
+
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        x, y, z = (np.ndarray((n_points,), dtype=dtype, buffer=block.buf)
+                   for block, dtype in zip(blocks, dtypes))
+
+        _accumulate_2d(stats, x[start:stop], y[start:stop], z[start:stop],
+                       x_edges, y_edges, z_edges)
+        del x, y, z                                                                                 # release views before close
+    finally:
+        for block in blocks:
+            block.close()
+
+    return stats
+
+def _parallel_accumulate_2d(stats, x, y, z, x_edges, y_edges, z_edges, workers, pool=None):
+    """
+    Same as _accumulate_2d, but the points are binned by several processes.
+
+    The points are copied, one round of workers * _CHUNK_SIZE at a time, into fixed-size blocks
+    of shared memory, and each worker bins its own contiguous shard of the round directly from
+    there, so only the small per-shard statistics are pickled. These are merged elementwise (max,
+    min, or sum). Memory stays bounded by the blocks whatever the number of points, and an
+    np.memmap is read one round at a time.
+
+    Parameters:
+        stats, x, y, z, x_edges, y_edges, z_edges : as for _accumulate_2d
+        workers : number of processes
+        pool    : optional ProcessPoolExecutor to reuse, with at least that many workers;
+                  otherwise one is created for this call
+    """
+    n_points = len(x)
+    if n_points == 0:
+        return
+
+    capacity = min(n_points, workers * _CHUNK_SIZE)
+    dtypes = [np.asarray(array[:1]).dtype for array in (x, y, z)]
+
+    own_pool = pool is None
+    if own_pool:
+        pool = ProcessPoolExecutor(max_workers=workers)
+
+    blocks = []
+    try:
+        for dtype in dtypes:
+            blocks.append(shared_memory.SharedMemory(create=True, size=max(capacity * dtype.itemsize, 1)))
+        buffers = [np.ndarray((capacity,), dtype=dtype, buffer=block.buf)
+                   for block, dtype in zip(blocks, dtypes)]
+        names = [block.name for block in blocks]
+
+        for round_start in range(0, n_points, capacity):
+            round_stop = min(round_start + capacity, n_points)
+            for buffer, array in zip(buffers, (x, y, z)):
+                buffer[:round_stop - round_start] = array[round_start:round_stop]
+
+            bounds = np.linspace(0, round_stop - round_start, workers + 1).astype(int)
+            futures = [pool.submit(_shard_2d, names, dtypes, capacity, start, stop,
+                                   tuple(stats), x_edges, y_edges, z_edges)
+                       for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+            for future in futures:
+                _merge_stats(stats, future.result())
+
+        del buffers                                                                                 # release views before close
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+        if own_pool:
+            pool.shutdown()
+
+####################################################################################################
+#                                 Halve the resolution of a 2D grid                                #
+####################################################################################################
+def _downsample_2x2(grid, how):
+    """
+    Combine each 2x2 block of cells into one. Odd dimensions are padded with empty (NaN) cells.
+
+    Parameters:
+        grid : (ny, nx) float array, NaN for empty cells
+        how  : "max", "min" or "sum"
+
+    Returns:
+        (ceil(ny/2), ceil(nx/2)) float array, NaN where all four cells were empty
+    """
+    ny, nx = grid.shape
+    padded = np.full((ny + ny % 2, nx + nx % 2), np.nan)
+    padded[:ny, :nx] = grid
+    blocks = padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2)
+
+    if how == "max":
+        return np.fmax.reduce(blocks, axis=(1, 3))                                                  # fmax/fmin skip NaN
+    if how == "min":
+        return np.fmin.reduce(blocks, axis=(1, 3))
+    if how == "sum":
+        empty = np.isnan(blocks).all(axis=(1, 3))
+        return np.where(empty, np.nan, np.nansum(blocks, axis=(1, 3)))
+
+    raise ValueError(f"how must be 'max', 'min' or 'sum', got {how!r}")
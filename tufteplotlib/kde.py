@@ -0,0 +1,391 @@
+import numpy as np
+from tufteplotlib.binning import _CHUNK_SIZE
+
+try:
+    from scipy.stats import gaussian_kde
+except ImportError:                                                                                 # scipy is optional
+    gaussian_kde = None
+
+# Above this many samples, density estimates use the binned FFT engine instead of an exact KDE
+_EXACT_KDE_MAX = 10_000
+
+# Gaussian kernel is truncated at this many bandwidths (relative weight exp(-18) ~ 1.5e-8)
+_KERNEL_CUTOFF = 6.0
+
+####################################################################################################
+#                                     Scott's rule bandwidth                                       #
+####################################################################################################
+def _scott_bandwidth(data, weights=None):
+    """
+    Gaussian kernel bandwidth by Scott's rule, as used by scipy.stats.gaussian_kde for 1D data:
+    sample standard deviation times n^(-1/5). Weights are taken as frequencies (counts), so the
+    result is the same as for the data expanded into one sample per count.
+    """
+    if weights is None:
+        return np.std(data, ddof=1) * len(data) ** (-1 / 5)
+
+    return _weighted_std(data, weights) * np.sum(weights) ** (-1 / 5)
+
+def _weighted_std(data, weights):
+    """Sample standard deviation of data with frequency weights, with n = sum of the weights."""
+    weights = np.asarray(weights, dtype=float)
+    n = weights.sum()
+    mean = np.dot(weights, data) / n
+    return np.sqrt(np.dot(weights, (data - mean)**2) / max(n - 1, 1))
+
+####################################################################################################
+#                         Improved Sheather-Jones bandwidth (Botev et al.)                         #
+####################################################################################################
+def _dct2(x):
+    """Unnormalised type-II discrete cosine transform, 2 sum x_n cos(pi k (2n + 1) / 2N), by FFT."""
+    n = len(x)
+    v = np.concatenate([x[::2], x[1::2][::-1]])
+    return 2 * np.real(np.fft.fft(v) * np.exp(-1j * np.pi * np.arange(n) / (2 * n)))
+
+def _isj_fixed_point(t, n, i_sq, a2):
+    """
+    t - xi gamma^[7](t) from Botev, Grotowski & Kroese (2010), "Kernel density estimation via
+    diffusion". The optimal squared bandwidth (on the unit interval) is its root.
+    """
+    ell = 7
+    f = 0.5 * np.pi**(2 * ell) * np.sum(i_sq**ell * a2 * np.exp(-i_sq * np.pi**2 * t))
+    if f <= 0:
+        return -1.0
+
+    for s in range(ell - 1, 1, -1):
+        k0 = np.prod(np.arange(1, 2 * s + 1, 2)) / np.sqrt(2 * np.pi)
+        const = (1 + 0.5**(s + 0.5)) / 3
+        time = (2 * const * k0 / (n * f))**(2 / (3 + 2 * s))
+        f = 0.5 * np.pi**(2 * s) * np.sum(i_sq**s * a2 * np.exp(-i_sq * np.pi**2 * time))
+
+    return t - (2 * n * np.sqrt(np.pi) * f)**(-2 / 5)
+
+def _isj_bandwidth(data, weights=None, n_grid=1 << 12):
+    """
+    Data-driven Gaussian kernel bandwidth by the Improved Sheather-Jones plug-in method of
+    Botev et al. (2010). Unlike Scott's rule it does not assume the data are near-normal, so it
+    resolves multi-modal densities.
+
+    Works entirely on the binned data: one O(N) linear binning pass onto n_grid points spanning
+    the data range plus half of it on each side, one DCT (by FFT) in O(G log G), and a bisection
+    for the fixed point, each step of which is O(G). Falls back to Scott's rule if no fixed point
+    is found (e.g. very few distinct values).
+
+    Parameters:
+        data    : 1D array of samples
+        weights : optional 1D array of sample weights
+        n_grid  : number of grid points, a power of two
+
+    Returns:
+        bandwidth (kernel standard deviation) in data units
+    """
+    lo, hi = data.min(), data.max()
+    span = 2 * (hi - lo)
+    if span <= 0:
+        return _scott_bandwidth(data, weights)
+
+    counts = _linear_bin(data, lo - span / 4, span / (n_grid - 1), n_grid, weights)
+    a2 = _dct2(counts / counts.sum())[1:]**2
+    i_sq = np.arange(1, n_grid, dtype=float)**2
+    n = len(data) if weights is None else np.sum(weights)
+
+    # Bracket the root as in Botev's reference implementation, widening until the sign changes
+    upper = 1e-11 + 0.01 * (max(min(1050, n), 50) - 50) / 1000
+    while _isj_fixed_point(upper, n, i_sq, a2) < 0 and upper < 1:
+        upper *= 2
+    if upper >= 1 or _isj_fixed_point(1e-300, n, i_sq, a2) > 0:
+        return _scott_bandwidth(data, weights)
+
+    lower = 0.0
+    for _ in range(100):
+        middle = 0.5 * (lower + upper)
+        if _isj_fixed_point(middle, n, i_sq, a2) < 0:
+            lower = middle
+        else:
+            upper = middle
+
+    return np.sqrt(0.5 * (lower + upper)) * span
+
+####################################################################################################
+#                              Linear binning onto an equispaced grid                              #
+####################################################################################################
+def _linear_bin(data, lo, dx, n_grid, weights=None, codes=None, n_groups=1):
+    """
+    Spread each sample (or its weight) over the two nearest grid points, in proportion to its
+    distance from each. O(N), in chunks.
+
+    Parameters:
+        data     : 1D array of samples, within [lo, lo + (n_grid - 1) * dx]
+        lo       : first grid point
+        dx       : grid spacing
+        n_grid   : number of grid points
+        weights  : optional 1D array of sample weights
+        codes    : optional 1D int array giving the group (0 to n_groups - 1) of each sample, to
+                   bin many data sets on the same grid in one pass
+        n_groups : number of groups
+
+    Returns:
+        float array of shape (n_grid,), or (n_groups, n_grid) if codes are given, with the binned
+        weight at each grid point
+    """
+    counts = np.zeros(n_groups * n_grid)
+
+    for start in range(0, len(data), _CHUNK_SIZE):
+        stop = start + _CHUNK_SIZE
+        position = (np.asarray(data[start:stop], dtype=float) - lo) / dx
+        left = np.clip(np.floor(position), 0, n_grid - 2).astype(np.intp)
+        right_share = position - left
+        weight = 1.0 if weights is None else np.asarray(weights[start:stop], dtype=float)
+
+        if codes is not None:
+            left += np.asarray(codes[start:stop], dtype=np.intp) * n_grid
+
+        counts += np.bincount(left, weights=weight * (1 - right_share), minlength=counts.size)
+        counts += np.bincount(left + 1, weights=weight * right_share, minlength=counts.size)
+
+    return counts if codes is None else counts.reshape(n_groups, n_grid)
+
+####################################################################################################
+#                         Convolve binned counts with a Gaussian kernel by FFT                     #
+####################################################################################################
+def _fft_smooth(counts, dx, bandwidth):
+    """
+    Convolve gridded counts with a Gaussian kernel of the given bandwidth, in O(G log G).
+
+    The kernel is truncated at _KERNEL_CUTOFF bandwidths, and the counts are zero-padded so
+    that the circular FFT convolution does not wrap around.
+
+    Parameters:
+        counts    : 1D array (or 2D, one row per data set) of binned counts on the grid
+        dx        : grid spacing
+        bandwidth : kernel standard deviation, in data units (or one per row of counts)
+
+    Returns:
+        array like counts, with the kernel-weighted sum at each grid point
+    """
+    n_grid = counts.shape[-1]
+    bandwidth = np.asarray(bandwidth, dtype=float)
+    if bandwidth.ndim:
+        bandwidth = bandwidth[:, None]                                                              # one kernel per row
+    half = min(n_grid - 1, int(np.ceil(_KERNEL_CUTOFF * bandwidth.max() / dx)))
+
+    offsets = np.arange(-half, half + 1) * dx
+    kernel = np.exp(-0.5 * (offsets / bandwidth)**2) / (bandwidth * np.sqrt(2 * np.pi))
+
+    size = 1 << int(np.ceil(np.log2(n_grid + 2 * half)))
+    spectrum = np.fft.rfft(counts, size, axis=-1) * np.fft.rfft(kernel, size, axis=-1)
+
+    return np.fft.irfft(spectrum, size, axis=-1)[..., half:half + n_grid]
+
+####################################################################################################
+#                                      Binned (FFT) KDE                                            #
+####################################################################################################
+def _grid_size(lo, hi, bandwidth):
+    """
+    Number of grid points for a binned KDE: enough for 8 points per bandwidth, as a power of two
+    between 2^10 and 2^20.
+    """
+    if hi <= lo:
+        return 1 << 10
+    return int(np.clip(1 << int(np.ceil(np.log2(8 * (hi - lo) / bandwidth + 1))), 1 << 10, 1 << 20))
+
+def _binned_kde(data, points, bandwidth=None, weights=None):
+    """
+    Gaussian kernel density estimate of 1D data, evaluated at the given points, in
+    O(N + G log G) instead of the O(N * len(points)) of an exact KDE.
+
+    The samples are linearly binned onto a fine grid of G points with spacing dx spanning the
+    data, convolved with the kernel by FFT, and linearly interpolated at the requested points.
+
+    Error bound: linear binning and the final interpolation each move the estimate by at most
+    dx^2 / 8 times the largest second derivative of the kernel, 1 / (sqrt(2 pi) h^3). So the
+    absolute error is at most
+
+        (dx / h)^2 / (4 sqrt(2 pi) h)
+
+    i.e. a fraction (dx / h)^2 / 4 of the kernel's peak height 1 / (sqrt(2 pi) h), plus a
+    relative ~1.5e-8 from truncating the kernel at 6h. The grid is chosen so that dx <= h / 8
+    (unless G would exceed 2^20), which bounds the error by 0.4% of the kernel peak.
+
+    Parameters:
+        data      : 1D array of samples
+        points    : 1D array of evaluation points
+        bandwidth : kernel standard deviation; Scott's rule if None
+        weights   : optional 1D array of sample weights
+
+    Returns:
+        1D array of density values at points
+    """
+    if bandwidth is None:
+        bandwidth = _scott_bandwidth(data, weights)
+
+    lo, hi = min(data.min(), np.min(points)), max(data.max(), np.max(points))
+    n_grid = _grid_size(lo, hi, bandwidth)
+    dx = (hi - lo) / (n_grid - 1) if hi > lo else 1.0
+
+    counts = _linear_bin(data, lo, dx, n_grid, weights)
+    total = counts.sum()
+
+    density = _fft_smooth(counts, dx, bandwidth) / total
+
+    return np.interp(points, lo + dx * np.arange(n_grid), density)
+
+####################################################################################################
+#                           Batched binned KDE of many groups on one grid                          #
+####################################################################################################
+def _binned_kde_groups(data, codes, n_groups, lo, hi, max_cells=1 << 24):
+    """
+    Gaussian KDEs of many groups of 1D samples, all evaluated on one shared grid in a single
+    binning pass and one batched FFT. Each group has its own Scott's rule bandwidth.
+
+    The grid is sized for the narrowest bandwidth, as in _binned_kde, but capped so that
+    n_groups * G <= max_cells. Groups whose bandwidth is then under 8 grid steps (scales that
+    differ widely between groups) are estimated separately by _binned_kde, on a grid of their
+    own spanning their samples, and evaluated at the shared grid points, so the error bound of
+    _binned_kde holds for every group.
+
+    Parameters:
+        data     : 1D array of samples, within [lo, hi]
+        codes    : 1D int array giving the group (0 to n_groups - 1) of each sample
+        n_groups : number of groups
+        lo, hi   : range of the shared grid
+
+    Returns:
+        grid      : 1D array of G grid points
+        densities : (n_groups, G) array, one density per group (zero for empty groups)
+    """
+    data = np.asarray(data, dtype=float)
+    codes = np.asarray(codes, dtype=np.intp)
+
+    # Per-group Scott's rule bandwidths from per-group counts and centred sums of squares
+    n = np.bincount(codes, minlength=n_groups).astype(float)
+    mean = np.bincount(codes, weights=data, minlength=n_groups) / np.maximum(n, 1)
+    variance = np.bincount(codes, weights=(data - mean[codes])**2, minlength=n_groups)
+    variance /= np.maximum(n - 1, 1)
+    bandwidth = np.sqrt(variance) * np.maximum(n, 1) ** (-1 / 5)
+    bandwidth[bandwidth <= 0] = (hi - lo) / 100 if hi > lo else 1.0                                 # single or constant samples
+
+    n_grid = _grid_size(lo, hi, bandwidth.min())
+    n_grid = max(1 << 10, min(n_grid, 1 << int(np.log2(max_cells // n_groups))))
+    dx = (hi - lo) / (n_grid - 1) if hi > lo else 1.0
+
+    counts = _linear_bin(data, lo, dx, n_grid, codes=codes, n_groups=n_groups)
+    densities = _fft_smooth(counts, dx, bandwidth) / np.maximum(n, 1)[:, None]
+    grid = lo + dx * np.arange(n_grid)
+
+    # Groups too narrow for the shared grid, each on its own grid (zero beyond the kernel cutoff)
+    narrow = np.flatnonzero((bandwidth < 8 * dx) & (n > 0))
+    if len(narrow):
+        order = np.argsort(codes, kind="stable")
+        ends = np.cumsum(n).astype(np.intp)
+        for group in narrow:
+            sample = data[order[ends[group] - int(n[group]):ends[group]]]
+            reach = _KERNEL_CUTOFF * bandwidth[group]
+            inside = (grid >= sample.min() - reach) & (grid <= sample.max() + reach)
+            densities[group] = 0
+            if inside.any():
+                densities[group, inside] = _binned_kde(sample, grid[inside], bandwidth[group])
+
+    return grid, densities
+
+####################################################################################################
+#                                  2D binned KDE on a regular grid                                 #
+####################################################################################################
+def _binned_kde_2d(x, y, n_grid=(128, 128), bandwidth=None):
+    """
+    Gaussian kernel density estimate of 2D points on a regular grid, in O(N + G log G).
+
+    The points are bilinearly binned onto the grid and convolved with a product Gaussian kernel
+    by FFT, one axis at a time (the kernel is separable). The grid covers the data plus three
+    bandwidths on each side, so contours of the density close within it. The error bound of
+    _binned_kde applies along each axis.
+
+    Parameters:
+        x, y      : 1D arrays of point coordinates
+        n_grid    : number of grid points along x and y
+        bandwidth : (h_x, h_y) kernel standard deviations; if None, Scott's rule for 2D data,
+                    sample standard deviation times n^(-1/6), on each axis
+
+    Returns:
+        x_grid, y_grid : 1D arrays of grid points
+        density        : (len(y_grid), len(x_grid)) array of density values
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    nx, ny = n_grid
+
+    if bandwidth is None:
+        bandwidth = [np.std(v, ddof=1) * len(v) ** (-1 / 6) for v in (x, y)]
+    bandwidth = [h if h > 0 else 1.0 for h in bandwidth]                                            # constant coordinates
+
+    axes = []
+    for v, h, n in zip((x, y), bandwidth, (nx, ny)):
+        lo, hi = v.min() - 3 * h, v.max() + 3 * h
+        axes.append((lo, (hi - lo) / (n - 1)))
+    (x_lo, dx), (y_lo, dy) = axes
+
+    # Bilinear binning: each point spreads its unit weight over the four surrounding grid points
+    counts = np.zeros(ny * nx)
+    for start in range(0, len(x), _CHUNK_SIZE):
+        stop = start + _CHUNK_SIZE
+        px = (x[start:stop] - x_lo) / dx
+        py = (y[start:stop] - y_lo) / dy
+        ix = np.clip(np.floor(px), 0, nx - 2).astype(np.intp)
+        iy = np.clip(np.floor(py), 0, ny - 2).astype(np.intp)
+        fx, fy = px - ix, py - iy
+        index = iy * nx + ix
+
+        counts += np.bincount(index,          weights=(1 - fx) * (1 - fy), minlength=counts.size)
+        counts += np.bincount(index + 1,      weights=fx * (1 - fy),       minlength=counts.size)
+        counts += np.bincount(index + nx,     weights=(1 - fx) * fy,       minlength=counts.size)
+        counts += np.bincount(index + nx + 1, weights=fx * fy,             minlength=counts.size)
+
+    counts = counts.reshape(ny, nx)
+    density = _fft_smooth(counts, dx, bandwidth[0])                                                 # along x
+    density = _fft_smooth(density.T, dy, bandwidth[1]).T                                            # along y
+
+    return x_lo + dx * np.arange(nx), y_lo + dy * np.arange(ny), density / max(len(x), 1)
+
+####################################################################################################
+#                            Choose between the exact and binned KDE                               #
+####################################################################################################
+def _kde(data, points, method="auto", bandwidth=None, weights=None):
+    """
+    Gaussian KDE of 1D data at the given points.
+
+    Parameters:
+        data      : 1D array of samples
+        points    : 1D array of evaluation points
+        method    : "exact" (scipy.stats.gaussian_kde), "binned" (FFT), or "auto" to use the
+                    binned engine above _EXACT_KDE_MAX samples, or when scipy is not installed
+        bandwidth : kernel standard deviation in data units, "scott" or None for Scott's rule,
+                    or "isj" for the Improved Sheather-Jones selector
+        weights   : optional 1D array of sample weights, as frequencies (counts of each value)
+
+    Returns:
+        1D array of density values at points
+    """
+    if method == "auto":
+        method = "exact" if gaussian_kde is not None and len(data) <= _EXACT_KDE_MAX else "binned"
+
+    if method not in ("exact", "binned"):
+        raise ValueError(f"method must be 'auto', 'exact' or 'binned', got {method!r}")
+
+    if bandwidth is None or bandwidth == "scott":
+        bandwidth = None
+    elif bandwidth == "isj":
+        bandwidth = _isj_bandwidth(data, weights)
+    elif isinstance(bandwidth, str) or not bandwidth > 0:
+        raise ValueError(f"bandwidth must be 'scott', 'isj' or a positive number, got {bandwidth!r}")
+
+    if method == "exact":
+        if gaussian_kde is None:
+            raise ImportError("method='exact' requires scipy; install it, or use method='binned'")
+        if weights is not None and bandwidth is None:
+            bandwidth = _scott_bandwidth(data, weights)                                             # scipy uses (sum w)^2 / sum w^2
+        if bandwidth is None:
+            return gaussian_kde(data)(points)
+        std = np.std(data, ddof=1) if weights is None else np.sqrt(np.cov(data, aweights=weights))  # scipy scales by its std
+        return gaussian_kde(data, bw_method=bandwidth / std, weights=weights)(points)
+
+    return _binned_kde(data, points, bandwidth, weights)
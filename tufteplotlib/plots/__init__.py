@@ -1,12 +1,12 @@
 from .barcode       import barcode_plot
 from .bar           import bar_chart
 from .column        import column_chart
-from .density       import density_plot
-from .galaxy        import add_min_max_colorbar, galaxy_plot
-from .histogram     import histogram_plot
+from .density       import density_plot, density_small_multiples
+from .galaxy        import add_min_max_colorbar, galaxy_plot, GalaxyAccumulator, GalaxyPyramid, galaxy_image
+from .histogram     import histogram_plot, HistogramAccumulator, LogHistogramAccumulator
 from .line          import line_plot
 from .pareto        import pareto_chart
-from .quartile      import quartile_plot
+from .quartile      import quartile_plot, quartile_summary_plot, QuartileAccumulator
 from .rug           import rug_plot
 from .scatter       import scatter_plot
 from .slopegraph    import slopegraph
@@ -19,11 +19,19 @@ __all__ = ["add_min_max_colorbar",
            "bar_chart",
            "column_chart",
            "density_plot",
+           "density_small_multiples",
+           "galaxy_image",
            "galaxy_plot",
+           "GalaxyAccumulator",
+           "GalaxyPyramid",
            "histogram_plot",
+           "HistogramAccumulator",
+           "LogHistogramAccumulator",
            "line_plot",
            "pareto_chart",
            "quartile_plot",
+           "QuartileAccumulator",
+           "quartile_summary_plot",
            "rug_plot",
            "scatter_plot",
            "sparkline",
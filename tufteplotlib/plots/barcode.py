@@ -6,7 +6,7 @@ from tufteplotlib.utils import _intermediate_ticks
 ####################################################################################################
 #                                         Core function                                            #
 ####################################################################################################
-def barcode_plot(categories, values, ax=None):
+def barcode_plot(categories, values, ax=None, collapse=False):
     """
     Plot unique observations across nominal categories to show data distribution.
     Best used for sparse data. For dense data, consider using a quartile plot.
@@ -19,6 +19,10 @@ def barcode_plot(categories, values, ax=None):
         Numerical data corresponding to each category.
     ax : matplotlib.axes.Axes, optional
         Axis to draw on. If None, a new figure is created.
+    collapse : bool, optional
+        Draw each distinct (category, value) pair once, with the shade that many overlapping
+        marks would have, so drawing time scales with the number of distinct values rather than
+        observations. Default False.
 
     Returns
     -------
@@ -33,14 +37,18 @@ def barcode_plot(categories, values, ax=None):
     categories = np.asarray(categories)
     values = np.asarray(values)
 
-    # Map categories to numeric positions
-    unique_categories = sorted(list(set(categories)))
-    cat_to_x = {cat: i for i, cat in enumerate(unique_categories)}
-    x_positions = np.array([cat_to_x[cat] for cat in categories])
+    # Map categories to numeric positions (sorted, as the tick labels)
+    unique_categories, x_positions = np.unique(categories, return_inverse=True)
+    x_positions = x_positions.ravel()
 
-    # Draw horizontal barcode lines with default style
-    for x, y in zip(x_positions, values):
-        ax.hlines(y, x - 0.2, x + 0.2, color='black', alpha=0.5, linewidth=2.0)
+    # Draw all horizontal barcode lines as a single LineCollection
+    if collapse:
+        x_marks, y_marks, counts = _distinct_marks(x_positions, values)
+        colors = np.zeros((len(counts), 4))
+        colors[:, 3] = 1 - 0.5**counts                                                              # n overlapping marks at alpha 0.5
+        ax.hlines(y_marks, x_marks - 0.2, x_marks + 0.2, colors=colors, linewidth=2.0)
+    else:
+        ax.hlines(values, x_positions - 0.2, x_positions + 0.2, color='black', alpha=0.5, linewidth=2.0)
 
     # Compute y-axis limits
     ymin = values.min()
@@ -66,6 +74,31 @@ def barcode_plot(categories, values, ax=None):
 
     return fig, ax
 
+####################################################################################################
+#                                Collapse repeated (category, value) marks                         #
+####################################################################################################
+def _distinct_marks(x_positions, values):
+    """
+    Find the distinct (position, value) pairs and how often each occurs, with one lexicographic
+    sort.
+
+    Parameters:
+        x_positions : 1D int array of category positions
+        values      : 1D array of values, same length
+
+    Returns:
+        x, y, counts : 1D arrays, one entry per distinct pair
+    """
+    order = np.lexsort((values, x_positions))
+    x_sorted = x_positions[order]
+    y_sorted = values[order]
+
+    starts = np.flatnonzero(np.concatenate([[True],
+                                            (np.diff(x_sorted) != 0) | (np.diff(y_sorted) != 0)]))
+    counts = np.diff(np.append(starts, len(order)))
+
+    return x_sorted[starts], y_sorted[starts], counts
+
 ####################################################################################################
 #                                          Test / example code                                     #
 ####################################################################################################
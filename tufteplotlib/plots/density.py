@@ -1,13 +1,14 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from tufteplotlib.styles import apply_tufte_style
-from tufteplotlib.utils import _intermediate_ticks
-from scipy.stats import gaussian_kde
+from tufteplotlib.utils import _intermediate_ticks, _weighted_quantile
+from tufteplotlib.kde import _binned_kde_groups, _kde
 
 ####################################################################################################
 #                                         Core function                                            #
 ####################################################################################################
-def density_plot(data, ax=None, orientation="vertical"):
+def density_plot(data, ax=None, orientation="vertical", method="auto", bandwidth=None,
+                 weights=None):
     """
     Illustrate the distribution of values within a 1-dimensional data set.
     Best used for dense data sets. For sparse data, consider using a histogram.
@@ -21,6 +22,21 @@ def density_plot(data, ax=None, orientation="vertical"):
     orientation : str, optional
         "vertical" (default) for standard upright density curve;
         "horizontal" for rotated curve (e.g. marginal distribution panel).
+    method : str, optional
+        "exact" evaluates scipy's gaussian_kde at every point; "binned" bins the data onto a fine
+        grid and convolves with the kernel by FFT, in O(N + G log G), with an error below 0.4% of
+        the kernel peak. "auto" (default) uses the binned engine above 10,000 samples, or when
+        scipy is not installed.
+    bandwidth : str or float, optional
+        Kernel standard deviation. None or "scott" (default) uses Scott's rule, which assumes the
+        data are roughly normal and over-smooths multi-modal data; "isj" selects it from the data
+        by the Improved Sheather-Jones method, computed on the binned data by FFT; a number sets it
+        directly, in data units.
+    weights : array-like, optional
+        Number of times each value in data occurred, for pre-aggregated (value, count) data, so
+        it need not be expanded back into one row per sample. For (edges, counts) histograms,
+        pass the bin centres as data and the counts as weights. The density, bandwidth and median
+        tick are then those of the expanded data.
 
     Returns
     -------
@@ -33,12 +49,17 @@ def density_plot(data, ax=None, orientation="vertical"):
         fig = ax.figure
 
     data = np.asarray(data)
-    kde    = gaussian_kde(data)
-    d_vals = np.linspace(data.min(), data.max(), 500)  # data axis
-    k_vals = kde(d_vals)                                # density axis
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != data.shape:
+            raise ValueError("density_plot: weights must have the same shape as data")
+
+    d_vals = np.linspace(data.min(), data.max(), 500)            # data axis
+    k_vals = _kde(data, d_vals, method, bandwidth, weights)       # density axis
 
     # Data axis ticks: min, median, max
-    d_ticks = [data.min(), np.median(data), data.max()]
+    d_median = np.median(data) if weights is None else _weighted_quantile(data, weights, 50)
+    d_ticks = [data.min(), d_median, data.max()]
 
     # Density axis ticks
     k_min, k_max = 0, k_vals.max()
@@ -91,6 +112,104 @@ def density_plot(data, ax=None, orientation="vertical"):
     return fig, ax
 
 
+####################################################################################################
+#                                   Batched small multiples                                        #
+####################################################################################################
+def density_small_multiples(data, groups=None, ncols=None):
+    """
+    Compare the distributions of many 1-dimensional data sets as a grid of small density plots
+    that share a density axis, so the heights are directly comparable.
+
+    All densities are computed together: the samples are binned onto one shared grid in a single
+    pass and smoothed with one batched FFT (see density_plot with method="binned"), instead of
+    building a separate KDE per panel.
+
+    Parameters
+    ----------
+    data : sequence of array-like, dict, or array-like
+        Either one non-empty 1D array of samples per panel (a dict maps panel titles to samples),
+        or a single 1D array of values in long form, together with groups.
+    groups : array-like, optional
+        Group label of each value, when data is in long form. One panel is drawn per unique label.
+    ncols : int, optional
+        Number of columns of panels. Default is about the square root of the number of panels.
+
+    Returns
+    -------
+    fig : matplotlib.figure.Figure
+    axes : 2D numpy array of matplotlib.axes.Axes
+    """
+    # --- Flatten every data set into one array of values with group codes -----
+    if groups is not None:
+        labels, codes = np.unique(np.asarray(groups), return_inverse=True)
+        values = np.asarray(data, dtype=float)
+        if values.shape[0] != codes.shape[0]:
+            raise ValueError("density_small_multiples: data and groups must have the same length")
+        n_groups = len(labels)
+    else:
+        labels = list(data.keys()) if isinstance(data, dict) else None
+        samples = [np.asarray(d, dtype=float) for d in (data.values() if labels else data)]
+        empty = [labels[i] if labels else i for i, d in enumerate(samples) if len(d) == 0]
+        if empty:
+            raise ValueError(f"density_small_multiples: every sample needs at least one value, "
+                             f"empty: {empty}")
+        values = np.concatenate(samples)
+        codes = np.repeat(np.arange(len(samples)), [len(d) for d in samples])
+        n_groups = len(samples)
+
+    # --- Densities of every group on one shared grid ----------------------------
+    grid, densities = _binned_kde_groups(values, codes, n_groups, values.min(), values.max())
+
+    # --- Min, median, max per group from one stable sort by group ---------------
+    order = np.argsort(codes.astype(np.uint16) if n_groups < 2**16 else codes, kind="stable")       # radix sort
+    bounds = np.searchsorted(codes[order], np.arange(n_groups + 1))
+    d_ticks = []
+    for g in range(n_groups):
+        segment = values[order[bounds[g]:bounds[g + 1]]]
+        d_ticks.append([segment.min(), np.median(segment), segment.max()])
+
+    # --- Shared density axis -----------------------------------------------------
+    k_max = densities.max()
+    k_ticks = _intermediate_ticks(0, k_max, max_ticks=3, edge_fraction=0.15)
+
+    # --- Layout ------------------------------------------------------------------
+    ncols = ncols or int(np.ceil(np.sqrt(n_groups)))
+    nrows = int(np.ceil(n_groups / ncols))
+    fig, axes = plt.subplots(nrows, ncols, figsize=(2.2 * ncols, 1.6 * nrows), squeeze=False)
+    fig.subplots_adjust(hspace=0.8 if labels is not None else 0.5, wspace=0.3)
+
+    for g, ax in enumerate(axes.flat):
+        if g >= n_groups:
+            ax.set_visible(False)
+            continue
+
+        d_min, d_median, d_max = d_ticks[g]
+        d_vals = np.linspace(d_min, d_max, 200)
+        k_vals = np.interp(d_vals, grid, densities[g])
+
+        ax.fill_between(d_vals, 0, k_vals, color=[0.4, 0.4, 0.4], alpha=1.0)
+
+        # Data axis (x)
+        ax.set_xticks(d_ticks[g])
+        ax.set_xticklabels([f"{dt:.2f}" for dt in d_ticks[g]], fontsize=7)
+        ax.spines["bottom"].set_bounds(d_min, d_max)
+
+        # Density axis (y), labelled on the first column only
+        ax.set_ylim(0, k_max)
+        if g % ncols == 0:
+            ax.set_yticks(k_ticks)
+            ax.set_yticklabels([f"{kt:.2f}" for kt in k_ticks], fontsize=7)
+        else:
+            ax.set_yticks([])
+            ax.spines["left"].set_visible(False)
+
+        if labels is not None:
+            ax.set_title(str(labels[g]), fontsize=8)
+
+        apply_tufte_style(ax)
+
+    return fig, axes
+
 ####################################################################################################
 #                                          Test / example code                                     #
 ####################################################################################################
@@ -1,6 +1,15 @@
+import io
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 from matplotlib.colors import Normalize
+from tufteplotlib.binning import (_accumulate_2d, _coarsen_sparse, _densify, _downsample_2x2,
+                                  _finalize, _is_uniform, _merge_stats, _new_sparse_stats,
+                                  _new_stats, _parallel_accumulate_2d, _parse_reduction,
+                                  _quantile_edges)
 from tufteplotlib.styles import apply_tufte_style
 
 ####################################################################################################
@@ -10,9 +19,13 @@ def galaxy_plot(x, y, z, *,
                 nx_bins=100,
                 ny_bins=100,
                 cmap='Greys',
+                reduce='max',
+                storage='dense',
+                edges='uniform',
+                workers=1,
                 ax=None):
     """
-    Tufte-style galaxy plot: discretize (x, y) into bins, take max(z) per bin,
+    Tufte-style galaxy plot: discretize (x, y) into bins, reduce z per bin (max by default),
     and plot as a grayscale intensity map.
 
     Parameters
@@ -27,46 +40,643 @@ def galaxy_plot(x, y, z, *,
         Number of bins along y-axis.
     cmap : str or Colormap
         Colormap to use (grayscale recommended).
+    reduce : str
+        How z is summarised in each bin: 'max' (default), 'min', 'count', 'sum', 'mean',
+        'median', or 'p<q>' for the q-th percentile (e.g. 'p95'). To draw several reductions
+        from one pass over the data, use GalaxyAccumulator directly.
+    storage : str
+        'dense' (default) or 'sparse'. Sparse storage keeps only occupied bins, and suits very
+        fine grids over mostly empty space (see GalaxyAccumulator).
+    edges : str
+        'uniform' (default) for equally spaced bins, or 'quantile' for bins at approximate
+        quantiles of x and y, so that each row and column of bins holds a similar number of
+        points. This shows more detail in clustered data for the same number of bins.
+    workers : int
+        Number of processes used to bin the points. Default 1 (no parallelism).
     ax : Optional axis
 
     Returns
     -------
     ax : matplotlib.axes.Axes
-    im : matplotlib.image.AxesImage
+    im : matplotlib.image.AxesImage (matplotlib.collections.QuadMesh for quantile edges)
     """
     
-    if ax is None:
-        fig, ax = plt.subplots(figsize=(4,3.5))
-    else:
-        fig = ax.figure
-
     x = np.asarray(x)
     y = np.asarray(y)
     z = np.asarray(z)
 
-    # Create empty grid
-    z_grid = np.full((ny_bins, nx_bins), np.nan)
-    x_edges = np.linspace(x.min(), x.max(), nx_bins + 1)
-    y_edges = np.linspace(y.min(), y.max(), ny_bins + 1)
+    if edges not in ('uniform', 'quantile'):
+        raise ValueError(f"galaxy_plot: edges must be 'uniform' or 'quantile', got {edges!r}")
+
+    # Quantile sketches need the range of z up front
+    z_range = None
+    if "sketch" in _parse_reduction(reduce)[0]:
+        z_range = (np.nanmin(z), np.nanmax(z))
+
+    # Bin edges spanning the data, z reduced in each bin in a single pass
+    if edges == 'quantile':
+        accumulator = GalaxyAccumulator.from_quantiles(x, y,
+                                                       nx_bins=nx_bins,
+                                                       ny_bins=ny_bins,
+                                                       reduce=reduce,
+                                                       z_range=z_range,
+                                                       storage=storage)
+    else:
+        accumulator = GalaxyAccumulator((x.min(), x.max()), (y.min(), y.max()),
+                                        nx_bins=nx_bins,
+                                        ny_bins=ny_bins,
+                                        reduce=reduce,
+                                        z_range=z_range,
+                                        storage=storage)
+    with accumulator:
+        accumulator.update(x, y, z, workers=workers)
+
+    return accumulator.render(ax=ax, cmap=cmap)
+
+####################################################################################################
+#                                  Incremental (streaming) binning                                 #
+####################################################################################################
+class GalaxyAccumulator:
+    """
+    Build the grid of a galaxy plot incrementally, for data that arrive in chunks or do not fit in
+    memory (e.g. slices of an np.memmap). Memory is bounded by the grid size, not the point count.
+
+    Bins are half-open, [lo, hi), so points outside the fixed extents are ignored.
+
+    Several reductions can be requested at once; they are all computed from the same pass over
+    the data. Mean is derived from the per-bin sum and count. Quantiles are read from a per-bin
+    histogram sketch of z over z_range, with an error of at most one sketch bin,
+    (z_range[1] - z_range[0]) / sketch_bins. Values outside z_range count towards the end bins.
+
+    With storage='sparse', only occupied bins are kept, as sorted linear bin indices (row-major,
+    iy * nx_bins + ix) plus per-bin values, so memory is proportional to the number of occupied
+    bins rather than nx_bins * ny_bins. When rendered, the bins are merged down to the resolution
+    of the axes before a dense image is made.
+
+    Parameters
+    ----------
+    x_range : (float, float)
+        Lower and upper extent of the grid along x.
+    y_range : (float, float)
+        Lower and upper extent of the grid along y.
+    nx_bins : int
+        Number of bins along x-axis.
+    ny_bins : int
+        Number of bins along y-axis.
+    reduce : str or sequence of str
+        Reduction(s) to compute: 'max' (default), 'min', 'count', 'sum', 'mean', 'median', or
+        'p<q>' for the q-th percentile (e.g. 'p95'). The first is used by default.
+    z_range : (float, float), optional
+        Range of z covered by the quantile sketches. Required for 'median' and 'p<q>'.
+    sketch_bins : int
+        Resolution of each per-bin quantile sketch. Memory is nx_bins * ny_bins * sketch_bins
+        (occupied bins * sketch_bins for sparse storage).
+    storage : str
+        'dense' (default) or 'sparse'.
+
+    Example
+    -------
+    acc = GalaxyAccumulator((-1, 1), (-1, 1), nx_bins=200, ny_bins=200,
+                            reduce=['count', 'mean', 'p95'], z_range=(0, 1))
+    for start in range(0, len(x), 10**6):
+        acc.update(x[start:start + 10**6], y[start:start + 10**6], z[start:start + 10**6])
+    ax, im = acc.render(reduce='p95')
+    """
+
+    def __init__(self, x_range, y_range, *,
+                 nx_bins=100,
+                 ny_bins=100,
+                 reduce='max',
+                 z_range=None,
+                 sketch_bins=256,
+                 storage='dense'):
+
+        self.x_edges = np.linspace(x_range[0], x_range[1], nx_bins + 1)
+        self.y_edges = np.linspace(y_range[0], y_range[1], ny_bins + 1)
+        self.nx_bins = nx_bins
+        self.ny_bins = ny_bins
+        self.reductions = [reduce] if isinstance(reduce, str) else list(reduce)
+
+        stat_names = set()
+        for name in self.reductions:
+            stat_names.update(_parse_reduction(name)[0])
+
+        self.z_edges = None
+        if "sketch" in stat_names:
+            if z_range is None:
+                raise ValueError("GalaxyAccumulator: z_range is required for quantile reductions")
+            self.z_edges = np.linspace(z_range[0], z_range[1], sketch_bins + 1)
+
+        if storage == 'dense':
+            self._stats = _new_stats(nx_bins * ny_bins, stat_names, sketch_bins)
+        elif storage == 'sparse':
+            self._stats = _new_sparse_stats(stat_names, sketch_bins)
+        else:
+            raise ValueError(f"GalaxyAccumulator: storage must be 'dense' or 'sparse', got {storage!r}")
+        self.storage = storage
+
+    @classmethod
+    def from_edges(cls, x_edges, y_edges, **kwargs):
+        """
+        Create an accumulator with explicit, increasing bin edges, which need not be equally
+        spaced. Non-uniform edges are looked up with np.searchsorted. Other keyword arguments are
+        as for the constructor.
+        """
+        x_edges = np.asarray(x_edges, dtype=float)
+        y_edges = np.asarray(y_edges, dtype=float)
+
+        accumulator = cls((x_edges[0], x_edges[-1]), (y_edges[0], y_edges[-1]),
+                          nx_bins=len(x_edges) - 1,
+                          ny_bins=len(y_edges) - 1,
+                          **kwargs)
+        accumulator.x_edges = x_edges
+        accumulator.y_edges = y_edges
+
+        return accumulator
+
+    @classmethod
+    def from_quantiles(cls, x, y, *, nx_bins=100, ny_bins=100, sample_size=100_000, seed=0,
+                       **kwargs):
+        """
+        Create an accumulator whose bin edges sit at approximate quantiles of x and y (equal-count
+        binning), so clustered data get narrow bins and sparse regions wide ones.
+
+        Quantiles are estimated from a random sample of sample_size points rather than a full
+        sort; the outer edges are the exact min and max of x and y. Repeated quantiles (e.g. in
+        discrete data) are merged, so there may be fewer bins than requested.
+
+        Parameters
+        ----------
+        x, y : array-like
+            Data (or a representative part of it, e.g. a memory-mapped file) to take the
+            quantiles from.
+        nx_bins, ny_bins : int
+            Number of bins along each axis.
+        sample_size : int
+            Number of points sampled to estimate the quantiles.
+        seed : int
+            Seed for the sample.
+        """
+        x_edges = _quantile_edges(x, nx_bins, x.min(), x.max(), sample_size, seed)
+        y_edges = _quantile_edges(y, ny_bins, y.min(), y.max(), sample_size, seed + 1)
+
+        return cls.from_edges(x_edges, y_edges, **kwargs)
+
+    def update(self, x, y, z, workers=1):
+        """
+        Add a chunk of points to the grid.
+
+        Parameters
+        ----------
+        x, y, z : array-like
+            1D arrays of the same length. np.memmap slices are read one block at a time.
+        workers : int
+            Number of processes to shard the points across. The points are passed to the workers
+            through fixed-size blocks of shared memory, a round of about workers million points
+            at a time, and the per-shard statistics are merged elementwise. The process pool is
+            created on first use and kept for later updates; call close() (or use the
+            accumulator as a context manager) to shut it down.
+
+        Returns
+        -------
+        self : GalaxyAccumulator
+        """
+        if not (len(x) == len(y) == len(z)):
+            raise ValueError("GalaxyAccumulator.update: x, y and z must have the same length")
 
-    # Assign max z to each bin
-    for i in range(nx_bins):
-        for j in range(ny_bins):
-            mask = ((x >= x_edges[i]) & (x < x_edges[i+1]) &
-                    (y >= y_edges[j]) & (y < y_edges[j+1]))
-            if np.any(mask):
-                z_grid[j, i] = np.max(z[mask])
+        if workers > 1:
+            _parallel_accumulate_2d(self._stats, x, y, z,
+                                    self.x_edges, self.y_edges, self.z_edges, workers,
+                                    self._get_pool(workers))
+        else:
+            _accumulate_2d(self._stats, x, y, z, self.x_edges, self.y_edges, self.z_edges)
+
+        return self
+
+    def _get_pool(self, workers):
+        """The process pool for update(), created on first use, and again if workers changes."""
+        if getattr(self, "_pool", None) is not None and self._pool_workers != workers:
+            self.close()
+
+        if getattr(self, "_pool", None) is None:
+            self._pool = ProcessPoolExecutor(max_workers=workers)
+            self._pool_workers = workers
+            self._pool_finalizer = weakref.finalize(self, self._pool.shutdown)
+
+        return self._pool
+
+    def close(self):
+        """Shut down the worker processes used by update(workers > 1), if any."""
+        if getattr(self, "_pool", None) is not None:
+            self._pool_finalizer()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()                                                                # the pool cannot be pickled
+        for name in ("_pool", "_pool_workers", "_pool_finalizer"):
+            state.pop(name, None)
+        return state
+
+    def merge(self, other):
+        """
+        Combine another accumulator with the same bins and reductions into this one (e.g. one
+        built per file or per process). Max and min merge elementwise, counts, sums and sketches
+        add.
+
+        Returns
+        -------
+        self : GalaxyAccumulator
+        """
+        if not (np.array_equal(self.x_edges, other.x_edges) and
+                np.array_equal(self.y_edges, other.y_edges) and
+                self._stats.keys() == other._stats.keys() and
+                (self.z_edges is None or np.array_equal(self.z_edges, other.z_edges))):
+            raise ValueError("GalaxyAccumulator.merge: accumulators must have identical bins")
+
+        _merge_stats(self._stats, other._stats)
+
+        return self
+
+    @property
+    def count(self):
+        """Number of points in each bin, as a (ny_bins, nx_bins) array."""
+        if self.storage == 'sparse':
+            count = _densify(self._stats["index"], self._stats["count"], self.nx_bins * self.ny_bins, 0)
+            return count.astype(np.int64).reshape(self.ny_bins, self.nx_bins)
+        return self._stats["count"].reshape(self.ny_bins, self.nx_bins).copy()
+
+    @property
+    def grid(self):
+        """The first reduction, as a (ny_bins, nx_bins) array. Empty bins are NaN."""
+        return self.get_grid()
+
+    @property
+    def grids(self):
+        """Every requested reduction, as a dict of (ny_bins, nx_bins) arrays."""
+        return {name: self.get_grid(name) for name in self.reductions}
+
+    def get_grid(self, reduce=None):
+        """
+        Return one reduction as a (ny_bins, nx_bins) array. Empty bins are NaN (0 for 'count').
+
+        Parameters
+        ----------
+        reduce : str, optional
+            One of the reductions given to the constructor (any quantile, if one was given).
+            Default is the first.
+        """
+        reduce = self._check_reduction(reduce)
+
+        if self.storage == 'sparse':
+            index, values = self.get_sparse(reduce)
+            grid = _densify(index, values, self.nx_bins * self.ny_bins,
+                            0 if reduce == 'count' else np.nan)
+        else:
+            grid = _finalize(self._stats, reduce, self.z_edges)
+
+        return grid.reshape(self.ny_bins, self.nx_bins)
+
+    def get_sparse(self, reduce=None):
+        """
+        Return one reduction for the occupied bins only (sparse storage).
+
+        Returns
+        -------
+        index : 1D int array
+            Sorted linear bin indices, iy * nx_bins + ix.
+        values : 1D float array
+            The reduction for each of those bins.
+        """
+        if self.storage != 'sparse':
+            raise ValueError("GalaxyAccumulator.get_sparse: requires storage='sparse'")
+
+        values = _finalize(self._stats, self._check_reduction(reduce), self.z_edges)
+
+        return self._stats["index"].copy(), values
+
+    def _check_reduction(self, reduce):
+        """Default to the first reduction, and check its statistics were accumulated."""
+        reduce = self.reductions[0] if reduce is None else reduce
+
+        if not set(_parse_reduction(reduce)[0]) <= self._stats.keys():
+            raise ValueError(f"GalaxyAccumulator: {reduce!r} was not requested at construction")
+
+        return reduce
+
+    @property
+    def extent(self):
+        """(left, right, bottom, top) of the grid in data coordinates, as used by imshow."""
+        return (self.x_edges[0], self.x_edges[-1], self.y_edges[0], self.y_edges[-1])
+
+    @property
+    def uniform(self):
+        """True if the bins are equally spaced along both axes."""
+        return _is_uniform(self.x_edges) and _is_uniform(self.y_edges)
+
+    def render(self, ax=None, cmap='Greys', reduce=None):
+        """
+        Draw the accumulated grid as a Tufte-style galaxy plot.
+
+        Parameters
+        ----------
+        ax : matplotlib.axes.Axes, optional
+            Axes to draw on. If None, a new figure is created.
+        cmap : str or Colormap
+            Colormap to use (grayscale recommended).
+        reduce : str, optional
+            Which reduction to draw. Default is the first.
+
+        Returns
+        -------
+        ax : matplotlib.axes.Axes
+        im : matplotlib.image.AxesImage (matplotlib.collections.QuadMesh for non-uniform bins)
+        """
+        uniform = self.uniform
+
+        if self.storage == 'dense':
+            return _draw_galaxy(self.get_grid(reduce), self.extent, ax=ax, cmap=cmap,
+                                edges=None if uniform else (self.x_edges, self.y_edges))
+
+        if ax is None:
+            fig, ax = plt.subplots(figsize=(4,3.5))
+
+        # Merge occupied bins down to roughly one per display pixel, then densify at that size
+        fx = max(1, int(np.ceil(self.nx_bins / max(ax.bbox.width, 1))))
+        fy = max(1, int(np.ceil(self.ny_bins / max(ax.bbox.height, 1))))
+        nx, ny = -(-self.nx_bins // fx), -(-self.ny_bins // fy)
+
+        stats = _coarsen_sparse(self._stats, self.nx_bins, fx, fy)
+        reduce = self._check_reduction(reduce)
+        grid = _densify(stats["index"], _finalize(stats, reduce, self.z_edges), nx * ny,
+                        0 if reduce == 'count' else np.nan).reshape(ny, nx)
+
+        if not uniform:
+            x_edges = np.append(self.x_edges[::fx], self.x_edges[-1])[:nx + 1]
+            y_edges = np.append(self.y_edges[::fy], self.y_edges[-1])[:ny + 1]
+            return _draw_galaxy(grid, self.extent, ax=ax, cmap=cmap, edges=(x_edges, y_edges))
+
+        dx = (self.x_edges[-1] - self.x_edges[0]) / self.nx_bins * fx
+        dy = (self.y_edges[-1] - self.y_edges[0]) / self.ny_bins * fy
+        extent = (self.x_edges[0], self.x_edges[0] + nx * dx,
+                  self.y_edges[0], self.y_edges[0] + ny * dy)
+
+        return _draw_galaxy(grid, extent, ax=ax, cmap=cmap)
+
+####################################################################################################
+#                                  Multi-resolution grid pyramid                                   #
+####################################################################################################
+class GalaxyPyramid:
+    """
+    A multi-resolution pyramid of galaxy grids, so that zooming re-renders from pre-binned data
+    instead of re-binning the raw points. Level 0 is the finest grid; each coarser level merges
+    2x2 blocks of the level below (by max, min or sum), until a single cell remains.
+
+    Levels are held in memory, or written to a directory as .npy files and memory-mapped, so a
+    very fine grid can be browsed without loading it. A pyramid saved to a directory can be
+    reopened with GalaxyPyramid.load().
+
+    Parameters
+    ----------
+    grid : 2D array
+        Finest grid, shape (ny, nx), with NaN for empty bins (e.g. GalaxyAccumulator.grid).
+    extent : (float, float, float, float)
+        (left, right, bottom, top) of the grid in data coordinates.
+    how : str
+        How cells are merged between levels: 'max', 'min', 'sum', or 'mean' (requires count).
+    count : 2D array, optional
+        Points per bin, used to weight 'mean' grids when merging.
+    directory : str, optional
+        If given, levels are stored here as memory-mapped .npy files.
+
+    Example
+    -------
+    acc = GalaxyAccumulator((-1, 1), (-1, 1), nx_bins=4096, ny_bins=4096).update(x, y, z)
+    pyramid = GalaxyPyramid.from_accumulator(acc)
+    ax, im = pyramid.render()      # zooming with the toolbar now draws from the pyramid
+    """
+
+    _HOW = {"max": "max", "min": "min", "count": "sum", "sum": "sum", "mean": "mean"}
+
+    def __init__(self, grid, extent, *, how='max', count=None, directory=None):
+
+        if how not in ("max", "min", "sum", "mean"):
+            raise ValueError(f"GalaxyPyramid: how must be 'max', 'min', 'sum' or 'mean', got {how!r}")
+        if how == "mean" and count is None:
+            raise ValueError("GalaxyPyramid: count is required to merge 'mean' grids")
+
+        grid = np.asarray(grid, dtype=float)
+        count = None if count is None else np.asarray(count)
+        self.how = how
+        self.extent = tuple(float(e) for e in extent)
+        self.directory = directory
+
+        # Means are merged as sums, and divided by the merged counts when read
+        self._values = [np.where(count > 0, grid * count, np.nan) if how == "mean" else grid]
+        self._counts = [np.asarray(count, dtype=float)] if how == "mean" else None
+
+        while max(self._values[-1].shape) > 1:
+            self._values.append(_downsample_2x2(self._values[-1], "sum" if how == "mean" else how))
+            if self._counts is not None:
+                self._counts.append(_downsample_2x2(self._counts[-1], "sum"))
+
+        if directory is not None:
+            self._values = self._store(directory, "level", self._values)
+            if self._counts is not None:
+                self._counts = self._store(directory, "count", self._counts)
+            np.savez(os.path.join(directory, "pyramid.npz"), how=how, extent=self.extent,
+                     n_levels=len(self._values))
+
+        finest = self.level(0)
+        self.z_range = (np.nanmin(finest), np.nanmax(finest))
+
+    @classmethod
+    def from_accumulator(cls, accumulator, reduce=None, directory=None):
+        """
+        Build a pyramid from one reduction of a GalaxyAccumulator. Quantiles cannot be merged
+        exactly between levels, so only 'max', 'min', 'count', 'sum' and 'mean' are supported.
+        """
+        reduce = accumulator.reductions[0] if reduce is None else reduce
+
+        if reduce not in cls._HOW:
+            raise ValueError(f"GalaxyPyramid: cannot build a pyramid of {reduce!r} grids")
+        if not accumulator.uniform:
+            raise ValueError("GalaxyPyramid: requires equally spaced bins")
+
+        count = accumulator.count if reduce == "mean" else None
+
+        return cls(accumulator.get_grid(reduce), accumulator.extent,
+                   how=cls._HOW[reduce], count=count, directory=directory)
+
+    @classmethod
+    def load(cls, directory):
+        """Reopen a pyramid previously saved to a directory, memory-mapping its levels."""
+        meta = np.load(os.path.join(directory, "pyramid.npz"))
+
+        pyramid = cls.__new__(cls)
+        pyramid.how = str(meta["how"])
+        pyramid.extent = tuple(meta["extent"])
+        pyramid.directory = directory
+
+        n_levels = int(meta["n_levels"])
+        pyramid._values = [np.load(os.path.join(directory, f"level_{k}.npy"), mmap_mode='r')
+                           for k in range(n_levels)]
+        pyramid._counts = None
+        if pyramid.how == "mean":
+            pyramid._counts = [np.load(os.path.join(directory, f"count_{k}.npy"), mmap_mode='r')
+                               for k in range(n_levels)]
+
+        finest = pyramid.level(0)
+        pyramid.z_range = (np.nanmin(finest), np.nanmax(finest))
+
+        return pyramid
+
+    @staticmethod
+    def _store(directory, prefix, levels):
+        """Write levels to .npy files and return them memory-mapped."""
+        os.makedirs(directory, exist_ok=True)
+        stored = []
+        for k, level in enumerate(levels):
+            path = os.path.join(directory, f"{prefix}_{k}.npy")
+            np.save(path, level)
+            stored.append(np.load(path, mmap_mode='r'))
+        return stored
+
+    @property
+    def n_levels(self):
+        """Number of levels, including the finest."""
+        return len(self._values)
+
+    def level(self, k, rows=slice(None), cols=slice(None)):
+        """Return (a window of) level k as a 2D array. Empty bins are NaN."""
+        values = np.asarray(self._values[k][rows, cols], dtype=float)
+        if self._counts is None:
+            return values
+        counts = np.asarray(self._counts[k][rows, cols])
+        return values / np.where(counts > 0, counts, np.nan)
+
+    def select(self, xlim, ylim, width_px, height_px):
+        """
+        Find the coarsest level with at least one cell per display pixel, and the window of it
+        that covers the given limits.
+
+        Parameters
+        ----------
+        xlim, ylim : (float, float)
+            Visible data limits, e.g. ax.get_xlim() and ax.get_ylim().
+        width_px, height_px : float
+            Size of the axes in display pixels, e.g. ax.bbox.width and ax.bbox.height.
+
+        Returns
+        -------
+        level : int
+        window : 2D array
+            The visible cells of that level.
+        extent : (float, float, float, float)
+            (left, right, bottom, top) of the window in data coordinates.
+        """
+        x0, x1 = sorted(xlim)
+        y0, y1 = sorted(ylim)
+        left, right, bottom, top = self.extent
+        ny0, nx0 = self._values[0].shape
+        dx0, dy0 = (right - left) / nx0, (top - bottom) / ny0
+
+        # Data units per display pixel
+        px = (x1 - x0) / max(width_px, 1)
+        py = (y1 - y0) / max(height_px, 1)
+
+        level = 0
+        while (level + 1 < self.n_levels and
+               dx0 * 2**(level + 1) <= px and
+               dy0 * 2**(level + 1) <= py):
+            level += 1
+
+        ny, nx = self._values[level].shape
+        dx, dy = dx0 * 2**level, dy0 * 2**level
+
+        i0 = int(np.clip(np.floor((x0 - left) / dx), 0, nx - 1))
+        i1 = int(np.clip(np.ceil((x1 - left) / dx), i0 + 1, nx))
+        j0 = int(np.clip(np.floor((y0 - bottom) / dy), 0, ny - 1))
+        j1 = int(np.clip(np.ceil((y1 - bottom) / dy), j0 + 1, ny))
+
+        window = self.level(level, slice(j0, j1), slice(i0, i1))
+        extent = (left + i0 * dx, left + i1 * dx, bottom + j0 * dy, bottom + j1 * dy)
+
+        return level, window, extent
+
+    def render(self, ax=None, cmap='Greys'):
+        """
+        Draw the pyramid as a Tufte-style galaxy plot. The axes' xlim/ylim callbacks are hooked
+        so that zooming or panning redraws the matching level and window. The color scale is
+        fixed to the range of the finest level, so colors stay comparable while zooming.
+
+        Returns
+        -------
+        ax : matplotlib.axes.Axes
+        im : matplotlib.image.AxesImage
+        """
+        if ax is None:
+            fig, ax = plt.subplots(figsize=(4,3.5))
+
+        left, right, bottom, top = self.extent
+        _, window, extent = self.select((left, right), (bottom, top), ax.bbox.width, ax.bbox.height)
+
+        ax, im = _draw_galaxy(window, extent, ax=ax, cmap=cmap, z_range=self.z_range)
+
+        # Limits are now driven by the user, not by the extent of the current window
+        ax.set_xlim(left, right)
+        ax.set_ylim(bottom, top)
+        ax.set_autoscale_on(False)
+
+        def _on_limits_changed(ax):
+            _, window, extent = self.select(ax.get_xlim(), ax.get_ylim(),
+                                            ax.bbox.width, ax.bbox.height)
+            im.set_data(np.nan_to_num(window, nan=self.z_range[0]))
+            im.set_extent(extent)
+
+        ax.callbacks.connect('xlim_changed', _on_limits_changed)
+        ax.callbacks.connect('ylim_changed', _on_limits_changed)
+
+        return ax, im
+
+####################################################################################################
+#                                     Draw a binned galaxy grid                                    #
+####################################################################################################
+def _draw_galaxy(z_grid, extent, ax=None, cmap='Greys', z_range=None, edges=None):
+    """
+    Render a (ny, nx) grid of binned values with the Tufte galaxy styling. The color scale spans
+    the grid's min and max, unless a fixed z_range is given. Grids with unequal bins are drawn
+    with pcolormesh at the given (x_edges, y_edges) instead of imshow.
+    """
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(4,3.5))
+    else:
+        fig = ax.figure
+
+    if z_range is None:
+        z_range = (np.nanmin(z_grid), np.nanmax(z_grid))
 
     # Handle any bins with no data
-    z_grid = np.nan_to_num(z_grid, nan=np.nanmin(z_grid))
+    z_grid = np.nan_to_num(z_grid, nan=z_range[0])
 
-    z_min, z_max = np.nanmin(z_grid), np.nanmax(z_grid)
+    z_min, z_max = z_range
 
-    im = ax.imshow(z_grid, origin='lower',
-                   extent=(x.min(), x.max(), y.min(), y.max()),
-                   cmap=cmap,
-                   norm=Normalize(vmin=z_min, vmax=z_max),
-                   aspect='auto')
+    if edges is None:
+        im = ax.imshow(z_grid, origin='lower',
+                       extent=extent,
+                       cmap=cmap,
+                       norm=Normalize(vmin=z_min, vmax=z_max),
+                       aspect='auto')
+    else:
+        im = ax.pcolormesh(edges[0], edges[1], z_grid,
+                           cmap=cmap,
+                           norm=Normalize(vmin=z_min, vmax=z_max),
+                           shading='flat')
 
     # Apply Tufte style
     apply_tufte_style(ax)
@@ -81,6 +691,84 @@ def galaxy_plot(x, y, z, *,
 
     return ax, im
     
+####################################################################################################
+#                              Direct raster output (no matplotlib figure)                         #
+####################################################################################################
+_LUT_CACHE = {}
+
+def _colormap_lut(cmap):
+    """
+    256-entry RGBA lookup table for a colormap. Each RGBA uint8 quad is packed into one uint32 so
+    that a single gather colors a pixel. Registered colormaps, given by name, are cached; Colormap
+    objects are sampled on every call, since their names need not identify them (e.g. every
+    ListedColormap is "unnamed" by default).
+    """
+    if isinstance(cmap, str) and cmap in _LUT_CACHE:
+        return _LUT_CACHE[cmap]
+
+    colormap = matplotlib.colormaps[cmap] if isinstance(cmap, str) else cmap
+    rgba = np.ascontiguousarray(colormap(np.linspace(0, 1, 256), bytes=True))
+    lut = rgba.view(np.uint32).ravel()
+
+    if isinstance(cmap, str):
+        _LUT_CACHE[cmap] = lut
+
+    return lut
+
+def galaxy_image(z_grid, cmap='Greys', format='rgba', z_range=None):
+    """
+    Color a binned galaxy grid directly into an image, without creating a matplotlib figure
+    (e.g. for serving map tiles). Colors match galaxy_plot: empty bins take the grid minimum,
+    and the color scale spans the min and max shown by add_min_max_colorbar.
+
+    Parameters
+    ----------
+    z_grid : 2D array
+        Grid of shape (ny, nx) with row 0 at the bottom, e.g. GalaxyAccumulator.grid.
+    cmap : str or Colormap
+        Colormap to use (grayscale recommended).
+    format : str
+        'rgba' (default) for a uint8 array, or 'png' for encoded PNG bytes (requires Pillow).
+    z_range : (float, float), optional
+        Fixed color scale, e.g. to keep neighbouring tiles consistent. Default is the grid's own
+        min and max.
+
+    Returns
+    -------
+    image : ndarray of shape (ny, nx, 4) and dtype uint8 with row 0 at the top, or bytes
+
+    Notes
+    -----
+    Coloring a 256 x 256 tile takes a fraction of a millisecond. With format='png', the time is
+    dominated by PNG encoding (fast zlib level 1).
+    """
+    z_grid = np.asarray(z_grid, dtype=float)
+    ny, nx = z_grid.shape
+
+    if z_range is None:
+        z_range = (np.nanmin(z_grid), np.nanmax(z_grid))
+    z_min, z_max = z_range
+
+    # Same mapping as Normalize + Colormap: scale to [0, 1], then index one of 256 colors.
+    # fmax also sends empty (NaN) bins to the first color.
+    scale = 256 / (z_max - z_min) if z_max > z_min else 0.0
+    index = z_grid[::-1] - z_min
+    index *= scale
+    np.fmax(index, 0, out=index)
+    np.minimum(index, 255, out=index)
+
+    rgba = _colormap_lut(cmap).take(index.astype(np.uint8)).view(np.uint8).reshape(ny, nx, 4)
+
+    if format == 'rgba':
+        return rgba
+    if format == 'png':
+        from PIL import Image                                                                       # Pillow, required by matplotlib >= 3.3
+        buffer = io.BytesIO()
+        Image.fromarray(rgba).save(buffer, format='png', compress_level=1)
+        return buffer.getvalue()
+
+    raise ValueError(f"galaxy_image: format must be 'rgba' or 'png', got {format!r}")
+
 ####################################################################################################
 #                                    Generate minimal color bar                                    #
 ####################################################################################################
@@ -1,12 +1,17 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.ticker import NullLocator
 from tufteplotlib.styles import apply_tufte_style
-from tufteplotlib.utils import _intermediate_ticks
+from tufteplotlib.utils import _intermediate_ticks, _log_ticks, _weighted_quantile
+from tufteplotlib.binning import (_CHUNK_SIZE, _bin_index, _group_sparse, _log_linear_edges,
+                                  _log_linear_index, _signed_log_linear_bounds,
+                                  _signed_log_linear_index, _uniform_counts)
 
 ####################################################################################################
 #                                         Core function                                            #
 ####################################################################################################
-def histogram_plot(data, bins=10, ax=None, orientation="vertical"):
+def histogram_plot(data=None, bins=10, ax=None, orientation="vertical", workers=1, scale="linear",
+                   precision=0.01, weights=None, counts=None):
     """
     Plot the frequency of observations for a 1-dimensional data set, distributed across discretized
     numerical categories. If the data are dense, consider using the density plot instead.
@@ -14,14 +19,28 @@ def histogram_plot(data, bins=10, ax=None, orientation="vertical"):
     Parameters
     ----------
     data : array-like
-        Input data to histogram.
+        Input data to histogram. Omit when giving pre-binned counts.
     bins : int or sequence, optional
-        Number of bins or explicit bin edges. Default 10.
+        Number of bins or explicit bin edges. Default 10. The bin edges, when giving counts.
     ax : matplotlib.axes.Axes, optional
         Axis to draw on. If None, a new figure is created.
     orientation : str, optional
         "vertical" (default) for standard upright bars;
         "horizontal" for rotated bars (e.g. marginal distribution panel).
+    workers : int, optional
+        For integer bins, the number of threads counting the data. Default 1.
+    scale : str, optional
+        "linear" (default), or "log" for long-tailed, positive data (e.g. latencies): the values
+        are counted in log-linear buckets of fixed relative precision (see
+        LogHistogramAccumulator), drawn as bins bars of equal width on a log axis.
+    precision : float, optional
+        Relative bucket width for scale="log". Default 0.01.
+    weights : array-like, optional
+        Weight of each value in data (e.g. how many times it occurred), as for np.histogram.
+        The median tick is then the weighted median.
+    counts : array-like, optional
+        Pre-binned counts, one per bin, with bins giving the len(counts) + 1 edges. The data are
+        not needed, and the median tick is interpolated from the cumulative counts.
 
     Returns
     -------
@@ -33,11 +52,114 @@ def histogram_plot(data, bins=10, ax=None, orientation="vertical"):
     else:
         fig = ax.figure
 
+    if scale not in ("linear", "log"):
+        raise ValueError(f"histogram_plot: scale must be 'linear' or 'log', got {scale!r}")
+
+    # --- Pre-binned counts -----------------------------------------------
+    if counts is not None:
+        if data is not None:
+            raise ValueError("histogram_plot: give either data or counts, not both")
+        counts = np.asarray(counts)
+        bin_edges = np.asarray(bins, dtype=float)
+        if bin_edges.ndim != 1 or len(bin_edges) != len(counts) + 1:
+            raise ValueError("histogram_plot: with counts, bins must be the len(counts) + 1 bin edges")
+        if scale == "log" and not bin_edges[0] > 0:
+            raise ValueError("histogram_plot: scale='log' requires positive bin edges")
+
+        _draw_histogram(counts, bin_edges, _counts_quantile(counts, bin_edges, 50), ax, orientation,
+                        log=scale == "log")
+        return fig, ax
+
+    if data is None:
+        raise ValueError("histogram_plot: either data or counts is required")
+
     # --- Compute bin counts and edges -----------------------------------
-    counts, bin_edges = np.histogram(data, bins=bins)
+    data = np.asarray(data)
+    if weights is not None:
+        weights = np.asarray(weights)
+        if weights.shape != data.shape:
+            raise ValueError("histogram_plot: weights must have the same shape as data")
+
+    if scale == "log":
+        if weights is not None:
+            raise ValueError("histogram_plot: scale='log' does not support weights; pass counts "
+                             "over log-spaced bins instead")
+        if not data.min() > 0:
+            raise ValueError("histogram_plot: scale='log' requires positive data")
+        if not isinstance(bins, (int, np.integer)):
+            raise ValueError("histogram_plot: scale='log' requires an integer number of bins")
+        accumulator = LogHistogramAccumulator(lowest=data.min(), precision=precision)
+        return accumulator.update(data).render(ax=ax, bins=bins, orientation=orientation)
+
+    if isinstance(bins, (int, np.integer)) and data.ndim == 1 and data.size and data.dtype.kind in "fiu":
+        counts, bin_edges = _uniform_histogram(data, bins, workers, weights)                       # fast path
+    else:
+        counts, bin_edges = np.histogram(data, bins=bins, weights=weights)
+
+    d_median = np.median(data) if weights is None else _weighted_quantile(data.ravel(), weights.ravel(), 50)
+
+    _draw_histogram(counts, bin_edges, d_median, ax, orientation)
+
+    return fig, ax
+
+
+####################################################################################################
+#                                  Equal-width bins (fast path)                                    #
+####################################################################################################
+def _uniform_histogram(data, bins, workers=1, weights=None):
+    """
+    np.histogram(data, bins, weights=weights) for integer bins, with the same edges, but counted
+    in a single multiply-and-floor pass with np.bincount (see binning._uniform_counts). float32
+    data stay float32.
+
+    Parameters:
+        data    : 1D numeric array
+        bins    : number of bins
+        workers : number of threads
+        weights : optional 1D array of weights, same length as data
+
+    Returns:
+        counts, bin_edges
+    """
+    if bins < 1:
+        raise ValueError(f"histogram_plot: bins must be positive, got {bins}")
 
+    lo, hi = data.min(), data.max()
+    if not (np.isfinite(lo) and np.isfinite(hi)):
+        raise ValueError(f"histogram_plot: autodetected range of [{lo}, {hi}] is not finite")
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+
+    edge_type = np.result_type(lo, hi, data)
+    if not np.issubdtype(edge_type, np.inexact):
+        edge_type = float
+    bin_edges = np.linspace(lo, hi, bins + 1, dtype=edge_type)
+
+    counts = _uniform_counts(data, bin_edges[0], bin_edges[-1], bins, workers, weights, bin_edges)
+
+    return counts, bin_edges
+
+
+####################################################################################################
+#                                   Draw bars from binned counts                                   #
+####################################################################################################
+def _draw_histogram(counts, bin_edges, d_median, ax, orientation="vertical", caller="histogram_plot",
+                    log=False):
+    """
+    Draw Tufte-style histogram bars, with white gridlines through them in place of a count axis
+    line, and min/median/max ticks on the data axis.
+
+    Parameters:
+        counts      : 1D array of counts per bin
+        bin_edges   : 1D array of len(counts) + 1 increasing bin edges
+        d_median    : median of the data, for the middle data axis tick
+        ax          : matplotlib axes to draw on
+        orientation : "vertical" or "horizontal"
+        caller      : name used in error messages
+        log         : draw the data axis on a log scale, with ticks at powers of ten
+    """
     # --- Format string for tick labels ----------------------------------
-    count_fmt = "d"
+    count_fmt = "d" if np.all(np.mod(counts, 1) == 0) else (".0f" if counts.max() >= 100 else ".3g")   # weighted counts may be fractional
 
     # --- Count axis ticks ------------------------------------------------
     cmin, cmax = counts.min(), counts.max()
@@ -48,17 +170,39 @@ def histogram_plot(data, bins=10, ax=None, orientation="vertical"):
     if cmax not in c_ticks:
         c_ticks = np.append(c_ticks, cmax)
 
+    c_labels = [f"{int(ct):d}" if count_fmt == "d" else f"{ct:{count_fmt}}" for ct in c_ticks]
+
     # --- Data axis ticks -------------------------------------------------
     d_min = bin_edges[0]
     d_max = bin_edges[-1]
-    d_median = np.median(data)
     d_ticks = [d_min, d_median, d_max]
+    d_fmt = ".2f"
+    d_bounds = (d_min + 0.07, d_max - 0.07)
 
     # --- Bar geometry ----------------------------------------------------
-    bin_width = bin_edges[1] - bin_edges[0]
+    bin_width = np.diff(bin_edges)
     bar_width = bin_width * 0.7
     bar_left = bin_edges[:-1] + bin_width * 0.15
 
+    if log:
+        # Same gaps between bars, but in log space; median replaces any decade tick too close to it
+        log_edges = np.log10(bin_edges)
+        log_width = np.diff(log_edges)
+        bar_left = 10**(log_edges[:-1] + log_width * 0.15)
+        bar_width = 10**(log_edges[:-1] + log_width * 0.85) - bar_left
+
+        log_range = log_edges[-1] - log_edges[0]
+        d_ticks = [dt for dt in _log_ticks(d_min, d_max, edge_fraction=0.12)
+                   if dt in (d_min, d_max) or abs(np.log10(dt / d_median)) > 0.12 * log_range]
+        d_ticks = sorted(d_ticks + [d_median])
+        d_fmt = ".3g"
+        d_bounds = (d_min, d_max)
+
+        if orientation == "vertical":
+            ax.set_xscale("log")
+        elif orientation == "horizontal":
+            ax.set_yscale("log")
+
     if orientation == "vertical":
 
         ax.bar(
@@ -73,7 +217,7 @@ def histogram_plot(data, bins=10, ax=None, orientation="vertical"):
 
         # Count axis
         ax.set_yticks(c_ticks)
-        ax.set_yticklabels([f"{int(ct):{count_fmt}}" for ct in c_ticks])
+        ax.set_yticklabels(c_labels)
 
         for ct in c_ticks[1:]:
             ax.hlines(
@@ -88,14 +232,12 @@ def histogram_plot(data, bins=10, ax=None, orientation="vertical"):
 
         # Data axis
         ax.set_xticks(d_ticks)
-        ax.set_xticklabels([f"{dt:.2f}" for dt in d_ticks])
+        ax.set_xticklabels([f"{dt:{d_fmt}}" for dt in d_ticks])
+        ax.xaxis.set_minor_locator(NullLocator())
         ax.tick_params(axis="x", length=2, width=0.5)
 
         # Spines
-        ax.spines["bottom"].set_bounds(
-            bin_edges[0] + 0.07,
-            bin_edges[-1] - 0.07,
-        )
+        ax.spines["bottom"].set_bounds(*d_bounds)
         ax.spines["bottom"].set_color([0.4, 0.4, 0.4])
 
         ax.spines["left"].set_visible(False)
@@ -116,7 +258,7 @@ def histogram_plot(data, bins=10, ax=None, orientation="vertical"):
 
         # Count axis
         ax.set_xticks(c_ticks)
-        ax.set_xticklabels([f"{int(ct):{count_fmt}}" for ct in c_ticks])
+        ax.set_xticklabels(c_labels)
 
         for ct in c_ticks[1:]:
             ax.vlines(
@@ -131,14 +273,12 @@ def histogram_plot(data, bins=10, ax=None, orientation="vertical"):
 
         # Data axis
         ax.set_yticks(d_ticks)
-        ax.set_yticklabels([f"{dt:.2f}" for dt in d_ticks])
+        ax.set_yticklabels([f"{dt:{d_fmt}}" for dt in d_ticks])
+        ax.yaxis.set_minor_locator(NullLocator())
         ax.tick_params(axis="y", length=2, width=0.5)
 
         # Spines
-        ax.spines["left"].set_bounds(
-            bin_edges[0] + 0.07,
-            bin_edges[-1] - 0.07,
-        )
+        ax.spines["left"].set_bounds(*d_bounds)
         ax.spines["left"].set_color([0.4, 0.4, 0.4])
 
         ax.spines["bottom"].set_visible(False)
@@ -147,14 +287,395 @@ def histogram_plot(data, bins=10, ax=None, orientation="vertical"):
 
     else:
         raise ValueError(
-            f"histogram_plot: orientation must be 'vertical' or "
+            f"{caller}: orientation must be 'vertical' or "
             f"'horizontal', got {orientation!r}"
         )
 
     # Apply Tufte style
     apply_tufte_style(ax)
 
-    return fig, ax
+
+####################################################################################################
+#                                 Streaming (chunked) accumulation                                 #
+####################################################################################################
+class HistogramAccumulator:
+    """
+    Build a histogram incrementally, for data that arrive in chunks or do not fit in memory (e.g.
+    slices of an np.memmap). Memory is bounded by the number of bins, not the sample count.
+
+    Bins are half-open, [edges[i], edges[i+1]), except the last, which includes its right edge,
+    as for np.histogram. Values outside the edges are not drawn, but are counted in underflow and
+    overflow and still count towards the quantiles.
+
+    Quantiles (including the median tick) are read from a sketch of log-linear buckets of both
+    signs (as in QuartileAccumulator), independent of the edges, so each is within a relative
+    error of precision of the exact value (an absolute error of lowest for values closer to zero
+    than lowest), however long the tails are. Memory grows with the dynamic range of the data,
+    not the sample count. Quantiles are clamped to the observed min and max.
+
+    Parameters
+    ----------
+    data_range : (float, float)
+        Lower and upper extent of the histogram.
+    bins : int
+        Number of equal-width bins. Default 10.
+    precision : float
+        Maximum relative error of the quantiles. Rounded down to a power of two, e.g. 0.01 gives
+        1/128. Default 0.01.
+    lowest : float
+        Smallest magnitude resolved by the quantile sketch, > 0. Default 1e-9.
+
+    Example
+    -------
+    acc = HistogramAccumulator.from_sample(data[:10**6], bins=20)
+    for start in range(0, len(data), 10**6):
+        acc.update(data[start:start + 10**6])
+    fig, ax = acc.render()
+    """
+
+    def __init__(self, data_range, *, bins=10, precision=0.01, lowest=1e-9):
+        lo, hi = float(data_range[0]), float(data_range[1])
+        if not hi > lo:
+            raise ValueError(f"HistogramAccumulator: data_range must be increasing, got {data_range!r}")
+        if not 0 < precision < 1:
+            raise ValueError(f"HistogramAccumulator: precision must be in (0, 1), got {precision!r}")
+        if not lowest > 0:
+            raise ValueError(f"HistogramAccumulator: lowest must be positive, got {lowest!r}")
+
+        self.edges = np.linspace(lo, hi, bins + 1)
+        self.lowest = float(lowest)
+        self.sub_buckets = 1 << int(np.ceil(np.log2(1 / precision)))
+        self.precision = 1 / self.sub_buckets
+
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._sketch = {"index": np.zeros(0, dtype=np.int64), "count": np.zeros(0, dtype=np.int64)}
+
+    @classmethod
+    def from_edges(cls, edges, **kwargs):
+        """
+        Create an accumulator with explicit, increasing bin edges, which need not be equally
+        spaced. Other keyword arguments are as for the constructor.
+        """
+        edges = np.asarray(edges, dtype=float)
+
+        accumulator = cls((edges[0], edges[-1]), bins=len(edges) - 1, **kwargs)
+        accumulator.edges = edges
+
+        return accumulator
+
+    @classmethod
+    def from_sample(cls, data, *, bins=10, sample_size=100_000, seed=0, **kwargs):
+        """
+        Create an accumulator whose edges are chosen from a sample of the data (e.g. the first
+        chunk, or a memory-mapped file), as np.histogram would choose them for that sample.
+
+        Parameters
+        ----------
+        data : array-like
+            Data to sample. At most sample_size values are read, at random positions.
+        bins : int or str
+            Number of bins, or any np.histogram_bin_edges rule (e.g. 'auto', 'fd').
+        sample_size : int
+            Number of values sampled.
+        seed : int
+            Seed for the sample.
+        """
+        if len(data) <= sample_size:
+            sample = np.asarray(data, dtype=float)
+        else:
+            rng = np.random.default_rng(seed)
+            sample = np.asarray(data[np.sort(rng.integers(0, len(data), sample_size))], dtype=float)
+
+        return cls.from_edges(np.histogram_bin_edges(sample[np.isfinite(sample)], bins), **kwargs)
+
+    def update(self, data):
+        """
+        Add a chunk of values. NaNs are ignored. np.memmap slices are read one block at a time.
+
+        Returns
+        -------
+        self : HistogramAccumulator
+        """
+        n_bins = len(self.edges) - 1
+
+        for start in range(0, len(data), _CHUNK_SIZE):
+            chunk = np.asarray(data[start:start + _CHUNK_SIZE], dtype=float)
+            chunk = chunk[~np.isnan(chunk)]
+            if chunk.size == 0:
+                continue
+
+            index = _bin_index(chunk, self.edges)
+            index[chunk == self.edges[-1]] = n_bins - 1                                             # closed last bin
+            self.counts += np.bincount(index[index >= 0], minlength=n_bins)
+            self.underflow += int(np.count_nonzero(chunk < self.edges[0]))
+            self.overflow += int(np.count_nonzero(chunk > self.edges[-1]))
+
+            self.min = min(self.min, chunk.min())
+            self.max = max(self.max, chunk.max())
+            keys, counts = np.unique(_signed_log_linear_index(chunk, self.lowest, self.sub_buckets),
+                                     return_counts=True)
+            self._add(keys, counts)
+
+        return self
+
+    def merge(self, other):
+        """
+        Combine another accumulator with the same edges into this one (e.g. one built per file or
+        per worker).
+
+        Returns
+        -------
+        self : HistogramAccumulator
+        """
+        if not (np.array_equal(self.edges, other.edges) and self.sub_buckets == other.sub_buckets
+                and self.lowest == other.lowest):
+            raise ValueError("HistogramAccumulator.merge: accumulators must have identical bins, "
+                             "precision and lowest")
+
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._add(other._sketch["index"], other._sketch["count"])
+
+        return self
+
+    def _add(self, keys, counts):
+        """Add counts to the sketch buckets with the given signed log-linear keys."""
+        self._sketch = _group_sparse(np.concatenate([self._sketch["index"], keys]),
+                                     {"count": np.concatenate([self._sketch["count"], counts])})
+
+    @property
+    def total(self):
+        """Number of values added, including those outside the edges."""
+        return int(self._sketch["count"].sum())
+
+    @property
+    def median(self):
+        """Approximate median of every value added."""
+        return self.quantile(50)
+
+    def quantile(self, q):
+        """
+        Approximate q-th percentile (0 to 100) of every value added, from the sketch, within the
+        error bound above. NaN if no values have been added.
+        """
+        if self.total == 0:
+            return np.nan
+
+        counts = self._sketch["count"]
+        cumulative = np.cumsum(counts)
+
+        # Bucket holding the order statistic at (0-based) rank q / 100 * (n - 1)
+        rank = q / 100 * (self.total - 1)
+        k = np.searchsorted(cumulative, rank, side="right")
+        fraction = (rank - (cumulative[k] - counts[k]) + 0.5) / counts[k]
+
+        lower, upper = _signed_log_linear_bounds(self._sketch["index"][k], self.lowest, self.sub_buckets)
+        value = lower + np.clip(fraction, 0, 1) * (upper - lower)
+
+        return float(np.clip(value, self.min, self.max))
+
+    def render(self, ax=None, orientation="vertical"):
+        """
+        Draw the histogram as histogram_plot does, with the approximate median as the middle tick.
+
+        Returns
+        -------
+        fig : matplotlib.figure.Figure
+        ax : matplotlib.axes.Axes
+        """
+        if self.total == 0:
+            raise ValueError("HistogramAccumulator.render: no data have been added")
+
+        if ax is None:
+            fig, ax = plt.subplots(figsize=(4 * 1.618, 4))
+        else:
+            fig = ax.figure
+
+        _draw_histogram(self.counts, self.edges, self.median, ax, orientation,
+                        caller="HistogramAccumulator.render")
+
+        return fig, ax
+
+
+####################################################################################################
+#                         Log-linear (high dynamic range) accumulation                             #
+####################################################################################################
+class LogHistogramAccumulator:
+    """
+    Histogram with log-linear buckets of fixed relative precision, for long-tailed data such as
+    request latencies that span microseconds to seconds.
+
+    Each power of two above lowest is split into equal-width buckets, so every bucket is at most
+    a fraction precision of its lower edge wide (e.g. 1 us resolution at 100 us, 10 ms at 1 s).
+    Each value is bucketed in O(1), with no logarithm or search, and the buckets do not depend on
+    the data, so accumulators with the same lowest and precision can be merged across processes
+    and time windows. Memory grows with the dynamic range, not the sample count: about
+    log2(max / lowest) / precision buckets.
+
+    Quantiles follow np.percentile, with each order statistic placed within its bucket, so their
+    relative error is at most precision. Values below lowest are only resolved to the first
+    bucket: quantiles that fall among them are within lowest * (1 + precision) of the truth.
+
+    Parameters
+    ----------
+    lowest : float
+        Smallest value resolved, > 0. Smaller values (including zero) are counted in the first
+        bucket. Default 1e-6.
+    precision : float
+        Maximum relative bucket width. Rounded down to a power of two, e.g. 0.01 gives 1/128.
+        Default 0.01.
+
+    Example
+    -------
+    acc = LogHistogramAccumulator(lowest=1e-6, precision=0.01)
+    for chunk in latency_chunks:
+        acc.update(chunk)
+    fig, ax = acc.render(bins=30)
+    """
+
+    def __init__(self, lowest=1e-6, precision=0.01):
+        if not lowest > 0:
+            raise ValueError(f"LogHistogramAccumulator: lowest must be positive, got {lowest!r}")
+        if not 0 < precision < 1:
+            raise ValueError(f"LogHistogramAccumulator: precision must be in (0, 1), got {precision!r}")
+
+        self.lowest = float(lowest)
+        self.sub_buckets = 1 << int(np.ceil(np.log2(1 / precision)))
+        self.precision = 1 / self.sub_buckets
+
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, data):
+        """
+        Add a chunk of values. NaNs are ignored. np.memmap slices are read one block at a time.
+
+        Returns
+        -------
+        self : LogHistogramAccumulator
+        """
+        for start in range(0, len(data), _CHUNK_SIZE):
+            chunk = np.asarray(data[start:start + _CHUNK_SIZE])
+            chunk = chunk[~np.isnan(chunk)]
+            if chunk.size == 0:
+                continue
+
+            chunk_counts = np.bincount(_log_linear_index(chunk, self.lowest, self.sub_buckets))
+            self._add(chunk_counts)
+
+            self.min = min(self.min, float(chunk.min()))
+            self.max = max(self.max, float(chunk.max()))
+
+        return self
+
+    def merge(self, other):
+        """
+        Combine another accumulator with the same lowest and precision into this one.
+
+        Returns
+        -------
+        self : LogHistogramAccumulator
+        """
+        if self.lowest != other.lowest or self.sub_buckets != other.sub_buckets:
+            raise ValueError("LogHistogramAccumulator.merge: accumulators must have identical buckets")
+
+        self._add(other.counts)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        return self
+
+    def _add(self, counts):
+        """Add bucket counts, growing the bucket array as needed."""
+        if len(counts) > len(self.counts):
+            self.counts = np.concatenate([self.counts, np.zeros(len(counts) - len(self.counts), np.int64)])
+        self.counts[:len(counts)] += counts
+
+    @property
+    def edges(self):
+        """Edges of the buckets in counts."""
+        return _log_linear_edges(len(self.counts), self.lowest, self.sub_buckets)
+
+    @property
+    def total(self):
+        """Number of values added."""
+        return int(self.counts.sum())
+
+    @property
+    def median(self):
+        """Approximate median of every value added."""
+        return self.quantile(50)
+
+    def quantile(self, q):
+        """
+        Approximate q-th percentile (0 to 100) of every value added, with a relative error of at
+        most precision. NaN if no values have been added.
+        """
+        if self.total == 0:
+            return np.nan
+
+        return float(np.clip(_counts_quantile(self.counts, self.edges, q), self.min, self.max))
+
+    def render(self, ax=None, bins=30, orientation="vertical"):
+        """
+        Draw the histogram on a log scale, as histogram_plot does, with the buckets merged into
+        about bins bars of equal log width.
+
+        Returns
+        -------
+        fig : matplotlib.figure.Figure
+        ax : matplotlib.axes.Axes
+        """
+        if self.total == 0:
+            raise ValueError("LogHistogramAccumulator.render: no data have been added")
+
+        if ax is None:
+            fig, ax = plt.subplots(figsize=(4 * 1.618, 4))
+        else:
+            fig = ax.figure
+
+        # Bars on bucket edges nearest to equal steps in log space, so no bucket is split
+        occupied = np.flatnonzero(self.counts)
+        first, last = occupied[0], occupied[-1] + 1
+        edges = self.edges[first:last + 1]
+        targets = np.geomspace(edges[0], edges[-1], bins + 1)
+        cuts = np.unique(np.clip(np.searchsorted(edges, targets), 0, len(edges) - 1))
+        cuts[0], cuts[-1] = 0, len(edges) - 1
+
+        counts = np.add.reduceat(self.counts[first:last], cuts[:-1])
+
+        _draw_histogram(counts, edges[cuts], self.median, ax, orientation,
+                        caller="LogHistogramAccumulator.render", log=True)
+
+        return fig, ax
+
+
+def _counts_quantile(counts, edges, q):
+    """
+    q-th percentile (0 to 100) of binned counts, as np.percentile: linear interpolation between
+    the order statistics either side of rank q / 100 * (n - 1), each placed in the middle of its
+    share of the bin holding it.
+    """
+    cumulative = np.cumsum(counts)
+    rank = q / 100 * max(cumulative[-1] - 1, 0)
+
+    def order_statistic(j):
+        k = min(int(np.searchsorted(cumulative, j, side="right")), len(counts) - 1)
+        fraction = (j - (cumulative[k] - counts[k]) + 0.5) / max(counts[k], 1)
+        return edges[k] + np.clip(fraction, 0, 1) * (edges[k + 1] - edges[k])
+
+    below = np.floor(rank)
+    low, high = order_statistic(below), order_statistic(np.ceil(rank))
+
+    return low + (rank - below) * (high - low)
 
 
 ####################################################################################################
@@ -2,14 +2,44 @@ import matplotlib.pyplot as plt
 from matplotlib.ticker import StrMethodFormatter
 from tufteplotlib.styles import apply_tufte_style
 from tufteplotlib.utils import _intermediate_ticks
+from tufteplotlib.binning import _CHUNK_SIZE
 import numpy as np
 
+# Visible points per pixel column above which lines are downsampled
+_DOWNSAMPLE_FACTOR = 4
+
 ####################################################################################################
 #                                         Core function                                            #
 ####################################################################################################
-def line_plot(x, y, ax=None, x_labels=None, linewidth=1.0, linecolor='black', autoscale=True):
+def line_plot(x, y, ax=None, x_labels=None, linewidth=1.0, linecolor='black', autoscale=True,
+              downsample=None):
     """
     Plot a line defined by a 2D dataset.
+
+    Parameters
+    ----------
+    x, y : array-like
+        Data points.
+    ax : Optional axis.
+    x_labels : list of str, optional
+        Labels for the x ticks at 0, 1, 2, ...
+    linewidth : float, optional
+        Default 1.0.
+    linecolor : str, optional
+        Default 'black'.
+    autoscale : bool, optional
+        Set the limits, spines and ticks from the data. Default True.
+    downsample : {'minmax', 'lttb'} or bool, optional
+        When there are more than 4 points per pixel column of the axes (and x is sorted), draw
+        only the first, last, minimum and maximum point in each column ('minmax', which looks the
+        same as the full line) or one point per column chosen by Largest-Triangle-Three-Buckets
+        ('lttb'). The line is decimated again from the full data whenever the x limits change, so
+        zooming in shows the detail. Default None ('minmax'); False draws every point.
+
+    Returns
+    -------
+    fig : matplotlib.figure.Figure
+    ax : matplotlib.axes.Axes
     """
 
     if ax is None:
@@ -20,7 +50,12 @@ def line_plot(x, y, ax=None, x_labels=None, linewidth=1.0, linecolor='black', au
     x = np.asarray(x)
     y = np.asarray(y)
 
-    ax.plot(x, y, color=linecolor, linewidth=linewidth, alpha=1.0)
+    method = _downsample_method(ax, x, downsample, "minmax", "line_plot")
+    if method:
+        index = _decimate(x, y, (x[0], x[-1]), _pixel_columns(ax), method)
+        line, = ax.plot(x[index], y[index], color=linecolor, linewidth=linewidth, alpha=1.0)
+    else:
+        ax.plot(x, y, color=linecolor, linewidth=linewidth, alpha=1.0)
 
     # ------------------------------------------------------------------
     # FIX: only autoscale when explicitly enabled
@@ -49,6 +84,10 @@ def line_plot(x, y, ax=None, x_labels=None, linewidth=1.0, linecolor='black', au
     # Format y-axis
     ax.yaxis.set_major_formatter(StrMethodFormatter("{x:,.0f}"))
 
+    # Decimate again from the full data when zoomed or panned
+    if method:
+        _redecimate_on_xlim(ax, x, y, method, lambda index: line.set_data(x[index], y[index]))
+
     # Optional x labels override
     if x_labels is not None:
         ax.set_xticks(np.arange(len(x_labels)))
@@ -56,6 +95,141 @@ def line_plot(x, y, ax=None, x_labels=None, linewidth=1.0, linecolor='black', au
 
     return fig, ax
 
+####################################################################################################
+#                                  Pixel-aware line downsampling                                   #
+####################################################################################################
+def _downsample_method(ax, x, downsample, default, caller):
+    """
+    The decimation method to use for a line: None when every point should be drawn, because it
+    is switched off, x is not numeric or sorted, or there are too few points to gain from it.
+    """
+    if downsample is False:
+        return None
+
+    method = default if downsample is None or downsample is True else downsample
+    if method not in ("minmax", "lttb"):
+        raise ValueError(f"{caller}: downsample must be 'minmax', 'lttb', True, False or None, "
+                         f"got {downsample!r}")
+
+    if not np.issubdtype(x.dtype, np.number) or len(x) <= _DOWNSAMPLE_FACTOR * _pixel_columns(ax):
+        return None
+
+    if not _is_sorted(x):
+        if downsample is not None:
+            raise ValueError(f"{caller}: downsample requires x sorted in increasing order")
+        return None
+
+    return method
+
+def _pixel_columns(ax):
+    """Width of the axes in pixels."""
+    return max(1, int(round(ax.get_window_extent().width)))
+
+def _is_sorted(x):
+    """True if x is non-decreasing, checked one chunk at a time."""
+    for start in range(0, len(x) - 1, _CHUNK_SIZE):
+        stop = min(start + _CHUNK_SIZE, len(x) - 1)
+        if np.any(x[start + 1:stop + 1] < x[start:stop]):
+            return False
+    return True
+
+def _redecimate_on_xlim(ax, x, y, method, update):
+    """
+    Decimate the full data again for the visible x range and pixel width whenever the x limits
+    change, and pass the indices to update().
+    """
+    def on_xlim_changed(ax):
+        update(_decimate(x, y, ax.get_xlim(), _pixel_columns(ax), method))
+
+    return ax.callbacks.connect('xlim_changed', on_xlim_changed)
+
+def _decimate(x, y, x_range, n_columns, method):
+    """
+    Indices of the points to draw for the visible x range: every point, if there are at most
+    _DOWNSAMPLE_FACTOR per pixel column, otherwise a decimation. One point either side of the
+    range is kept, so the line runs off the edges of the axes.
+
+    Parameters:
+        x, y      : 1D arrays, x sorted in increasing order
+        x_range   : (lo, hi) visible x range
+        n_columns : width of the axes in pixels
+        method    : 'minmax' or 'lttb'
+
+    Returns:
+        sorted 1D intp array of indices
+    """
+    lo, hi = min(x_range), max(x_range)
+    start = max(int(np.searchsorted(x, lo, side='left')) - 1, 0)
+    stop = min(int(np.searchsorted(x, hi, side='right')) + 1, len(x))
+
+    if stop - start <= _DOWNSAMPLE_FACTOR * n_columns:
+        return np.arange(start, stop)
+
+    if method == "minmax":
+        return _min_max_indices(x, y, start, stop, lo, hi, n_columns)
+
+    return _lttb_indices(x, y, start, stop, n_columns)
+
+def _min_max_indices(x, y, start, stop, lo, hi, n_columns):
+    """
+    The first, last, minimum and maximum point in each pixel column, which draws the same pixels
+    as the full line. Columns are found by binary search on the sorted x, and processed in groups
+    of about _CHUNK_SIZE points, so temporaries stay small.
+
+    Returns:
+        sorted 1D intp array of indices within [start, stop)
+    """
+    bounds = np.searchsorted(x, np.linspace(lo, hi, n_columns + 1)[1:-1])
+    bounds = np.unique(np.clip(np.concatenate([[start], bounds, [stop]]), start, stop))
+    column_starts, column_stops = bounds[:-1], bounds[1:]
+
+    groups = np.flatnonzero(np.diff((column_starts - start) // _CHUNK_SIZE)) + 1
+    chosen = []
+    for columns in np.split(np.arange(len(column_starts)), groups):
+        first, last = column_starts[columns[0]], column_stops[columns[-1]]
+        segment = y[first:last]
+        offsets = column_starts[columns] - first
+        column = np.repeat(np.arange(len(columns)), column_stops[columns] - column_starts[columns])
+
+        chosen += [column_starts[columns], column_stops[columns] - 1]
+        for reduce in (np.fmin, np.fmax):                                                           # ignore NaN
+            extreme = reduce.reduceat(segment, offsets)
+            hits = np.flatnonzero(segment == extreme[column])
+            _, firsts = np.unique(column[hits], return_index=True)
+            chosen.append(first + hits[firsts])
+
+    return np.unique(np.concatenate(chosen))
+
+def _lttb_indices(x, y, start, stop, n_out):
+    """
+    Largest-Triangle-Three-Buckets (Steinarsson 2013): keep the first and last point, split the
+    rest into n_out - 2 buckets of equal count, and from each bucket keep the point that makes the
+    largest triangle with the point kept from the previous bucket and the mean of the next bucket.
+    The points with the smallest and largest y in the range are kept as well.
+
+    Returns:
+        sorted 1D intp array of indices within [start, stop)
+    """
+    bounds = np.linspace(start + 1, stop - 1, max(n_out, 3) - 1).astype(np.intp)
+    bounds = np.unique(bounds)
+    sizes = np.diff(bounds)
+    x_mean = np.add.reduceat(x[start + 1:stop - 1], bounds[:-1] - start - 1) / sizes
+    y_mean = np.add.reduceat(y[start + 1:stop - 1], bounds[:-1] - start - 1) / sizes
+    x_mean = np.append(x_mean, x[stop - 1])
+    y_mean = np.append(y_mean, y[stop - 1])
+
+    chosen = np.empty(len(sizes) + 4, dtype=np.intp)
+    chosen[0] = a = start
+    for i in range(len(sizes)):
+        xs, ys = x[bounds[i]:bounds[i + 1]], y[bounds[i]:bounds[i + 1]]
+        area = np.abs((x[a] - x_mean[i + 1]) * (ys - y[a]) - (x[a] - xs) * (y_mean[i + 1] - y[a]))
+        a = chosen[i + 1] = bounds[i] + np.argmax(area)
+    chosen[-3] = stop - 1
+    chosen[-2] = start + np.argmin(y[start:stop])
+    chosen[-1] = start + np.argmax(y[start:stop])
+
+    return np.unique(chosen)
+
 ####################################################################################################
 #                                          Test / example code                                     #
 ####################################################################################################
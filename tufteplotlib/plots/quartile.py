@@ -1,12 +1,18 @@
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.ticker import FixedLocator, FuncFormatter
 from tufteplotlib.styles import apply_tufte_style
 from tufteplotlib.utils import _intermediate_ticks
+from tufteplotlib.binning import _group_sparse, _signed_log_linear_bounds, _signed_log_linear_index
+
+# Above this many categories, only some of them get a tick label
+_MAX_LABELLED_CATEGORIES = 100
 
 ####################################################################################################
 #                                         Core function                                            #
 ####################################################################################################
-def quartile_plot(categories, values, ax=None):
+def quartile_plot(categories, values, ax=None, median_ci=None, n_boot=1000, seed=0, workers=1):
     """
     Show the distribution of data across nominal categories. Illustrates the median, interquartile
     range, and outliers. Best used for dense data. If the data are sparse, consider using the
@@ -19,6 +25,16 @@ def quartile_plot(categories, values, ax=None):
     values : array-like
         Numeric values corresponding to each category.
     ax : Optional axis.
+    median_ci : float, optional
+        Confidence level (e.g. 0.95) of a percentile bootstrap interval for each category's
+        median, drawn as a grey bar behind the median dot. Default None (no interval).
+    n_boot : int, optional
+        Number of bootstrap resamples. Default 1000.
+    seed : int, optional
+        Seed for the resampling; each category has its own stream, so the intervals do not depend
+        on workers. Default 0.
+    workers : int, optional
+        Number of processes to spread the categories across. Default 1.
 
     Returns
     -------
@@ -37,64 +53,269 @@ def quartile_plot(categories, values, ax=None):
     if categories.shape[0] != values.shape[0]:
         raise ValueError("categories and values must have the same length")
 
-    unique_categories = list(dict.fromkeys(categories.tolist()))
-    n_cat = len(unique_categories)
-    cat_to_x = {cat: i for i, cat in enumerate(unique_categories)}
+    # Categories in order of first appearance
+    unique_categories, first, codes = np.unique(categories, return_index=True, return_inverse=True)
+    appearance = np.argsort(first)
+    rank = np.empty_like(appearance)
+    rank[appearance] = np.arange(len(appearance))
+    codes = rank[codes.ravel()]
+    unique_categories = unique_categories[appearance].tolist()
 
-    whisker_mins = []
-    whisker_maxs = []
-    all_outliers = []
+    sorted_codes, sorted_values, starts, counts = _sort_by_group(codes, values, len(unique_categories))
+    summary = _grouped_quartiles(sorted_codes, sorted_values, starts, counts)
 
-    bg_color = ax.get_facecolor()
+    ci = None
+    if median_ci is not None:
+        if not 0 < median_ci < 1:
+            raise ValueError(f"quartile_plot: median_ci must be between 0 and 1, got {median_ci!r}")
+        ci = _bootstrap_median_ci(sorted_values, starts, counts, median_ci, n_boot, seed, workers)
 
-    for cat in unique_categories:
-        mask = (categories == cat)
-        cat_vals = values[mask]
-        if cat_vals.size == 0:
-            continue
+    _draw_quartiles(ax, unique_categories, *summary, median_ci=ci)
 
-        q1, q2, q3 = np.percentile(cat_vals, [25, 50, 75])
-        iqr = q3 - q1
-        lower_fence = q1 - 1.5 * iqr
-        upper_fence = q3 + 1.5 * iqr
+    return fig, ax
+
+####################################################################################################
+#                                 Draw from precomputed summaries                                  #
+####################################################################################################
+def quartile_summary_plot(summaries, ax=None):
+    """
+    Draw a quartile plot directly from precomputed five-number summaries, one row per category
+    (e.g. the result of a SQL GROUP BY), instead of from raw values. The cost depends only on the
+    number of categories.
+
+    Parameters
+    ----------
+    summaries : mapping of columns, e.g. dict or pandas.DataFrame
+        Columns 'category', 'min', 'q1', 'median', 'q3' and 'max', and optionally 'outliers'
+        (a sequence of values for each row). 'min' and 'max' are the whisker ends; when
+        outliers are given they should be the extremes of the remaining values.
+    ax : Optional axis.
+
+    Returns
+    -------
+    fig : matplotlib.figure.Figure
+    ax : matplotlib.axes.Axes
+    """
+    missing = [column for column in ("category", "min", "q1", "median", "q3", "max")
+               if column not in summaries]
+    if missing:
+        raise ValueError(f"quartile_summary_plot: summaries are missing column(s) {missing}")
+
+    labels = list(summaries["category"])
+    lower, q1, median, q3, upper = (np.asarray(summaries[column], dtype=float)
+                                    for column in ("min", "q1", "median", "q3", "max"))
+
+    if not all(len(column) == len(labels) for column in (lower, q1, median, q3, upper)):
+        raise ValueError("quartile_summary_plot: all columns must have the same length")
+    if len(labels) == 0:
+        raise ValueError("quartile_summary_plot: summaries are empty")
+    if not (np.all(lower <= q1) and np.all(q1 <= median) and np.all(median <= q3) and np.all(q3 <= upper)):
+        raise ValueError("quartile_summary_plot: each row must satisfy min <= q1 <= median <= q3 <= max")
+
+    outlier_x, outlier_y = np.zeros(0, dtype=np.intp), np.zeros(0)
+    if "outliers" in summaries:
+        outliers = [np.atleast_1d(np.asarray(row if row is not None else [], dtype=float))
+                    for row in summaries["outliers"]]
+        if len(outliers) != len(labels):
+            raise ValueError("quartile_summary_plot: all columns must have the same length")
+        outlier_x = np.repeat(np.arange(len(labels)), [len(row) for row in outliers])
+        outlier_y = np.concatenate(outliers) if outliers else outlier_y
+
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(4*1.618, 4))
+    else:
+        fig = ax.figure
+
+    _draw_quartiles(ax, labels, lower, q1, median, q3, upper, outlier_x, outlier_y)
+
+    return fig, ax
+
+####################################################################################################
+#                               Sort-based per-category quartiles                                  #
+####################################################################################################
+def _sort_by_group(codes, values, n_groups):
+    """
+    Sort values into contiguous, sorted segments, one per group: the values are sorted, then
+    stably sorted by group (a radix sort on small integer codes). O(N log N) in total instead of
+    O(N * K) for a mask per group.
 
-        non_outliers = cat_vals[(cat_vals >= lower_fence) & (cat_vals <= upper_fence)]
-        whisker_min = non_outliers.min() if non_outliers.size > 0 else cat_vals.min()
-        whisker_max = non_outliers.max() if non_outliers.size > 0 else cat_vals.max()
+    Parameters:
+        codes    : 1D int array, group (0 to n_groups - 1) of each value; every group non-empty
+        values   : 1D array of values
+        n_groups : number of groups
 
-        whisker_mins.append(whisker_min)
-        whisker_maxs.append(whisker_max)
+    Returns:
+        sorted_codes, sorted_values : 1D arrays
+        starts, counts              : 1D arrays, offset and length of each group's segment
+    """
+    order = np.argsort(values, kind="stable")
+    order = order[np.argsort(codes[order].astype(np.min_scalar_type(n_groups - 1)), kind="stable")]
+
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    return codes[order], values[order], starts, counts
+
+def _grouped_quartiles(sorted_codes, sorted_values, starts, counts):
+    """
+    Quartiles, whiskers and outliers of every group at once, from values sorted by
+    _sort_by_group.
+
+    Percentiles are read at computed offsets into the sorted segments, interpolated with the same
+    two-branch formula as np.percentile (from the upper value when the fraction is at least 0.5)
+    so they round identically, and outliers beyond the 1.5 IQR fences are counted at each
+    end of the segments, which gives the whisker ends directly.
+
+    Parameters:
+        sorted_codes, sorted_values, starts, counts : as returned by _sort_by_group
+
+    Returns:
+        lower, q1, median, q3, upper : 1D arrays, one entry per group (lower and upper are the
+                                       whisker ends: the most extreme values inside the fences)
+        outlier_x, outlier_y        : 1D arrays, group and value of every outlier
+    """
+    n_groups = len(counts)
+
+    def percentile(q):
+        position = q / 100 * (counts - 1)
+        below = np.floor(position).astype(np.intp)
+        above = np.minimum(below + 1, counts - 1)
+        low, high = sorted_values[starts + below], sorted_values[starts + above]
+        fraction, diff = position - below, high - low
+        return np.where(fraction >= 0.5, high - diff * (1 - fraction), low + diff * fraction)
+
+    q1, median, q3 = percentile(25), percentile(50), percentile(75)
+    iqr = q3 - q1
+    lower_fence = q1 - 1.5 * iqr
+    upper_fence = q3 + 1.5 * iqr
+
+    is_low = sorted_values < lower_fence[sorted_codes]
+    is_high = sorted_values > upper_fence[sorted_codes]
+    n_low = np.bincount(sorted_codes[is_low], minlength=n_groups)
+    n_high = np.bincount(sorted_codes[is_high], minlength=n_groups)
+
+    # Whiskers end at the first and last values inside the fences (min and max if there are none)
+    all_outside = n_low + n_high >= counts
+    n_low[all_outside] = 0
+    n_high[all_outside] = 0
+    lower = sorted_values[starts + n_low]
+    upper = sorted_values[starts + counts - 1 - n_high]
+
+    outlier = is_low | is_high
+
+    return lower, q1, median, q3, upper, sorted_codes[outlier], sorted_values[outlier]
+
+####################################################################################################
+#                          Bootstrap confidence intervals for the medians                          #
+####################################################################################################
+# Largest bootstrap index matrix (resamples x group size) held in memory at once
+_BOOTSTRAP_CELLS = 1 << 22
+
+def _bootstrap_median_ci(sorted_values, starts, counts, confidence, n_boot=1000, seed=0, workers=1):
+    """
+    Percentile bootstrap confidence interval for the median of every group.
+
+    Each group's segment is sorted, so the median of a resample is the value at the median of
+    the resampled indices: each batch of resamples is drawn as an index matrix, reduced with
+    np.partition along its rows, and only then mapped to values. Batches hold at most
+    _BOOTSTRAP_CELLS indices, so memory is bounded whatever the group size. Every group draws from
+    its own np.random.Generator seeded with (seed, group), so results do not depend on workers.
+
+    Parameters:
+        sorted_values, starts, counts : as returned by _sort_by_group
+        confidence                    : confidence level, e.g. 0.95
+        n_boot                        : number of resamples
+        seed                          : seed for the resampling
+        workers                       : number of processes to spread the groups across
+
+    Returns:
+        low, high : 1D arrays, interval ends for each group
+    """
+    tasks = [(sorted_values[start:start + count], confidence, n_boot, (seed, group))
+             for group, (start, count) in enumerate(zip(starts, counts))]
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            intervals = list(pool.map(_median_ci, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+    else:
+        intervals = [_median_ci(task) for task in tasks]
+
+    low, high = np.array(intervals).T
+
+    return low, high
+
+def _median_ci(task):
+    """Bootstrap interval for the median of one sorted group (see _bootstrap_median_ci)."""
+    segment, confidence, n_boot, seed = task
+    n = len(segment)
+    rng = np.random.default_rng(seed)
+
+    middle = [(n - 1) // 2, n // 2]                                                                 # equal for odd n
+    dtype = np.int32 if n < 2**31 else np.int64
+    batch = max(1, _BOOTSTRAP_CELLS // n)
+
+    medians = np.empty(n_boot)
+    for start in range(0, n_boot, batch):
+        size = min(batch, n_boot - start)
+        index = rng.integers(0, n, (size, n), dtype=dtype)
+        index.partition(middle, axis=1)
+        medians[start:start + size] = 0.5 * (segment[index[:, middle[0]]] + segment[index[:, middle[1]]])
+
+    return np.quantile(medians, [(1 - confidence) / 2, (1 + confidence) / 2])
+
+####################################################################################################
+#                                  Draw the quartile glyphs                                        #
+####################################################################################################
+def _draw_quartiles(ax, labels, lower, q1, median, q3, upper, outlier_x, outlier_y, median_ci=None):
+    """
+    Draw Tufte quartile glyphs for every category: a whisker line from lower to upper, broken by
+    a gap (in the background colour) over the interquartile range, a dot at the median, and small
+    dots for the outliers. Each element is drawn as one collection for all categories.
 
-        outliers = cat_vals[(cat_vals < lower_fence) | (cat_vals > upper_fence)]
-        if outliers.size > 0:
-            all_outliers.append(outliers)
+    Parameters:
+        ax                   : matplotlib axes to draw on
+        labels               : category labels, one per glyph, drawn at x = 0, 1, ...
+        lower, q1, median,
+        q3, upper            : 1D arrays, one entry per category
+        outlier_x, outlier_y : 1D arrays, category position and value of every outlier
+        median_ci            : optional (low, high) arrays, drawn as a grey bar behind each
+                               median dot
+    """
+    n_cat = len(labels)
+    x = np.arange(n_cat)
+    bg_color = ax.get_facecolor()
 
-        x = cat_to_x[cat]
+    # whiskers
+    ax.vlines(x, lower, upper, color='black', linewidth=1.0, zorder=1)
 
-        # whiskers
-        ax.vlines(x, whisker_min, whisker_max, color='black', linewidth=1.0, zorder=1)
+    # mask IQR
+    ax.vlines(x, q1, q3, color=bg_color, linewidth=6.0, zorder=2)
 
-        # mask IQR
-        ax.vlines(x, q1, q3, color=bg_color, linewidth=6.0, zorder=2)
+    # median confidence interval
+    if median_ci is not None:
+        ax.vlines(x, median_ci[0], median_ci[1], color=[0.6, 0.6, 0.6], linewidth=3.0, zorder=2.5)
 
-        # median
-        ax.scatter([x], [q2], s=36, color='black', zorder=3)
+    # median
+    ax.scatter(x, median, s=36, color='black', zorder=3)
 
-        # outliers
-        if outliers.size > 0:
-            ax.scatter(np.full(outliers.shape, x), outliers, s=1, color='black', zorder=4)
+    # outliers
+    if len(outlier_y) > 0:
+        ax.scatter(outlier_x, outlier_y, s=1, color='black', zorder=4)
 
-    # X-axis
-    ax.set_xticks(range(n_cat))
-    ax.set_xticklabels(unique_categories)
+    # X-axis; with many categories only a subset is labelled, as a tick object per category would
+    # dominate the drawing time (and the labels would overlap anyway)
+    if n_cat <= _MAX_LABELLED_CATEGORIES:
+        ax.set_xticks(range(n_cat))
+        ax.set_xticklabels(labels)
+    else:
+        ax.xaxis.set_major_locator(FixedLocator(x, nbins=_MAX_LABELLED_CATEGORIES // 4))
+        ax.xaxis.set_major_formatter(FuncFormatter(lambda value, pos: labels[int(round(value))]))
     ax.set_xlim(-0.5, n_cat - 0.5)
 
     # Y-axis including outliers
-    if len(whisker_mins) == 0:
-        ymin, ymax = values.min(), values.max()
-    else:
-        ymin = min(min(whisker_mins), *(o.min() for o in all_outliers)) if all_outliers else min(whisker_mins)
-        ymax = max(max(whisker_maxs), *(o.max() for o in all_outliers)) if all_outliers else max(whisker_maxs)
+    ymin, ymax = np.min(lower), np.max(upper)
+    if len(outlier_y) > 0:
+        ymin, ymax = min(ymin, np.min(outlier_y)), max(ymax, np.max(outlier_y))
 
     y_range = ymax - ymin if ymax > ymin else 1.0
     pad = 0.02 * y_range
@@ -109,7 +330,249 @@ def quartile_plot(categories, values, ax=None):
     ax.spines['left'].set_visible(False)
     ax.spines['bottom'].set_visible(False)
 
-    return fig, ax
+####################################################################################################
+#                         Streaming, mergeable per-category quantile sketches                      #
+####################################################################################################
+class QuartileAccumulator:
+    """
+    Build a quartile plot incrementally, for data that arrive in chunks or are spread across many
+    files or processes. Memory is bounded by the number of categories and the dynamic range of
+    the values, not the row count.
+
+    Each category keeps a sparse quantile sketch of its values: counts in log-linear buckets
+    (as in LogHistogramAccumulator, mirrored for negative values), each at most a fraction
+    precision of its magnitude wide. Bucketing is O(1) per value and sketches merge by adding
+    counts, so results do not depend on how the data were chunked or split.
+
+    Error bound: each quartile is taken from the bucket holding the exact order statistic, so it
+    is within a relative error of precision of the exact value (an absolute error of lowest for
+    values closer to zero than lowest). The fences inherit this error.
+
+    The reservoir smallest and largest values of each category are kept exactly, for the
+    whisker ends and outliers. If a category has more than reservoir outliers on one side, only
+    the reservoir most extreme of them are drawn, and its whisker ends at the fence.
+
+    Parameters
+    ----------
+    precision : float
+        Maximum relative bucket width, rounded down to a power of two. Default 0.01.
+    lowest : float
+        Magnitude below which values share a single bucket around zero. Default 1e-9.
+    reservoir : int
+        Number of extreme values kept at each end of every category. Default 1000.
+
+    Example
+    -------
+    acc = QuartileAccumulator()
+    for categories, values in chunks:
+        acc.update(categories, values)
+    fig, ax = acc.render()
+    """
+
+    def __init__(self, precision=0.01, lowest=1e-9, reservoir=1000):
+        if not 0 < precision < 1:
+            raise ValueError(f"QuartileAccumulator: precision must be in (0, 1), got {precision!r}")
+        if not lowest > 0:
+            raise ValueError(f"QuartileAccumulator: lowest must be positive, got {lowest!r}")
+
+        self.lowest = float(lowest)
+        self.sub_buckets = 1 << int(np.ceil(np.log2(1 / precision)))
+        self.precision = 1 / self.sub_buckets
+        self.reservoir = int(reservoir)
+
+        self.categories = []
+        self._codes = {}
+
+        # Sparse sketch: sorted keys, category * _stride + signed bucket key + _offset, and counts
+        self._offset = 2048 * self.sub_buckets                                                      # covers all float64
+        self._stride = 2 * self._offset + 1
+        self._sketch = {"index": np.zeros(0, dtype=np.int64), "count": np.zeros(0, dtype=np.int64)}
+
+        # Extreme values of each category, as (codes, values)
+        self._low = (np.zeros(0, dtype=np.intp), np.zeros(0))
+        self._high = (np.zeros(0, dtype=np.intp), np.zeros(0))
+
+    def _encode(self, categories):
+        """Map category labels to codes, in order of first appearance across all updates."""
+        labels, first, inverse = np.unique(categories, return_index=True, return_inverse=True)
+        for label in labels[np.argsort(first)].tolist():
+            if label not in self._codes:
+                self._codes[label] = len(self.categories)
+                self.categories.append(label)
+
+        return np.array([self._codes[label] for label in labels.tolist()], dtype=np.intp)[inverse.ravel()]
+
+    def update(self, categories, values):
+        """
+        Add a chunk of (category, value) pairs. NaNs are ignored.
+
+        Returns
+        -------
+        self : QuartileAccumulator
+        """
+        categories = np.asarray(categories)
+        values = np.asarray(values, dtype=float)
+        if categories.shape[0] != values.shape[0]:
+            raise ValueError("QuartileAccumulator.update: categories and values must have the same length")
+
+        keep = ~np.isnan(values)
+        categories, values = categories[keep], values[keep]
+        if values.size == 0:
+            return self
+
+        codes = self._encode(categories)
+        keys = _signed_log_linear_index(values, self.lowest, self.sub_buckets)
+        index, counts = np.unique(codes * self._stride + keys + self._offset, return_counts=True)
+
+        self._add(index, counts, (codes, values), (codes, values))
+
+        return self
+
+    def merge(self, other):
+        """
+        Combine another accumulator with the same precision and lowest into this one (e.g. one
+        built per file or per process). Categories are matched by label.
+
+        Returns
+        -------
+        self : QuartileAccumulator
+        """
+        if self.sub_buckets != other.sub_buckets or self.lowest != other.lowest:
+            raise ValueError("QuartileAccumulator.merge: accumulators must have identical buckets")
+
+        if not other.categories:
+            return self
+
+        remap = self._encode(np.array(other.categories))                                             # other's code -> ours
+        index = other._sketch["index"]
+        index = remap[index // other._stride] * self._stride + index % other._stride
+
+        self._add(index, other._sketch["count"],
+                  (remap[other._low[0]], other._low[1]), (remap[other._high[0]], other._high[1]))
+
+        return self
+
+    def _add(self, index, counts, low, high):
+        """Fold sparse sketch counts and candidate extreme values into this accumulator."""
+        self._sketch = _group_sparse(np.concatenate([self._sketch["index"], index]),
+                                     {"count": np.concatenate([self._sketch["count"], counts])})
+
+        codes = np.concatenate([self._low[0], low[0]])
+        self._low = _extremes(codes, np.concatenate([self._low[1], low[1]]), self.reservoir, "low")
+        codes = np.concatenate([self._high[0], high[0]])
+        self._high = _extremes(codes, np.concatenate([self._high[1], high[1]]), self.reservoir, "high")
+
+    def quantile(self, q):
+        """
+        Approximate q-th percentile (0 to 100) of each category, in order of first appearance,
+        within the error bound above.
+        """
+        n_cat = len(self.categories)
+        if n_cat == 0:
+            return np.zeros(0)
+
+        codes = self._sketch["index"] // self._stride
+        keys = self._sketch["index"] % self._stride - self._offset
+        counts = self._sketch["count"]
+
+        n = np.bincount(codes, weights=counts, minlength=n_cat)
+        cumulative = np.cumsum(counts)
+        before = np.concatenate([[0], np.cumsum(n)[:-1]])
+
+        # Bucket holding the order statistic at (0-based) rank q / 100 * (n - 1) of each category
+        rank = before + q / 100 * (n - 1)
+        k = np.searchsorted(cumulative, rank, side="right")
+        fraction = (rank - (cumulative[k] - counts[k]) + 0.5) / counts[k]
+
+        lower, upper = _signed_log_linear_bounds(keys[k], self.lowest, self.sub_buckets)
+        value = lower + np.clip(fraction, 0, 1) * (upper - lower)
+
+        return np.clip(value, self._extreme(self._low, np.min), self._extreme(self._high, np.max))
+
+    def _extreme(self, reservoir, how):
+        """Smallest (np.min) or largest (np.max) kept value of each category."""
+        result = np.full(len(self.categories), np.inf if how is np.min else -np.inf)
+        (np.minimum if how is np.min else np.maximum).at(result, reservoir[0], reservoir[1])
+        return result
+
+    def summaries(self):
+        """
+        Quartile plot statistics of every category, in order of first appearance.
+
+        Returns
+        -------
+        lower, q1, median, q3, upper : 1D arrays
+            Whisker ends (the most extreme values inside the 1.5 IQR fences) and quartiles.
+        outlier_x, outlier_y : 1D arrays
+            Category position and value of each outlier kept in the reservoir.
+        """
+        q1, median, q3 = self.quantile(25), self.quantile(50), self.quantile(75)
+        iqr = q3 - q1
+        lower_fence = q1 - 1.5 * iqr
+        upper_fence = q3 + 1.5 * iqr
+
+        low_codes, low_values = self._low
+        high_codes, high_values = self._high
+        low_out = low_values < lower_fence[low_codes]
+        high_out = high_values > upper_fence[high_codes]
+
+        # Whiskers: the most extreme kept values inside the fences, else (every kept value is an
+        # outlier) the fences themselves
+        lower = np.full(len(self.categories), np.inf)
+        np.minimum.at(lower, low_codes[~low_out], low_values[~low_out])
+        lower = np.where(np.isfinite(lower), lower, lower_fence)
+
+        upper = np.full(len(self.categories), -np.inf)
+        np.maximum.at(upper, high_codes[~high_out], high_values[~high_out])
+        upper = np.where(np.isfinite(upper), upper, upper_fence)
+
+        outlier_x = np.concatenate([low_codes[low_out], high_codes[high_out]])
+        outlier_y = np.concatenate([low_values[low_out], high_values[high_out]])
+
+        return lower, q1, median, q3, upper, outlier_x, outlier_y
+
+    def render(self, ax=None):
+        """
+        Draw the quartile plot, as quartile_plot does.
+
+        Returns
+        -------
+        fig : matplotlib.figure.Figure
+        ax : matplotlib.axes.Axes
+        """
+        if not self.categories:
+            raise ValueError("QuartileAccumulator.render: no data have been added")
+
+        if ax is None:
+            fig, ax = plt.subplots(figsize=(4*1.618, 4))
+        else:
+            fig = ax.figure
+
+        _draw_quartiles(ax, self.categories, *self.summaries())
+
+        return fig, ax
+
+
+def _extremes(codes, values, k, end):
+    """
+    Keep the k smallest (end="low") or largest (end="high") values of each group.
+
+    Returns:
+        (codes, values) of the kept values
+    """
+    if len(values) == 0:
+        return codes, values
+
+    order = np.argsort(values if end == "low" else -values, kind="stable")
+    order = order[np.argsort(codes[order], kind="stable")]
+    sorted_codes = codes[order]
+
+    starts = np.flatnonzero(np.concatenate([[True], np.diff(sorted_codes) != 0]))
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.append(starts, len(order))))
+    keep = order[rank < k]
+
+    return codes[keep], values[keep]
+
 
 ####################################################################################################
 #                                          Test / example code                                     #
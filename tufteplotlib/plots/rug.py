@@ -1,11 +1,14 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.transforms import Affine2D, Bbox, ScaledTranslation, TransformedBbox, blended_transform_factory
 from tufteplotlib.styles import apply_tufte_style
+from tufteplotlib.plots.scatter import _draw_density_contours, _subsample
 
 ####################################################################################################
 #                                         Core function                                            #
 ####################################################################################################
-def rug_plot(x, y, ax=None):
+def rug_plot(x, y, ax=None, contours=None, collapse=True, max_points=None, seed=0):
     """
     A scatter plot, with a rug plot on each axis to illustrate the marginal distributions.
 
@@ -14,6 +17,18 @@ def rug_plot(x, y, ax=None):
     x, y : array-like
         Coordinates of the rug ticks.
     ax : Optional axis.
+    contours : int, optional
+        Overlay this many density contours from a 2D kernel density estimate (see scatter_plot).
+        Default None.
+    collapse : bool, optional
+        Draw each distinct value once in the rugs. The marks are opaque, so this does not change
+        the picture, only the number of lines drawn. Default True.
+    max_points : int, optional
+        Draw at most this many points (and rug marks), sampled as in scatter_plot, always
+        including the extreme points. The fraction drawn is stored as ax.sampling_ratio.
+        Default None (draw all points).
+    seed : int, optional
+        Seed for the max_points sample. Default 0.
 
     Returns
     -------
@@ -28,9 +43,14 @@ def rug_plot(x, y, ax=None):
 
     x = np.asarray(x)
     y = np.asarray(y)
+    x_drawn, y_drawn, ax.sampling_ratio = _subsample(x, y, max_points, seed, "rug_plot")
 
     # Scatter points
-    ax.scatter(x, y, color='black', alpha=1.0)
+    ax.scatter(x_drawn, y_drawn, color='black', alpha=1.0)
+
+    # Optional density contours
+    if contours:
+        _draw_density_contours(ax, x, y, contours)
 
     # Compute min/max
     xmin, xmax = x.min(), x.max()
@@ -50,26 +70,73 @@ def rug_plot(x, y, ax=None):
     for spine in ax.spines.values():
         spine.set_visible(False)
 
-    # Barcode-style ticks
-    ax.set_xticks(x)
-    ax.set_yticks(y)
-    ax.set_xticklabels([''] * len(x))
-    ax.set_yticklabels([''] * len(y))
-    ax.tick_params(axis='x', length=10.0, width=1.0, colors='black')
-    ax.tick_params(axis='y', length=10.0, width=1.0, colors='black')
-
-    # Optional min/median/max labels
-    for val, axis in zip([xmin, np.median(x), xmax], ['x', 'x', 'x']):
-        nearest = x[np.argmin(np.abs(x - val))]
-        ax.text(nearest, ymin - 0.12*y_range, f"{val:.2f}",
-                ha='center', va='top', fontsize=10, color='black')
-    for val in [ymin, np.median(y), ymax]:
-        nearest = y[np.argmin(np.abs(y - val))]
-        ax.text(xmin - 0.08*x_range, nearest, f"{val:.2f}",
-                ha='right', va='center', fontsize=10, color='black')
+    # Rugs along the bottom and left edges, outside the axes
+    _draw_rug(ax, x_drawn, 'x', collapse)
+    _draw_rug(ax, y_drawn, 'y', collapse)
+
+    # Min/median/max labels, clear of the rugs
+    x_ticks = [xmin, np.median(x), xmax]
+    y_ticks = [ymin, np.median(y), ymax]
+    ax.set_xticks(x_ticks)
+    ax.set_yticks(y_ticks)
+    ax.set_xticklabels([f"{t:.2f}" for t in x_ticks], fontsize=10)
+    ax.set_yticklabels([f"{t:.2f}" for t in y_ticks], fontsize=10)
+    ax.tick_params(axis='both', length=0, pad=_RUG_LENGTH + 4, colors='black')
 
     return fig, ax
 
+####################################################################################################
+#                                           Draw a rug                                             #
+####################################################################################################
+# Length of the rug marks, in points
+_RUG_LENGTH = 10.0
+
+def _draw_rug(ax, values, axis, collapse=True):
+    """
+    Draw one mark per value outside the bottom ('x') or left ('y') edge of the axes, as a single
+    LineCollection.
+
+    The marks are positioned in data coordinates along the axis, and measured in points out from
+    the edge of the axes, so they keep their length through resizing and zooming like axis ticks,
+    without one Tick object per value. They are clipped to the strip beside the axes, so marks
+    outside the view limits are hidden, as ticks would be.
+
+    Parameters:
+        ax       : matplotlib axes
+        values   : 1D array of values
+        axis     : 'x' or 'y'
+        collapse : draw each distinct value once
+
+    Returns:
+        The LineCollection.
+    """
+    if collapse:
+        values = np.unique(values)
+
+    # Points measured from the lower-left corner of the axes
+    points = Affine2D().scale(1 / 72) + ax.figure.dpi_scale_trans + ScaledTranslation(0, 0, ax.transAxes)
+
+    segments = np.zeros((len(values), 2, 2))
+    if axis == 'x':
+        segments[:, :, 0] = values[:, None]
+        segments[:, 1, 1] = -_RUG_LENGTH
+        transform = blended_transform_factory(ax.transData, points)
+        strip = TransformedBbox(Bbox([[0, -_RUG_LENGTH - 1], [1, 0]]),
+                                blended_transform_factory(ax.transAxes, points))
+    else:
+        segments[:, :, 1] = values[:, None]
+        segments[:, 1, 0] = -_RUG_LENGTH
+        transform = blended_transform_factory(points, ax.transData)
+        strip = TransformedBbox(Bbox([[-_RUG_LENGTH - 1, 0], [0, 1]]),
+                                blended_transform_factory(points, ax.transAxes))
+
+    rug = LineCollection(segments, colors='black', linewidths=1.0, transform=transform)
+    ax.add_collection(rug, autolim=False)
+    rug.set_clip_path(None)                                                                         # not the axes patch
+    rug.set_clip_box(strip)
+
+    return rug
+
 ####################################################################################################
 #                                          Test / example code                                     #
 ####################################################################################################
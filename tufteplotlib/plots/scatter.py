@@ -1,13 +1,27 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
 from tufteplotlib.styles import apply_tufte_style
 from tufteplotlib.utils import _intermediate_ticks
+from tufteplotlib.kde import _binned_kde_2d
+from tufteplotlib.binning import (_BLOCK_SIZE, _stratified_sample, _uniform_counts, _uniform_counts_2d,
+                                  _uniform_index)
+
+# Number of points above which scatter_plot draws a raster instead of one marker per point
+_RASTER_THRESHOLD = 1_000_000
+
+# Marker radius, in pixels, above which the raster footprint is summed by FFT convolution
+_DISC_FFT_RADIUS = 4
+
+# Number of x bins the smoother is fitted over
+_SMOOTHER_BINS = 200
 
 ####################################################################################################
 #                                         Core function                                            #
 ####################################################################################################
 def scatter_plot(x, y, ax=None, color='black', edgecolor='none',
-                 linewidth=0.0, alpha=1.0, dot_size=20):
+                 linewidth=0.0, alpha=1.0, dot_size=20, contours=None, raster=None,
+                 max_points=None, seed=0, smoother=None):
     """
     Plot individual observations between 2 data sets.
 
@@ -26,12 +40,36 @@ def scatter_plot(x, y, ax=None, color='black', edgecolor='none',
         Opacity of the points, between 0 and 1. Default 1.0.
     dot_size : float, optional
         Marker size (the 's' parameter in scatter). Default 20.
+    contours : int, optional
+        Overlay this many density contours, from a 2D kernel density estimate computed on a grid
+        by FFT, so it stays fast at millions of points. Default None (no contours).
+    raster : bool, optional
+        Draw the points as an image at the resolution of the axes instead of one marker each: the
+        points are counted per pixel, spread over the marker's footprint, and composited with the
+        given alpha, so time and memory no longer grow with the number of markers drawn. The
+        marker edges are not drawn, and the image does not re-render when zoomed. Default None
+        (raster above 1,000,000 points).
+    max_points : int, optional
+        Draw at most this many points, sampled evenly over the plane so that sparse regions and
+        outliers are kept, always including the extreme points that bound the spines. The
+        fraction of points drawn is stored as ax.sampling_ratio. Default None (draw all points).
+    seed : int, optional
+        Seed for the max_points sample. Default 0.
+    smoother : float or bool, optional
+        Overlay a LOWESS trend line, with this span (the fraction of the points each local
+        regression uses, between 0 and 1; True for 2/3). It is fitted to the means of the points
+        in 200 bins along x, so it stays fast at millions of points and matches exact LOWESS
+        when there are fewer distinct x values than bins. Default None (no trend line).
 
     Returns
     -------
     fig : matplotlib.figure.Figure
     ax : matplotlib.axes.Axes
     """
+    if smoother is not None and smoother is not False:
+        span = 2 / 3 if smoother is True else smoother
+        if not 0 < span <= 1:
+            raise ValueError(f"scatter_plot: smoother span must be between 0 and 1, got {smoother!r}")
 
     if ax is None:
         fig, ax = plt.subplots(figsize=(4*1.618, 4))
@@ -39,15 +77,9 @@ def scatter_plot(x, y, ax=None, color='black', edgecolor='none',
         fig = ax.figure
     x = np.asarray(x)
     y = np.asarray(y)
-    # Plot scatter points
-    ax.scatter(
-        x, y,
-        color=color,
-        edgecolor=edgecolor,
-        linewidth=linewidth,
-        s=dot_size,
-        alpha=alpha,
-    )
+    x_drawn, y_drawn, ax.sampling_ratio = _subsample(x, y, max_points, seed, "scatter_plot")
+    if raster is None:
+        raster = len(x_drawn) > _RASTER_THRESHOLD
     # Compute exact min/max
     xmin, xmax = x.min(), x.max()
     ymin, ymax = y.min(), y.max()
@@ -56,6 +88,24 @@ def scatter_plot(x, y, ax=None, color='black', edgecolor='none',
     margin = 0.05
     ax.set_xlim(xmin - margin * x_range, xmax + margin * x_range)
     ax.set_ylim(ymin - margin * y_range, ymax + margin * y_range)
+    # Plot scatter points
+    if raster:
+        _draw_scatter_raster(ax, x_drawn, y_drawn, color=color, alpha=alpha, dot_size=dot_size)
+    else:
+        ax.scatter(
+            x_drawn, y_drawn,
+            color=color,
+            edgecolor=edgecolor,
+            linewidth=linewidth,
+            s=dot_size,
+            alpha=alpha,
+        )
+    # Optional density contours over the points
+    if contours:
+        _draw_density_contours(ax, x, y, contours)
+    # Optional trend line
+    if smoother is not None and smoother is not False:
+        ax.plot(*_binned_lowess(x, y, span), color=[0.4, 0.4, 0.4], linewidth=1.0, zorder=3)
     # Apply Tufte minimal style
     apply_tufte_style(ax)
     # Force spines to exactly match true min/max
@@ -66,6 +116,228 @@ def scatter_plot(x, y, ax=None, color='black', edgecolor='none',
     ax.set_yticks(_intermediate_ticks(ymin, ymax, max_ticks=5))
     return fig, ax
 
+####################################################################################################
+#                                   Subsample points for drawing                                   #
+####################################################################################################
+def _subsample(x, y, max_points, seed, caller):
+    """
+    The points to draw: all of them, or a stratified sample of at most max_points that keeps the
+    extreme points (see binning._stratified_sample).
+
+    Parameters:
+        x, y       : 1D arrays of coordinates
+        max_points : maximum number of points, or None for all of them
+        seed       : seed for the sample
+        caller     : name of the plotting function, for error messages
+
+    Returns:
+        x, y  : 1D arrays of the points to draw
+        ratio : fraction of the points drawn
+    """
+    if max_points is None or len(x) <= max_points:
+        return x, y, 1.0
+
+    if max_points < 4:
+        raise ValueError(f"{caller}: max_points must be at least 4, to keep the extreme points, "
+                         f"got {max_points!r}")
+
+    index = _stratified_sample(x, y, int(max_points), seed)
+
+    return x[index], y[index], len(index) / len(x)
+
+####################################################################################################
+#                                  Raster of many scatter points                                   #
+####################################################################################################
+def _draw_scatter_raster(ax, x, y, color='black', alpha=1.0, dot_size=20):
+    """
+    Draw scatter points as one image covering the axes, one image pixel per screen pixel.
+
+    The points are counted per pixel (_uniform_counts_2d), and the counts are summed over a disc
+    the size of a marker, giving the number of markers n that would cover each pixel (fractional
+    at the antialiased edge of the disc). The pixel is then given the colour at opacity
+    1 - (1 - alpha)^n, as if the n markers were drawn over each other.
+
+    Parameters:
+        ax       : matplotlib axes, with its limits already set
+        x, y     : 1D arrays of point coordinates
+        color    : marker colour
+        alpha    : marker opacity
+        dot_size : marker area in points^2, as the 's' parameter of scatter
+
+    Returns:
+        matplotlib.image.AxesImage
+    """
+    bbox = ax.get_window_extent()
+    nx, ny = max(1, int(round(bbox.width))), max(1, int(round(bbox.height)))
+    x_lim, y_lim = ax.get_xlim(), ax.get_ylim()
+
+    counts = _uniform_counts_2d(x, y, x_lim, y_lim, nx, ny)
+
+    radius = 0.5 * np.sqrt(dot_size) * ax.figure.dpi / 72                                          # in pixels
+    covered = _disc_sum(counts, radius)
+
+    image = np.empty((ny, nx, 4))
+    image[...] = to_rgba(color)
+    image[..., 3] = 1 - (1 - alpha) ** covered if alpha < 1 else np.minimum(covered, 1)
+
+    return ax.imshow(image, extent=(*x_lim, *y_lim), origin='lower', aspect='auto',
+                     interpolation='nearest', zorder=2)
+
+def _disc_sum(grid, radius):
+    """
+    Sum of a 2D grid over a disc of the given radius (in cells) around every cell. Cells on the
+    edge of the disc are weighted by roughly the fraction of them it covers, which antialiases the
+    edge.
+
+    Small discs add a shifted copy of the grid per cell offset within the disc, in
+    O(radius^2 * cells); larger ones (radius above _DISC_FFT_RADIUS) convolve by FFT, in
+    O(cells log cells) whatever the radius.
+    """
+    r = int(np.ceil(radius))
+    offsets = np.arange(-r, r + 1)
+    kernel = np.clip(radius + 0.5 - np.hypot(*np.meshgrid(offsets, offsets)), 0, 1)
+    ny, nx = grid.shape
+
+    if r > _DISC_FFT_RADIUS:
+        shape = (ny + 2 * r, nx + 2 * r)
+        total = np.fft.irfft2(np.fft.rfft2(grid, shape) * np.fft.rfft2(kernel, shape), shape)
+        total = total[r:r + ny, r:r + nx]
+        total[total < 1e-6] = 0                                                                     # FFT round-off
+        return total
+
+    padded = np.pad(grid.astype(np.float64), r)
+    total = np.zeros(grid.shape)
+    for dy, dx in zip(*np.nonzero(kernel)):
+        total += kernel[dy, dx] * padded[dy:dy + ny, dx:dx + nx]
+
+    return total
+
+####################################################################################################
+#                                      LOWESS over binned x                                        #
+####################################################################################################
+def _binned_lowess(x, y, span=2/3, n_bins=_SMOOTHER_BINS, iterations=3, sample_size=100_000, seed=0):
+    """
+    LOWESS (locally weighted linear regression with tricube weights and bisquare robustness
+    iterations, Cleveland 1979) evaluated at the mean x of each of n_bins equal-width x bins, with
+    the points of each bin replaced by their (robustness-weighted) mean.
+
+    The neighbourhoods count points rather than bins, and robustness weights are computed per
+    point, from its residual to the fit at its bin, with the residual scale (6 x median) taken
+    from a random sample of the points. Each iteration is one O(N) pass over blocks of the
+    points; the regressions are O(B^2) on the B non-empty bins, independent of N. With at most
+    one distinct x per bin (and N <= sample_size) this is exact LOWESS.
+
+    Parameters:
+        x, y        : 1D arrays of point coordinates
+        span        : fraction of the points in each local regression
+        n_bins      : number of x bins
+        iterations  : number of robustness iterations
+        sample_size : number of points sampled for the residual scale
+        seed        : seed for the sample
+
+    Returns:
+        x_fit, y_fit : 1D arrays, the bin means of x and the smoothed y there
+    """
+    lo, hi = x.min(), x.max()
+    if hi == lo:
+        return np.array([lo]), np.array([y.mean()])
+
+    scale, edges = n_bins / (hi - lo), np.linspace(lo, hi, n_bins + 1)
+    def bin_of(values):
+        return _uniform_index(values, lo, scale, edges)                                             # as _uniform_counts
+
+    counts = _uniform_counts(x, lo, hi, n_bins)
+    occupied = np.flatnonzero(counts)
+    n = counts[occupied].astype(np.float64)
+    x_fit = _uniform_counts(x, lo, hi, n_bins, weights=x)[occupied] / n
+    weight, x_mean, y_mean = n, x_fit, _uniform_counts(x, lo, hi, n_bins, weights=y)[occupied] / n
+
+    # Bandwidth at each bin: distance to the bin holding the k-th nearest point
+    distance = np.abs(x_fit[None, :] - x_fit[:, None])
+    order = np.argsort(distance, axis=1, kind="stable")
+    nearest = np.argmax(np.cumsum(n[order], axis=1) >= int(span * len(x) + 1e-10), axis=1)
+    bandwidth = np.take_along_axis(distance, order[np.arange(len(x_fit)), nearest][:, None], axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaled = np.where(bandwidth > 0, distance / bandwidth, np.where(distance > 0, 1.0, 0.0))
+    tricube = np.clip(1 - scaled**3, 0, 1)**3
+
+    if len(x) <= sample_size:
+        sample = np.arange(len(x))
+    else:
+        sample = np.sort(np.random.default_rng(seed).integers(0, len(x), sample_size))
+
+    for iteration in range(iterations + 1):
+        y_fit = _local_linear(x_fit, x_mean, y_mean, tricube * weight)
+        if iteration == iterations:
+            break
+
+        fit = np.zeros(n_bins)
+        fit[occupied] = y_fit
+        residual_scale = 6 * np.median(np.abs(y[sample] - fit[bin_of(x[sample])]))
+        if residual_scale == 0:
+            break
+
+        # Robustness-weighted sums per bin, one block of points at a time
+        sums = np.zeros((3, n_bins))
+        for start in range(0, len(x), _BLOCK_SIZE):
+            xb, yb = x[start:start + _BLOCK_SIZE], y[start:start + _BLOCK_SIZE]
+            index = bin_of(xb)
+            robustness = np.clip(1 - ((yb - fit[index]) / residual_scale)**2, 0, 1)**2
+            sums[0] += np.bincount(index, robustness, n_bins)
+            sums[1] += np.bincount(index, robustness * xb, n_bins)
+            sums[2] += np.bincount(index, robustness * yb, n_bins)
+
+        weight = sums[0, occupied]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_mean = np.where(weight > 0, sums[1, occupied] / weight, x_fit)
+            y_mean = np.where(weight > 0, sums[2, occupied] / weight, 0.0)
+
+    return x_fit, y_fit
+
+def _local_linear(x_eval, x, y, weights):
+    """
+    Weighted least-squares line through (x, y), one per row of weights, evaluated at x_eval[i]
+    for row i. Rows whose weight sits at a single x (no slope) give the weighted mean of y.
+    """
+    dx = x[None, :] - x_eval[:, None]                                                              # centred on x_eval[i]
+    s0 = weights.sum(axis=1)
+    s1 = (weights * dx).sum(axis=1)
+    s2 = (weights * dx**2).sum(axis=1)
+    t0 = weights @ y
+    t1 = (weights * dx) @ y
+
+    determinant = s0 * s2 - s1**2
+    flat = determinant <= 1e-12 * s0 * s2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(flat, 0.0, (s0 * t1 - s1 * t0) / determinant)
+
+    return (t0 - slope * s1) / s0
+
+####################################################################################################
+#                                     Density contour overlay                                      #
+####################################################################################################
+def _draw_density_contours(ax, x, y, levels):
+    """
+    Draw thin grey contours of the 2D binned kernel density of (x, y) over a plot.
+
+    Parameters:
+        ax     : matplotlib axes to draw on
+        x, y   : 1D arrays of point coordinates
+        levels : number of contour levels, evenly spaced between zero and the peak density
+
+    Returns:
+        matplotlib.contour.QuadContourSet
+    """
+    if int(levels) < 1:
+        raise ValueError(f"contours must be a positive number of levels, got {levels!r}")
+
+    x_grid, y_grid, density = _binned_kde_2d(x, y)
+    heights = np.linspace(0, density.max(), int(levels) + 2)[1:-1]                                  # skip zero and the peak
+
+    return ax.contour(x_grid, y_grid, density, levels=heights, colors=[[0.4, 0.4, 0.4]],
+                      linewidths=0.75, zorder=3)
+
 ####################################################################################################
 #                                          Test / example code                                     #
 ####################################################################################################
@@ -1,12 +1,13 @@
 import matplotlib.pyplot as plt
 from tufteplotlib.styles import apply_tufte_style
 from tufteplotlib.utils import _intermediate_ticks
+from tufteplotlib.plots.line import _downsample_method, _decimate, _pixel_columns, _redecimate_on_xlim
 import numpy as np
 
 ####################################################################################################
 #                                         Core function                                            #
 ####################################################################################################
-def time_series(x, y, ax=None):
+def time_series(x, y, ax=None, downsample=None):
     """
     Show the change in a value across individual observations, or time. Best used for sparse data.
     For dense data, consider using a line plot.
@@ -17,6 +18,11 @@ def time_series(x, y, ax=None):
         Data points.
     ax : matplotlib.axes.Axes, optional
         Axes to draw on. If None, a new figure is created.
+    downsample : {'lttb', 'minmax'} or bool, optional
+        When there are more than 4 points per pixel column (and x is sorted), draw only a
+        decimation of them (see line_plot), chosen again from the full data whenever the x limits
+        change, and label the x axis with rounded ticks instead of one per point.
+        Default None ('lttb', which keeps about one point per pixel); False draws every point.
 
     Returns
     -------
@@ -31,12 +37,15 @@ def time_series(x, y, ax=None):
     else:
         fig = ax.figure
 
+    method = _downsample_method(ax, x, downsample, "lttb", "time_series")
+    index = _decimate(x, y, (x[0], x[-1]), _pixel_columns(ax), method) if method else slice(None)
+
     # Draw line
-    ax.plot(x, y, color='black', linewidth=1.0, alpha=1.0)
+    line, = ax.plot(x[index], y[index], color='black', linewidth=1.0, alpha=1.0)
 
     # Dots
-    ax.scatter(x, y, s=25, color='black', alpha=1.0, zorder=3)
-    ax.scatter(x, y, s=125, color='white', alpha=1.0, zorder=2)
+    dots = ax.scatter(x[index], y[index], s=25, color='black', alpha=1.0, zorder=3)
+    halos = ax.scatter(x[index], y[index], s=125, color='white', alpha=1.0, zorder=2)
 
     # Axis limits with margin
     xmin, xmax = x.min(), x.max()
@@ -50,8 +59,17 @@ def time_series(x, y, ax=None):
     for spine in ax.spines.values():
         spine.set_visible(False)
 
+    # Decimate again from the full data when zoomed or panned
+    if method:
+        def update(index):
+            line.set_data(x[index], y[index])
+            dots.set_offsets(np.column_stack([x[index], y[index]]))
+            halos.set_offsets(np.column_stack([x[index], y[index]]))
+
+        _redecimate_on_xlim(ax, x, y, method, update)
+
     # Ticks
-    ax.set_xticks(x)
+    ax.set_xticks(_intermediate_ticks(xmin, xmax, max_ticks=5) if method else x)
     ax.set_yticks(_intermediate_ticks(ymin, ymax, max_ticks=5, edge_fraction=0.1))
     ax.tick_params(axis='y', which='both', length=5, direction='out', color='black', width=1, pad=5)
     ax.tick_params(axis='x', which='both', length=5)
@@ -60,3 +60,66 @@ def _intermediate_ticks(min_val, max_val, max_ticks=5, tol=1e-03, edge_fraction=
     
     return ticks
 
+####################################################################################################
+#                       Ticks at whole powers of ten between min and max values                    #
+####################################################################################################
+def _log_ticks(min_val, max_val, max_ticks=5, edge_fraction=0.05):
+    """
+    Returns tick values for a logarithmic axis: exact min and max, plus interior ticks at powers
+    of ten (every 10^k decades if there are too many), as _intermediate_ticks does for linear
+    axes. Spans of less than a decade fall back to _intermediate_ticks.
+
+    Parameters:
+        min_val : float > 0
+        max_val : float > 0
+        max_ticks : approximate number of interior ticks
+        edge_fraction : fraction of the log range near min/max to ignore interior ticks
+
+    Returns:
+        list of tick values
+    """
+    lo, hi = np.log10(min_val), np.log10(max_val)
+
+    if hi - lo < 1:
+        return _intermediate_ticks(min_val, max_val, max_ticks=max_ticks, edge_fraction=edge_fraction)
+
+    # Decades per interior tick
+    step = max(1, int(np.ceil((hi - lo) / (max_ticks + 1))))
+
+    exponents = np.arange(np.ceil(lo / step) * step, hi, step)
+    range_val = hi - lo
+    interior_ticks = [10.0**e for e in exponents
+                      if e - lo > edge_fraction*range_val and hi - e > edge_fraction*range_val]
+
+    return [min_val] + interior_ticks + [max_val]
+
+####################################################################################################
+#                        Quantile from the weighted cumulative distribution                        #
+####################################################################################################
+def _weighted_quantile(values, weights, q):
+    """
+    Returns the q-th percentile of weighted values, treating each weight as the number of times
+    its value occurs: with integer weights this is np.percentile (linear interpolation) of the
+    values repeated by their weights, e.g. the mean of the two middle values for the median of
+    an even count. The position (total weight - 1) * q / 100 is found on the cumulative weights.
+
+    Parameters:
+        values : 1D array of values
+        weights : 1D array of non-negative weights, same length as values
+        q : percentile, 0 to 100
+
+    Returns:
+        float
+    """
+    values = np.asarray(values)
+    weights = np.asarray(weights, dtype=float)
+
+    order = np.argsort(values, kind="stable")
+    cumulative = np.cumsum(weights[order])
+    position = max(cumulative[-1] - 1, 0) * q / 100
+
+    below, above = np.floor(position), np.ceil(position)
+    k = np.minimum(np.searchsorted(cumulative, [below, above], side="right"), len(values) - 1)
+    low, high = values[order[k]]
+
+    return low + (position - below) * (high - low)